@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+Benchmark of the A/T gear prediction on a WLTP cycle.
+
+The WLTP-H time series (i.e., times, velocities, and engine speeds) are read
+from the simulation plan demo file. The gears are identified with constant
+velocity speed ratios, and the motive powers are derived from a road load.
+
+The gear shifting models (CMV, GSPV, and CMV cold/hot) are calibrated and
+their predictions are timed `--repeat` times for each gear correction, using:
+
+- the transition tables (i.e., `CorrectGear.vectorize`), and
+- the step-wise state machine (i.e., a correction that is not vectorized).
+
+The predicted gears are checked to be identical, and the minimum times with
+the speed-ups are reported. With `--opt-loop`, the CMV calibration with the
+optimization loop (i.e., hundreds of predictions) is timed as well.
+
+Usage::
+
+    python benchmarks/cmv.py [--repeat N] [--opt-loop]
+"""
+import time
+import argparse
+import functools
+
+#: Constant velocity speed ratios [km/(h*RPM)].
+VSR = {
+    0: 0.0, 1: 0.0075, 2: 0.0135, 3: 0.02, 4: 0.027, 5: 0.034, 6: 0.041
+}
+IDLE_ENGINE_SPEED = 800.0, 50.0
+STOP_VELOCITY = 1.0
+
+
+def load_cycle():
+    """
+    Loads the WLTP-H time series from the simulation plan demo file.
+
+    :return:
+        Times [s], velocities [km/h], accelerations [m/s2], motive powers
+        [kW], engine coolant temperatures [°C], engine speeds [RPM], and
+        gears [-].
+    :rtype: tuple[numpy.array]
+    """
+    import warnings
+    import openpyxl
+    import numpy as np
+    from co2mpas import _resource_filename
+    with warnings.catch_warnings():  # Unsupported conditional formatting.
+        warnings.simplefilter('ignore')
+        book = openpyxl.load_workbook(
+            _resource_filename('demos/co2mpas_simplan.xlsx'), read_only=True
+        )
+        rows = book['WLTP-H'].iter_rows(min_row=2, values_only=True)
+        names = next(rows)
+        idx = [names.index(k) for k in (
+            'times', 'velocities', 'engine_speeds_out',
+            'engine_coolant_temperatures'
+        )]
+        data = np.array([
+            [r[i] for i in idx] for r in rows if r[idx[0]] is not None
+        ], float).T
+        book.close()
+    times, velocities, speeds, temperatures = data
+    accelerations = np.gradient(velocities / 3.6, times)
+    motive_powers = (
+        100 + 0.5 * velocities + 0.04 * velocities ** 2 + 1500 * accelerations
+    ) * velocities / 3600
+    keys = np.array(sorted(k for k in VSR if k))
+    ratios = velocities / np.maximum(speeds, 1)
+    gears = keys[np.abs(ratios[:, None] - [VSR[k] for k in keys]).argmin(1)]
+    gears[velocities < STOP_VELOCITY] = 0
+    return (
+        times, velocities, accelerations, motive_powers, temperatures,
+        speeds, gears
+    )
+
+
+def _corrections(gears, velocities):
+    import numpy as np
+    from co2mpas.core.model.physical.gear_box import at_gear as at
+    full_load_curve = functools.partial(
+        np.interp, xp=[750, 2000, 4000, 6000], fp=[5, 40, 80, 90], left=0,
+        right=0
+    )
+    mvl = at.calibrate_mvl(
+        gears, velocities, VSR, IDLE_ENGINE_SPEED, STOP_VELOCITY
+    )
+    return {
+        'basic': at.correct_gear_v3(VSR, IDLE_ENGINE_SPEED),
+        'mvl': at.correct_gear_v1('WLTP', VSR, mvl, IDLE_ENGINE_SPEED, .1),
+        'full_load': at.correct_gear_v2(
+            VSR, IDLE_ENGINE_SPEED, full_load_curve, 100
+        ),
+        'all': at.correct_gear_v0(
+            'WLTP', VSR, mvl, IDLE_ENGINE_SPEED, full_load_curve, 100, .1
+        )
+    }
+
+
+def _models(times, velocities, accelerations, motive_powers, speeds, gears,
+            correct_gear):
+    from co2mpas.core.model.physical.gear_box.at_gear.cmv import CMV
+    from co2mpas.core.model.physical.gear_box.at_gear.gspv import GSPV
+    from co2mpas.core.model.physical.gear_box.at_gear.core import GSMColdHot
+    args = speeds, times, velocities, accelerations, motive_powers, VSR
+    cmv_ch = GSMColdHot(time_cold_hot_transition=300.0)
+    cmv_ch.fit(CMV, times, correct_gear, gears, *args, STOP_VELOCITY)
+    return {
+        'CMV': CMV().fit(correct_gear, gears, *args, STOP_VELOCITY),
+        'GSPV': GSPV().fit(
+            gears, velocities, motive_powers, VSR, STOP_VELOCITY
+        ),
+        'CMV_cold_hot': cmv_ch
+    }
+
+
+def _min_time(func, repeat):
+    res, times = None, []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = func()
+        times.append(time.perf_counter() - t0)
+    return min(times), res
+
+
+def bench(cycle, repeat=10):
+    """
+    Returns the minimum times of the gear predictions.
+
+    :param cycle:
+        Cycle time series (see :func:`load_cycle`).
+    :type cycle: tuple[numpy.array]
+
+    :param repeat:
+        Number of executions.
+    :type repeat: int
+
+    :return:
+        Minimum times [s] with the transition tables and the step-wise state
+        machine, for each model and correction.
+    :rtype: dict[(str, str), (float, float)]
+    """
+    import numpy as np
+    times, velocities, accelerations, motive_powers, temperatures, speeds, \
+        gears = cycle
+    res = {}
+    for c_name, correct_gear in _corrections(gears, velocities).items():
+        models = _models(
+            times, velocities, accelerations, motive_powers, speeds, gears,
+            correct_gear
+        )
+        for m_name, model in models.items():
+            t = []
+            for func in (correct_gear, lambda *a: correct_gear(*a)):
+                t.append(_min_time(functools.partial(
+                    model.predict, times, velocities, accelerations,
+                    motive_powers, temperatures, correct_gear=func
+                ), repeat))
+            (t0, fast), (t1, slow) = t
+            if not np.array_equal(fast, slow):
+                raise ValueError('Different gears (%s, %s)!' % (
+                    m_name, c_name
+                ))
+            res[m_name, c_name] = t0, t1
+    return res
+
+
+def bench_opt_loop(cycle):
+    """
+    Returns the times of the CMV calibration with the optimization loop.
+
+    :param cycle:
+        Cycle time series (see :func:`load_cycle`).
+    :type cycle: tuple[numpy.array]
+
+    :return:
+        Times [s] with the transition tables and the step-wise state machine.
+    :rtype: float, float
+    """
+    from co2mpas.defaults import dfl
+    from co2mpas.core.model.physical.gear_box.at_gear.cmv import CMV
+    times, velocities, accelerations, motive_powers, temperatures, speeds, \
+        gears = cycle
+    correct_gear = _corrections(gears, velocities)['all']
+    enable, dfl.functions.CMV.ENABLE_OPT_LOOP = (
+        dfl.functions.CMV.ENABLE_OPT_LOOP, True
+    )
+    try:
+        t = []
+        for func in (correct_gear, lambda *a: correct_gear(*a)):
+            t.append(_min_time(lambda: CMV().fit(
+                func, gears, speeds, times, velocities, accelerations,
+                motive_powers, VSR, STOP_VELOCITY
+            ), 1))
+    finally:
+        dfl.functions.CMV.ENABLE_OPT_LOOP = enable
+    (t0, fast), (t1, slow) = t
+    if dict(fast) != dict(slow):
+        raise ValueError('Different calibrated CMV!')
+    return t0, t1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--opt-loop', action='store_true')
+    args = parser.parse_args(argv)
+    cycle = load_cycle()
+    print('WLTP-H: %d time steps' % cycle[0].shape[0])
+    print('%-14s %-10s %10s %10s %8s' % (
+        'model', 'correction', 'tables [s]', 'steps [s]', 'speed-up'
+    ))
+    for (model, correction), (t0, t1) in bench(cycle, args.repeat).items():
+        print('%-14s %-10s %10.4f %10.4f %7.1fx' % (
+            model, correction, t0, t1, t1 / t0
+        ))
+    if args.opt_loop:
+        t0, t1 = bench_opt_loop(cycle)
+        print('%-25s %10.3f %10.3f %7.1fx' % ('CMV.fit (opt-loop)', t0, t1,
+                                               t1 / t0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+Benchmark of the Excel input reader against the per-sheet lasso path.
+
+For every input sheet of the given files (default: the demo files), the
+sheet is parsed `--repeat` times with both readers, the results are checked
+to be equal, and the minimum times are reported.
+
+Usage::
+
+    python benchmarks/excel_reader.py [--repeat N] [FILE ...]
+"""
+import glob
+import time
+import argparse
+import os.path as osp
+
+
+def _equal(a, b):
+    import numpy as np
+    import pandas as pd
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(
+            _equal(v, b[k]) for k, v in a.items()
+        )
+    if isinstance(a, pd.DataFrame):
+        return isinstance(b, pd.DataFrame) and a.equals(b) and \
+               list(a.columns) == list(b.columns)
+    try:
+        return type(a) == type(b) and np.array_equal(a, b, equal_nan=True)
+    except TypeError:
+        return type(a) == type(b) and np.array_equal(a, b)
+
+
+def _min_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = func()
+        times.append(time.perf_counter() - t0)
+    return min(times), res
+
+
+def bench(file_name, repeat=3):
+    """
+    Returns the sheet parsing times of the lasso and the fast readers.
+
+    :param file_name:
+        Input file path `.xlsx`.
+    :type file_name: str
+
+    :param repeat:
+        Number of executions.
+    :type repeat: int
+
+    :return:
+        Times of the lasso and the fast readers [s], and the sheets with
+        different results.
+    :rtype: float, float, list[str]
+    """
+    import xlrd
+    # noinspection PyProtectedMember
+    from co2mpas.core.load.excel import _re_input_sheet_name, _parse_sheet
+    with open(file_name, 'rb') as f:
+        book = xlrd.open_workbook(file_contents=f.read())
+    t_lasso = t_fast = 0
+    diff = []
+    for sheet_name in book.sheet_names():
+        match = _re_input_sheet_name.match(sheet_name.strip(' '))
+        if not match:
+            continue
+        match = {k: v.lower() for k, v in match.groupdict().items() if v}
+        t, lasso = _min_time(lambda: _parse_sheet(
+            match, book, sheet_name, {'plan': {}}, lasso=True
+        ), repeat)
+        t_lasso += t
+        t, fast = _min_time(lambda: _parse_sheet(
+            match, book, sheet_name, {'plan': {}}
+        ), repeat)
+        t_fast += t
+        if not _equal(lasso, fast):
+            diff.append(sheet_name)
+    return t_lasso, t_fast, diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('files', nargs='*', default=sorted(glob.glob(osp.join(
+        osp.dirname(__file__), '..', 'co2mpas', 'demos', '*.xlsx'
+    ))))
+    args = parser.parse_args(argv)
+    print('%-32s %10s %10s %8s' % ('file', 'lasso [s]', 'fast [s]', 'speedup'))
+    for fp in args.files:
+        t_lasso, t_fast, diff = bench(fp, args.repeat)
+        print('%-32s %10.3f %10.3f %7.1fx' % (
+            osp.basename(fp), t_lasso, t_fast, t_lasso / t_fast
+        ))
+        if diff:
+            print('  Different results in sheets: %s' % ', '.join(diff))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+Benchmark of the load pipeline over scaled synthetic input files.
+
+For every `--scales` value N, a synthetic input file is generated from the
+input template, with:
+
+- min(N, 4) cycle sheets (WLTP-H, WLTP-L, NEDC-H, NEDC-L),
+- N extra meta time series sheets,
+- time series of N * `--length` rows, and
+- N * `--plan-rows` simulation plan rows.
+
+The load stages (`parse_excel_file`, `merge_data`, and `validate_*`) are
+timed separately `--repeat` times. Since the input file is opened lazily,
+`open_input_file` is timed with `parse_excel_file`, that reads the whole file
+first. The minimum times, the throughputs (i.e., MB/s of the input file, and
+rows/s for the plan), and the peak memories (traced in an extra run) are
+reported.
+
+Usage::
+
+    python benchmarks/load.py [--repeat N] [--scales N [N ...]]
+                              [--length N] [--plan-rows N] [--output-folder D]
+"""
+import os
+import time
+import logging
+import argparse
+import tempfile
+import tracemalloc
+import os.path as osp
+
+CYCLES = 'WLTP-H', 'WLTP-L', 'NEDC-H', 'NEDC-L'
+META_SHEET = 'meta.WLTP-H.test_b.ts'
+PLAN_COLUMNS = (
+    'input.calibration.WLTP-H.f0', 'input.calibration.WLTP-H.f1',
+    'input.calibration.WLTP-H.f2'
+)
+
+
+def _fill_ts_sheet(sheet, length, rng):
+    import numpy as np
+    names = [c.value for c in sheet[2]]
+    for j, name in enumerate(names, 1):
+        if not name:
+            continue
+        if name == 'times':
+            values = range(length)
+        elif 'phases' in name:  # Phases must be separated.
+            values = (np.arange(length) * 4 // length).tolist()
+        elif 'gears' in name:
+            values = rng.integers(0, 6, length).tolist()
+        else:
+            values = rng.uniform(0, 120, length).round(3).tolist()
+        for i, v in enumerate(values, 3):
+            sheet.cell(i, j, v)
+
+
+def make_input_file(file_name, scale=1, length=1800, plan_rows=100, seed=0):
+    """
+    Generates a synthetic input file from the input template.
+
+    :param file_name:
+        Output file path `.xlsx`.
+    :type file_name: str
+
+    :param scale:
+        Scale factor of the cycles, sheets, time series, and plan rows.
+    :type scale: int
+
+    :param length:
+        Time series length at scale 1.
+    :type length: int
+
+    :param plan_rows:
+        Simulation plan rows at scale 1.
+    :type plan_rows: int
+
+    :param seed:
+        Seed of the random values.
+    :type seed: int
+
+    :return:
+        Output file path.
+    :rtype: str
+    """
+    import warnings
+    import openpyxl
+    import numpy as np
+    from co2mpas import _resource_filename
+    rng = np.random.default_rng(seed)
+    with warnings.catch_warnings():  # Unsupported conditional formatting.
+        warnings.simplefilter('ignore')
+        book = openpyxl.load_workbook(
+            _resource_filename('templates/input_template.xlsx')
+        )
+    for name in CYCLES[:min(scale, len(CYCLES))]:
+        _fill_ts_sheet(book[name], length * scale, rng)
+    for i in range(scale):
+        sheet = book.copy_worksheet(book[META_SHEET])
+        sheet.title = 'meta.WLTP-H.test_%d.ts' % i
+        _fill_ts_sheet(sheet, length * scale, rng)
+    sheet = book.create_sheet('plan')
+    sheet.append(('id',) + PLAN_COLUMNS)
+    for i in range(plan_rows * scale):
+        sheet.append([i + 1] + rng.uniform(0, 1, len(PLAN_COLUMNS)).tolist())
+    os.makedirs(osp.dirname(file_name) or '.', exist_ok=True)
+    book.save(file_name)
+    return file_name
+
+
+def _stages(file_name):
+    # Load stages, where each one consumes the outputs of the previous ones.
+    from co2mpas.core.load import open_input_file, merge_data
+    from co2mpas.core.load.excel import parse_excel_file
+    from co2mpas.core.load import validate as val
+    res = {}
+
+    def _validate_plan():
+        plan = val.validate_plan(res['input_type'], res['data'].get('plan'))
+        return sum(1 for _ in plan)  # Rows are validated lazily.
+
+    return res, (
+        ('parse_excel_file', 'raw_data', lambda: parse_excel_file(
+            file_name, open_input_file(file_name)
+        )),
+        ('merge_data', 'data', lambda: merge_data(res['raw_data'])),
+        ('validate_dice', 'dice', lambda: val.validate_dice(
+            res['data'].get('dice')
+        )),
+        ('validate_flag', 'flag', lambda: val.validate_flag(
+            res['data'].get('flag')
+        )),
+        ('validate_meta', 'meta', lambda: val.validate_meta(
+            res['data'].get('meta')
+        )),
+        ('validate_base', 'base', lambda: val.validate_base(
+            res['input_type'], res['data'].get('base')
+        )),
+        ('validate_plan', 'plan', _validate_plan)
+    )
+
+
+def bench(file_name, repeat=3):
+    """
+    Returns the times and the peak memories of the load stages.
+
+    :param file_name:
+        Input file path `.xlsx`.
+    :type file_name: str
+
+    :param repeat:
+        Number of executions.
+    :type repeat: int
+
+    :return:
+        Minimum time [s] and peak memory [MB] of each stage, and the number
+        of plan rows.
+    :rtype: dict[str, (float, float)], int
+    """
+    from co2mpas.core.load.validate import get_input_type
+    res, stages = _stages(file_name)
+    times = {}
+    for i in range(repeat + 1):
+        traced = i == repeat  # Tracing slows down the execution.
+        for name, key, func in stages:
+            if traced:
+                tracemalloc.start()
+            t0 = time.perf_counter()
+            res[key] = func()
+            t = time.perf_counter() - t0
+            if traced:
+                peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+                tracemalloc.stop()
+                times[name] = times[name], peak
+            else:
+                times[name] = min(times.get(name, t), t)
+            if key == 'dice':
+                res['input_type'] = get_input_type(res['dice'])
+    return times, res['plan']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--length', type=int, default=1800)
+    parser.add_argument('--plan-rows', type=int, default=100)
+    parser.add_argument('--output-folder', default=None)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)  # E.g., unused parameters.
+    with tempfile.TemporaryDirectory() as tmp:
+        print('%-6s %-18s %10s %12s %10s' % (
+            'scale', 'stage', 'time [s]', 'throughput', 'peak [MB]'
+        ))
+        for scale in args.scales:
+            fp = make_input_file(
+                osp.join(args.output_folder or tmp, 'input-%d.xlsx' % scale),
+                scale, args.length, args.plan_rows
+            )
+            size = osp.getsize(fp) / 2 ** 20
+            times, rows = bench(fp, args.repeat)
+            rows = max(rows, 1)
+            for name, (t, peak) in times.items():
+                if name == 'validate_plan':
+                    speed = '%7.0f rows/s' % (rows / t)
+                else:
+                    speed = '%7.1f MB/s' % (size / t)
+                print('%-6d %-18s %10.3f %12s %10.1f' % (
+                    scale, name, t, speed, peak
+                ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+Benchmark of the CO2MPAS command line start-up time.
+
+Every command is executed in a fresh interpreter (cold start) `--repeat` times,
+and the minimum and median wall times are reported.
+
+Usage::
+
+    python benchmarks/startup.py [--repeat N] [--output-folder FOLDER]
+"""
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+import os.path as osp
+
+CLI = [sys.executable, '-c', 'from co2mpas.cli import cli; cli()']
+
+
+def _commands(output_folder):
+    return {
+        'import co2mpas': [sys.executable, '-c', 'import co2mpas'],
+        'import co2mpas.cli': [sys.executable, '-c', 'import co2mpas.cli'],
+        'co2mpas --help': CLI + ['--help'],
+        'co2mpas run --help': CLI + ['run', '--help'],
+        'co2mpas template': CLI + [
+            'template', osp.join(output_folder, 'template.xlsx')
+        ],
+        'co2mpas conf': CLI + ['conf', osp.join(output_folder, 'conf.yaml')],
+    }
+
+
+def bench(cmd, repeat=5):
+    """
+    Returns the wall times of a command executed in a fresh interpreter.
+
+    :param cmd:
+        Command to execute.
+    :type cmd: list[str]
+
+    :param repeat:
+        Number of executions.
+    :type repeat: int
+
+    :return:
+        Wall times [s].
+    :rtype: list[float]
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(
+            cmd, check=True, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output-folder', default=None)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        print('%-24s %10s %10s' % ('command', 'min [s]', 'median [s]'))
+        for name, cmd in _commands(args.output_folder or tmp).items():
+            t = bench(cmd, args.repeat)
+            print('%-24s %10.3f %10.3f' % (name, min(t), statistics.median(t)))
+
+
+if __name__ == '__main__':
+    main()
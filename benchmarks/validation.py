@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+Benchmark of the input data validation against the Excel parsing.
+
+Every given file (default: the demo files) is parsed, its time series are
+enlarged `--scale` times, and the base data are validated `--repeat` times
+with the data schema and with the compiled data validator. The results are
+checked to be equal, and the minimum times are reported.
+
+Usage::
+
+    python benchmarks/validation.py [--repeat N] [--scale N] [FILE ...]
+"""
+import glob
+import time
+import argparse
+import os.path as osp
+
+
+def _min_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = func()
+        times.append(time.perf_counter() - t0)
+    return min(times), res
+
+
+def _scale(data, scale):
+    import numpy as np
+    if isinstance(data, dict):
+        return {k: _scale(v, scale) for k, v in data.items()}
+    if isinstance(data, np.ndarray) and data.ndim == 1 and data.size > 1:
+        return np.repeat(data, scale)  # Keeps the `times` sorted.
+    return data
+
+
+def _validate(data, validate):
+    import schedula as sh
+    # noinspection PyProtectedMember
+    from co2mpas.core.load.validate import _add_validated_input
+    inputs, errors = {}, {}
+    for k, v in sorted(sh.stack_nested_keys(data, depth=4)):
+        d = sh.get_nested_dicts(inputs, *k[:-1])
+        _add_validated_input(d, validate, k, v, errors)
+    # Errors are compared by message.
+    return inputs, {k: str(v) for k, v in sh.stack_nested_keys(errors, depth=4)}
+
+
+def bench(file_name, repeat=3, scale=1):
+    """
+    Returns the parsing time and the validation times of the base data.
+
+    :param file_name:
+        Input file path `.xlsx`.
+    :type file_name: str
+
+    :param repeat:
+        Number of executions.
+    :type repeat: int
+
+    :param scale:
+        Scale factor of the time series length.
+    :type scale: int
+
+    :return:
+        Times of the parsing, the schema, and the compiled validator [s], and
+        if the validation results are equal.
+    :rtype: float, float, float, bool
+    """
+    import numpy as np
+    from co2mpas.core.load import InputFile
+    from co2mpas.core.load.excel import parse_excel_file
+    from co2mpas.core.load.schema import (
+        define_data_schema, define_data_validator
+    )
+    input_file = InputFile(file_name)
+    t_parse, raw_data = _min_time(
+        lambda: parse_excel_file(file_name, input_file), repeat
+    )
+    data = _scale(raw_data['base'], scale)
+    t_schema, res = _min_time(
+        lambda: _validate(data, define_data_schema().validate), repeat
+    )
+    t_fast, fast = _min_time(
+        lambda: _validate(data, define_data_validator().validate), repeat
+    )
+    try:
+        np.testing.assert_equal(fast, res)
+        equal = True
+    except AssertionError:
+        equal = False
+    return t_parse, t_schema, t_fast, equal
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('files', nargs='*', default=sorted(glob.glob(osp.join(
+        osp.dirname(__file__), '..', 'co2mpas', 'demos', '*.xlsx'
+    ))))
+    args = parser.parse_args(argv)
+    print('%-32s %10s %10s %10s %8s' % (
+        'file', 'parse [s]', 'schema [s]', 'fast [s]', 'speedup'
+    ))
+    for fp in args.files:
+        t_parse, t_schema, t_fast, equal = bench(fp, args.repeat, args.scale)
+        print('%-32s %10.3f %10.3f %10.3f %7.1fx' % (
+            osp.basename(fp), t_parse, t_schema, t_fast, t_schema / t_fast
+        ))
+        if not equal:
+            print('  Different validation results!')
+
+
+if __name__ == '__main__':
+    main()
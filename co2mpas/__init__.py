@@ -17,18 +17,23 @@ Defines the file processing chain model `dsp`.
     ~cli
     ~utils
     ~defaults
+    ~cache
+    ~profiler
+    ~journal
 """
 import os
-import tqdm
 import logging
-import webbrowser
+import functools
+import itertools
 import os.path as osp
 import schedula as sh
 from co2mpas._version import *
-from co2mpas.utils import check_first_arg
 
 log = logging.getLogger(__name__)
 dsp = sh.BlueDispatcher(name='process')
+_core_model = _bases = None  # Core model and plan bases of worker process.
+_shared = {}  # Indices of the plan bases arrays of worker process.
+_memo = {}  # Workflow pruning memo of worker process.
 
 
 def init_conf(inputs):
@@ -53,6 +58,11 @@ def init_conf(inputs):
 dsp.add_data(sh.START, filters=[init_conf, lambda x: sh.NONE])
 
 
+def _resource_filename(resource_name):
+    # Faster than `pkg_resources.resource_filename` (slow import).
+    return osp.join(osp.dirname(__file__), *resource_name.split('/'))
+
+
 @sh.add_function(dsp, outputs=['demo'])
 def save_demo_files(output_folder):
     """
@@ -64,9 +74,8 @@ def save_demo_files(output_folder):
     """
     import glob
     from shutil import copy2
-    from pkg_resources import resource_filename
     os.makedirs(output_folder or '.', exist_ok=True)
-    for src in glob.glob(resource_filename('co2mpas', 'demos/*.xlsx')):
+    for src in glob.glob(_resource_filename('demos/*.xlsx')):
         copy2(src, osp.join(output_folder, osp.basename(src)))
     log.info('CO2MPAS demos written into (%s).', output_folder)
 
@@ -85,10 +94,7 @@ def save_co2mpas_template(output_file, template_type):
     :type template_type: str
     """
     from shutil import copy2
-    from pkg_resources import resource_filename
-    src = resource_filename(
-        'co2mpas', 'templates/%s_template.xlsx' % template_type
-    )
+    src = _resource_filename('templates/%s_template.xlsx' % template_type)
     os.makedirs(osp.dirname(output_file) or '.', exist_ok=True)
     copy2(src, output_file)
     log.info('CO2MPAS input template written into (%s).', output_file)
@@ -109,15 +115,45 @@ def save_co2mpas_conf(output_file):
     log.info('CO2MPAS model configurations written into (%s).', output_file)
 
 
-@sh.add_function(dsp, outputs=['core_model'])
-def register_core():
+def _snapshot_key():
+    import sys
+    from .cache import hash_key, conf_key
+    return hash_key(sys.version, sh.__version__, conf_key())
+
+
+@sh.add_function(
+    dsp, inputs_kwargs=True, inputs_defaults=True, outputs=['core_model']
+)
+def register_core(dsp_snapshot=False):
     """
     Register core model.
 
+    :param dsp_snapshot:
+        Load the registered core model from a snapshot cache file (it is
+        created if missing)? The snapshot is invalidated when the CO2MPAS
+        version or the model configurations change.
+    :type dsp_snapshot: bool
+
     :return:
         CO2MPAS core model.
     :rtype: schedula.Dispatcher
     """
+    if dsp_snapshot:
+        from .cache import FileCache, CACHE_FOLDER
+        cache, key = FileCache(osp.join(CACHE_FOLDER, 'dsp'), 64), None
+        try:
+            key = _snapshot_key()
+            core_model = cache.get(key)
+        except Exception as ex:  # E.g., non serializable configurations.
+            log.warning('Failed loading the core model snapshot:\n%s', ex)
+            core_model = None
+        if core_model is not None:
+            log.info('Core model loaded from snapshot (%s).', key)
+            return core_model
+        core_model = register_core()
+        if key is not None:
+            cache.set(key, core_model)
+        return core_model
     from .core import dsp
     return dsp.register(memo={})
 
@@ -194,6 +230,7 @@ def run_sitemap(sitemap, cache_folder, host, port):
     :type port: int
     :return:
     """
+    import webbrowser
     import numpy as np
     np.set_printoptions(threshold=np.inf)
     site = sitemap.site(cache_folder, host=host, port=port).run()
@@ -218,41 +255,149 @@ def wait_site(site):
 
 def _yield_files(
         *paths, cache=None,
-        ext=('co2mpas.ta', 'co2mpas', 'xlsx', 'dill', 'xls')):
+        ext=('co2mpas.ta', 'co2mpas', 'xlsx', 'dill', 'xls', 'npz',
+             'csv', 'sweep.yaml')):
     import glob
     cache = set() if cache is None else cache
     for path in paths:
         path = osp.abspath(path)
         if path in cache or osp.basename(path).startswith('~'):
             continue
-        cache.add(path)
         if osp.isdir(path):
+            cache.add(path)
+            # Within the folders, only the `.plan.csv` files are plans.
             yield from _yield_files(
-                *filter(osp.isfile, glob.glob(osp.join(path, '*'))), cache=cache
+                *filter(osp.isfile, glob.glob(osp.join(path, '*'))),
+                cache=cache, ext=tuple(e for e in ext if e != 'csv') + (
+                    'plan.csv',
+                )
             )
         elif osp.isfile(path) and path.lower().endswith(ext):
+            cache.add(path)
             yield path
         else:
             log.info('Skipping file "%s".' % path)
 
 
-class _ProgressBar(tqdm.tqdm):
-    def __init__(self, *args, _format_meter=None, **kwargs):
-        if _format_meter:
-            self._format_meter = _format_meter
-        super(_ProgressBar, self).__init__(*args, **kwargs)
+@sh.add_function(dsp, outputs=['convert'])
+def save_binary_files(input_files, output_folder):
+    """
+    Converts the input files into CO2MPAS binary files `.npz`.
 
-    @staticmethod
-    def _format_meter(bar, data):
-        return '%s: Processing %s\n' % (bar, data)
+    :param input_files:
+        List of input files and/or folders.
+    :type input_files: iterable
 
-    # noinspection PyMissingOrEmptyDocstring
-    def format_meter(self, n, *args, **kwargs):
-        bar = super(_ProgressBar, self).format_meter(n, *args, **kwargs)
-        try:
-            return self._format_meter(bar, self.iterable[n])
-        except IndexError:
-            return bar
+    :param output_folder:
+        Output folder.
+    :type output_folder: str
+
+    :return:
+        Output file paths.
+    :rtype: list[str]
+    """
+    from .core.load import dsp as _load
+    from .core.load.binary import save_binary_file, BINARY_EXT
+    load, files = _load.register(memo={}), []
+    for fp in _yield_files(*input_files, ext=('xlsx', 'xls', 'dill')):
+        sol = load({'input_file_name': fp}, outputs=['raw_data'])
+        if 'raw_data' not in sol:
+            log.error('Skipping file "%s" (it cannot be loaded).', fp)
+            continue
+        name = osp.splitext(osp.basename(fp))[0]
+        files.append(save_binary_file(
+            sol['raw_data'], osp.join(output_folder, name + BINARY_EXT)
+        ))
+        log.info('CO2MPAS binary file written into (%s).', files[-1])
+    return files
+
+
+@sh.add_function(
+    dsp, inputs_kwargs=True, inputs_defaults=True, outputs=['sweep']
+)
+def save_sweep(output_file, base_file, sweep_parameters, sweep_method='grid',
+               samples=None, seed=None, run_base=True):
+    """
+    Save a parametric-sweep simulation plan.
+
+    :param output_file:
+        Output file path (`.sweep.yaml` or, expanded, `.csv`).
+    :type output_file: str
+
+    :param base_file:
+        Base input file path.
+    :type base_file: str
+
+    :param sweep_parameters:
+        Sweep parameters as `NAME=MIN:MAX[:NUM]` or `NAME=V1[,V2,...]`.
+    :type sweep_parameters: list[str]
+
+    :param sweep_method:
+        Sweep method (i.e., grid, lhs, or sobol).
+    :type sweep_method: str
+
+    :param samples:
+        Number of samples (only lhs and sobol).
+    :type samples: int
+
+    :param seed:
+        Seed of the random samples.
+    :type seed: int
+
+    :param run_base:
+        Run the base input file?
+    :type run_base: bool
+
+    :return:
+        Output file path.
+    :rtype: str
+    """
+    from .core.load.sweep import Sweep, save_sweep_file, parse_parameter_option
+    sweep = Sweep(
+        dict(map(parse_parameter_option, sweep_parameters)), base_file,
+        sweep_method, samples, seed, run_base
+    )
+    save_sweep_file(sweep, output_file)
+    log.info(
+        'CO2MPAS sweep of %d plan rows written into (%s).', len(sweep),
+        output_file
+    )
+    return output_file
+
+
+@functools.lru_cache(None)
+def _progress_bar_class():
+    import tqdm
+
+    class _ProgressBar(tqdm.tqdm):
+        current = None  # Item in process, when the iterable is lazy.
+
+        def __init__(self, *args, _format_meter=None, **kwargs):
+            if _format_meter:
+                self._format_meter = _format_meter
+            super(_ProgressBar, self).__init__(*args, **kwargs)
+
+        @staticmethod
+        def _format_meter(bar, data):
+            return '%s: Processing %s\n' % (bar, data)
+
+        # noinspection PyMissingOrEmptyDocstring
+        def format_meter(self, n, *args, **kwargs):
+            bar = super(_ProgressBar, self).format_meter(n, *args, **kwargs)
+            try:
+                data = self.iterable[n]
+            except TypeError:  # Not a sequence.
+                data = self.current
+            except IndexError:
+                return bar
+            return bar if data is None else self._format_meter(bar, data)
+
+    return _ProgressBar
+
+
+def _ProgressBar(*args, **kwargs):
+    # `tqdm` is imported lazily to speed up the CLI start-up.
+    return _progress_bar_class()(*args, **kwargs)
 
 
 @sh.add_function(dsp, outputs=['start_time'])
@@ -284,11 +429,199 @@ def default_timestamp(start_time):
     return start_time.strftime('%Y%m%d_%H%M%S')
 
 
-@sh.add_function(dsp, outputs=['core_solutions'])
-def run_core(core_model, cmd_flags, timestamp, input_files, **kwargs):
+def _init_core_worker(cmd_flags, bases=None, dsp_snapshot=False):
+    global _core_model, _bases, _shared
+    init_conf(sh.selector(('model_conf',), cmd_flags or {}, allow_miss=True))
+    _core_model = register_core(dsp_snapshot)
+    if bases is not None:
+        import dill
+        _bases = dill.loads(bases)
+        _shared = {id(a): i for i, a in enumerate(_shared_arrays(_bases))}
+
+
+def _run_core_worker(args):
+    import dill
+    inputs, kwargs = args
+    # Solutions contain objects that `pickle` cannot handle.
+    return dill.dumps(_core_model(inputs, **kwargs))
+
+
+def _get_n_jobs(jobs, n):
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return max(min(jobs, n), 1)
+
+
+def _map_core(core_model, inputs, n, jobs=1, cmd_flags=None,
+              dsp_snapshot=False, **kwargs):
+    jobs = _get_n_jobs(jobs, n)
+    if jobs == 1:
+        for inp in inputs:
+            yield core_model(inp, **kwargs)
+        return
+    import dill
+    import collections
+    import multiprocessing
+    init_args = cmd_flags, None, dsp_snapshot
+    with multiprocessing.Pool(jobs, _init_core_worker, init_args) as pool:
+        # Inputs are loaded lazily, with at most two runs per process pending
+        # (`imap` would consume all of them).
+        pending = collections.deque()
+        for inp in inputs:
+            pending.append(pool.apply_async(_run_core_worker, ((
+                inp, kwargs
+            ),)))
+            if len(pending) > 2 * jobs:
+                yield dill.loads(pending.popleft().get())
+        while pending:
+            yield dill.loads(pending.popleft().get())
+
+
+dsp.add_data('jobs', 1, description='Number of parallel processes.')
+
+
+@sh.add_function(
+    dsp, inputs_kwargs=True, inputs_defaults=True, outputs=['results_cache']
+)
+def define_results_cache(no_cache=False, cache_size=1024, profile=False):
+    """
+    Defines the cache of the core model results.
+
+    :param no_cache:
+        Disable the cache of the core model results?
+    :type no_cache: bool
+
+    :param cache_size:
+        Maximum size of the cache [MB].
+    :type cache_size: float
+
+    :param profile:
+        Profile the run? If true, the cache is disabled to time all models.
+    :type profile: bool
+
+    :return:
+        Cache of the core model results.
+    :rtype: co2mpas.cache.FileCache
+    """
+    if no_cache or profile:
+        return None
+    from .cache import FileCache, CACHE_FOLDER
+    return FileCache(osp.join(CACHE_FOLDER, 'results'), cache_size)
+
+
+@sh.add_function(
+    dsp, inputs_kwargs=True, inputs_defaults=True, outputs=['inputs_cache']
+)
+def define_inputs_cache(no_cache=False, cache_size=1024, profile=False):
+    """
+    Defines the cache of the validated inputs (i.e., outputs of `load_inputs`).
+
+    :param no_cache:
+        Disable the cache of the validated inputs?
+    :type no_cache: bool
+
+    :param cache_size:
+        Maximum size of the cache [MB].
+    :type cache_size: float
+
+    :param profile:
+        Profile the run? If true, the cache is disabled to time all models.
+    :type profile: bool
+
+    :return:
+        Cache of the validated inputs.
+    :rtype: co2mpas.cache.FileCache
+    """
+    if no_cache or profile:
+        return None
+    from .cache import FileCache, CACHE_FOLDER
+    return FileCache(osp.join(CACHE_FOLDER, 'inputs'), cache_size)
+
+
+#: Validated inputs of the core model (i.e., outputs of `load_inputs`).
+_validated_inputs = 'plan', 'flag', 'dice', 'meta', 'base'
+
+
+def _is_ta(input_file_name, cmd_flags):
+    # Decrypted data and signed outputs of TA runs are not stored on disk.
+    return bool((cmd_flags or {}).get('type_approval_mode')) or \
+        input_file_name.lower().endswith(('.co2mpas.ta', '.co2mpas'))
+
+
+def _inputs_key(input_file_name, cmd_flags):
+    from .cache import file_key, conf_key
+    if _is_ta(input_file_name, cmd_flags):
+        return None
+    # All flags are validated and merged into the inputs.
+    return file_key(
+        input_file_name, osp.abspath(input_file_name),
+        sorted((cmd_flags or {}).items()), conf_key()
+    )
+
+
+def _core_inputs(input_file_name, cmd_flags, timestamp, inputs_cache=None,
+                 key=None, parse_jobs=1):
+    inputs = dict(
+        input_file_name=input_file_name, cmd_flags=cmd_flags,
+        timestamp=timestamp, parse_jobs=parse_jobs
+    )
+    data = key and inputs_cache.get(key)
+    if data:
+        # The `load_inputs` model is skipped when its outputs are given.
+        log.info('Validated inputs of (%s) loaded from cache.', input_file_name)
+        inputs.update(data)
+    return inputs
+
+
+def _run_key(input_file_name, cmd_flags, **kwargs):
+    from .cache import file_key, conf_key
+    # Outputs are rewritten into the current output folder.
+    flags = sorted(
+        (k, v) for k, v in (cmd_flags or {}).items() if k != 'output_folder'
+    )
+    # Key files are identified by their content (e.g., rotated keys).
+    keys = [
+        file_key(fp) for fp in (
+            (cmd_flags or {}).get(k) for k in ('encryption_keys', 'sign_key')
+        ) if fp and osp.isfile(fp)
+    ]
+    return file_key(
+        input_file_name, osp.abspath(input_file_name), flags, keys,
+        sorted(kwargs.items()), conf_key()
+    )
+
+
+def _results_key(input_file_name, cmd_flags, **kwargs):
+    if _is_ta(input_file_name, cmd_flags):
+        return None
+    return _run_key(input_file_name, cmd_flags, **kwargs)
+
+
+def _restore_outputs(sol, cmd_flags, timestamp):
+    # Signed TA outputs are never rewritten.
+    if 'output_file' in sol and 'output_file_name' in sol and \
+            not _is_ta(sol.get('input_file_name', ''), cmd_flags):
+        from .core.write import save_output_file
+        name = osp.basename(sol['output_file_name'])
+        if 'timestamp' in sol:
+            name = name.replace(sol['timestamp'], timestamp, 1)
+        fp = osp.join(cmd_flags.get('output_folder', './outputs'), name)
+        save_output_file(sol['output_file'], fp)
+        sol['output_file_name'] = fp
+    sol['timestamp'] = timestamp
+    return sol
+
+
+@sh.add_function(dsp, inputs_kwargs=True, outputs=['core_solutions'])
+def run_core(core_model, cmd_flags, timestamp, input_files, jobs=1,
+             results_cache=None, dsp_snapshot=False, journal=None,
+             inputs_cache=None, summary_stream=None, profiler=None,
+             plot_workflow=False, **kwargs):
     """
     Run core model.
 
+    The inputs are loaded lazily (i.e., when their run is submitted).
+
     :param core_model:
         CO2MPAS core model.
     :type core_model: schedula.Dispatcher
@@ -305,25 +638,137 @@ def run_core(core_model, cmd_flags, timestamp, input_files, **kwargs):
         List of input files and/or folders.
     :type input_files: iterable
 
+    :param jobs:
+        Number of parallel processes (if <= 0, all CPUs are used).
+    :type jobs: int
+
+    :param results_cache:
+        Cache of the core model results.
+    :type results_cache: co2mpas.cache.FileCache
+
+    :param dsp_snapshot:
+        Load the core model of the parallel processes from a snapshot?
+    :type dsp_snapshot: bool
+
+    :param journal:
+        Checkpoint journal of the completed runs. It is used only for full
+        runs (i.e., without `kwargs`).
+    :type journal: co2mpas.journal.Journal
+
+    :param inputs_cache:
+        Cache of the validated inputs.
+    :type inputs_cache: co2mpas.cache.FileCache
+
+    :param summary_stream:
+        File path where summary rows are streamed. If given, the summary row
+        of each full run is written as soon as the run is completed, and its
+        solution is released (i.e., flagged as `streamed`), unless it contains
+        a simulation plan or the workflow has to be plotted.
+    :type summary_stream: str
+
+    :param profiler:
+        Profiler of the model solutions of full runs.
+    :type profiler: co2mpas.profiler.Profiler
+
+    :param plot_workflow:
+        Open workflow-plot in browser, after run finished.
+    :type plot_workflow: bool
+
     :return:
-        Core model solutions.
+        Core model solutions. The completed runs of the journal are flagged as
+        `resumed` and are just loaded if they contain a simulation plan.
     :rtype: dict[str, schedula.Solution]
     """
     solutions, it = {}, list(_yield_files(*input_files))
+    if kwargs:
+        journal = summary_stream = profiler = None
     if it:
+        keys, run_keys, resumed = {}, {}, {}
+        if results_cache is not None:
+            keys = {fp: _results_key(fp, cmd_flags, **kwargs) for fp in it}
+        if journal is not None:
+            run_keys = {fp: _run_key(fp, cmd_flags, **kwargs) for fp in it}
+            resumed = {fp: journal.resume(run_keys[fp]) for fp in it}
+            resumed = {k: v for k, v in resumed.items() if v is not None}
+        cached = {
+            fp for fp, k in keys.items() if k and k in results_cache
+        } - set(resumed)
+        in_keys, loaded = {}, set()
+        if inputs_cache is not None:
+            in_keys = {fp: _inputs_key(fp, cmd_flags) for fp in it}
+        run = [fp for fp in it if fp not in cached and fp not in resumed]
+        # Input sheets are parsed in parallel only when runs are sequential.
+        parse_jobs = jobs if _get_n_jobs(jobs, len(run)) == 1 else 1
+
+        def _inputs(fp, n=parse_jobs):
+            inp = _core_inputs(
+                fp, cmd_flags, timestamp, inputs_cache, in_keys.get(fp), n
+            )
+            if 'base' in inp:  # Validated inputs loaded from cache.
+                loaded.add(fp)
+            return inp
+
+        res = _map_core(
+            core_model, (_inputs(fp) for fp in run), len(run), jobs,
+            cmd_flags, dsp_snapshot, **kwargs
+        )
+        outputs = kwargs.get('outputs') or ('summary',)
+        if summary_stream:
+            os.makedirs(osp.dirname(summary_stream) or '.', exist_ok=True)
+        # Results are yielded in input order.
         for fp in _ProgressBar(it):
-            solutions[fp] = core_model(dict(
-                input_file_name=fp, cmd_flags=cmd_flags, timestamp=timestamp
-            ), **kwargs)
+            if fp in resumed:
+                log.info('Core model run of (%s) resumed from journal.', fp)
+                solutions[fp] = sol = {'resumed': True}
+                if resumed[fp].get('plan'):  # Plan rows need the inputs.
+                    sol.update(core_model(
+                        _inputs(fp), outputs=['plan', 'base', 'vehicle_name']
+                    ))
+                continue
+            sol = fp in cached and results_cache.get(keys[fp])
+            if sol:
+                log.info('Core model results of (%s) loaded from cache.', fp)
+                sol = _restore_outputs(sol, cmd_flags, timestamp)
+            else:
+                if fp in cached:  # Evicted or corrupted cache item.
+                    sol = core_model(_inputs(fp, jobs), **kwargs)
+                else:
+                    sol = next(res)
+                if keys.get(fp) and all(k in sol for k in outputs):
+                    results_cache.set(keys[fp], sol)
+                if in_keys.get(fp) and fp not in loaded and all(
+                        k in sol for k in _validated_inputs):
+                    inputs_cache.set(
+                        in_keys[fp], sh.selector(_validated_inputs, sol)
+                    )
+            if journal is not None and 'summary' in sol:
+                journal.add(
+                    run_keys[fp], _summary_row(sol), plan=bool(sol.get('plan'))
+                )
+            if profiler is not None:
+                profiler.add_solution(sol)
+            if summary_stream:
+                _write_summary_row(summary_stream, _summary_row(sol))
+                if not (plot_workflow or sol.get('plan')):
+                    sol = {'streamed': True}  # Released.
+            solutions[fp] = sol
     return solutions
 
 
-def _define_inputs(sol, inputs):
-    kw = dict(
-        sources=inputs, check_inputs=False, graph=sol.dsp.dmap,
-        _update_links=False
-    )
-    keys = set(sol) - set(sol.dsp.get_sub_dsp_from_workflow(**kw).data_nodes)
+def _define_inputs(sol, inputs, memo=None):
+    key = id(sol), frozenset(inputs)
+    if memo is None or key not in memo:
+        kw = dict(
+            sources=inputs, check_inputs=False, graph=sol.dsp.dmap,
+            _update_links=False
+        )
+        keys = set(sol) - set(
+            sol.dsp.get_sub_dsp_from_workflow(**kw).data_nodes
+        )
+        if memo is not None:
+            memo[key] = keys
+    else:
+        keys = memo[key]
     return sh.combine_dicts({k: sol[k] for k in keys}, inputs)
 
 
@@ -331,48 +776,371 @@ def _format_meter(bar, row):
     return '%s: Processing %s (%s)\n' % (bar, row['id'], row['base'])
 
 
-def _run_variations(plan, bases, core_model, timestamp):
-    for r in _ProgressBar(plan, _format_meter=_format_meter):
-        sol, data = bases[r['base']], r['data']
-        if 'solution' in sol:
-            s = sol['solution']
-            base = _define_inputs(s, sh.combine_nested_dicts(sh.selector(
-                data, s, allow_miss=True
-            ), data))
-        elif 'base' in sol:
-            base = sh.combine_nested_dicts(sol['base'], data, depth=2)
+def _drop_empty(d):
+    if hasattr(d, 'items'):
+        return {k: v for k, v in d.items() if v is not sh.EMPTY}
+    return d
+
+
+def _shared_value(src, key, memo=None):
+    # Base value (without empty items) shared by the plan rows.
+    value = src[key]
+    if memo is None:
+        return _drop_empty(value)
+    k = 'shared', id(src), key
+    if k not in memo or memo[k][0] is not value:
+        memo[k] = value, _drop_empty(value)
+    return memo[k][1]
+
+
+def _run_variation(r, bases, core_model, timestamp, memo=None):
+    sol, data = bases[r['base']], r['data']
+    if 'solution' in sol:
+        src = sol['solution']
+        base = _define_inputs(src, sh.combine_nested_dicts(sh.selector(
+            data, src, allow_miss=True
+        ), data), memo)
+    elif 'base' in sol:
+        src = sol['base']
+        base = dict(src)
+        base.update(sh.combine_nested_dicts(sh.selector(
+            data, src, allow_miss=True
+        ), data, depth=2))
+    else:
+        return
+
+    # The plan row is a delta over the base: only the overridden values are
+    # copied, while the others (e.g., time series) are shared by the rows.
+    for i, d in base.items():
+        if i not in data and i in src and d is src[i]:
+            base[i] = _shared_value(src, i, memo)
         else:
-            continue
+            base[i] = _drop_empty(d)
+
+    sol = core_model(_define_inputs(sol, dict(
+        base=base,
+        vehicle_name='-'.join((str(r['id']), sol['vehicle_name'])),
+        timestamp=timestamp
+    ), memo))
+
+    summary, keys = {}, {
+        tuple(k.split('.')[:0:-1]) for k in base if k.startswith('output.')
+    }
+    for k, v in data.items():
+        k = ('plan %s' % k).split('.')[::-1]
+        sh.get_nested_dicts(summary, *k).update(v)
+
+    for k, v in sh.stack_nested_keys(sol['summary'], depth=3):
+        if k[:-1] not in keys:
+            sh.get_nested_dicts(summary, *k).update(v)
+    sol['summary'] = summary
+    return sol
 
-        for i, d in base.items():
-            if hasattr(d, 'items'):
-                base[i] = {k: v for k, v in d.items() if v is not sh.EMPTY}
 
-        sol = core_model(_define_inputs(sol, dict(
-            base=base,
-            vehicle_name='-'.join((str(r['id']), sol['vehicle_name'])),
-            timestamp=timestamp
-        )))
+def _shared_arrays(bases):
+    # Arrays of the plan bases, in the same order in every process.
+    import numpy as np
+    arrays, seen, stack = [], set(), [bases]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            arrays.append(obj)
+        elif isinstance(obj, dict):
+            stack.extend(reversed(list(obj.values())))
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(reversed(obj))
+    return arrays
+
+
+def _dumps_delta(obj, shared):
+    # Pickles the arrays of the plan bases as references.
+    import io
+    import dill
+
+    class _Pickler(dill.Pickler):
+        def persistent_id(self, o):
+            return shared.get(id(o))
+
+    f = io.BytesIO()
+    _Pickler(f).dump(obj)
+    return f.getvalue()
+
+
+def _loads_delta(data, arrays):
+    import io
+    import dill
+
+    class _Unpickler(dill.Unpickler):
+        def persistent_load(self, pid):
+            return arrays[pid]
+
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+def _run_variation_worker(args):
+    r, timestamp = args
+    sol = _run_variation(r, _bases, _core_model, timestamp, _memo)
+    return sol and _dumps_delta(sol, _shared)
+
+
+def _map_variations(plan, bases, core_model, timestamp, jobs=1,
+                    cmd_flags=None, dsp_snapshot=False, total=None):
+    jobs = _get_n_jobs(jobs, total)
+    if jobs == 1:
+        # The workflow pruning is computed once per base and overridden keys.
+        memo = {}
+        for r in plan:
+            yield _run_variation(r, bases, core_model, timestamp, memo)
+        return
+    import dill
+    import multiprocessing
+    # Base solutions are sent once to each worker, not for each row, and the
+    # solutions share (i.e., not copy) the arrays of the bases.
+    arrays, bases = _shared_arrays(bases), dill.dumps(bases)
+    args = ((r, timestamp) for r in plan)
+    init_args = cmd_flags, bases, dsp_snapshot
+    with multiprocessing.Pool(jobs, _init_core_worker, init_args) as pool:
+        # Rows are submitted by chunks, since `imap` consumes all the plan.
+        for chunk in iter(lambda: list(itertools.islice(args, jobs * 16)), []):
+            for sol in pool.imap(_run_variation_worker, chunk):
+                yield sol and _loads_delta(sol, arrays)
+
+
+def _run_variations(plan, bases, core_model, timestamp, jobs=1,
+                    cmd_flags=None, dsp_snapshot=False, journal=None,
+                    total=None):
+    # The plan (i.e., journal key and row) is consumed lazily.
+    plan, rows = itertools.tee(plan)
+    it = _map_variations(
+        (r for k, r in rows), bases, core_model, timestamp, jobs, cmd_flags,
+        dsp_snapshot, total
+    )
+    with _ProgressBar(total=total, _format_meter=_format_meter) as bar:
+        for key, r in plan:
+            bar.current = r
+            bar.refresh()
+            sol = next(it)
+            bar.update()
+            if sol is not None:
+                if journal is not None and 'summary' in sol:
+                    journal.add(key, _summary_row(sol))
+                yield sol
+
+
+def _released(sol):
+    # Completed runs without their full solution (i.e., resumed or streamed).
+    return sol.get('resumed') or sol.get('streamed')
+
+
+def _scan_plans(plans, cmd_flags, journal=None):
+    # Plans are streamed, hence their rows are validated in advance to find
+    # the bases. A plan with an invalid row is rejected as a whole. The rows to
+    # be run are spilled on disk, hence they are validated (and keyed) once.
+    from .core.load.plan import InvalidPlan, RowsFile
+    valid, run_bases, load_bases, n = [], set(), set(), 0
+    for plan in plans:
+        bases = set(), set()
+
+        def _rows():
+            for key, r in _plan_rows([plan], cmd_flags, journal):
+                bases[not r['run_base']].add(osp.abspath(r['base']))
+                yield key, r
 
-        summary, keys = {}, {
-            tuple(k.split('.')[:0:-1]) for k in base if k.startswith('output.')
+        try:
+            rows = RowsFile(_rows())
+        except InvalidPlan as ex:
+            log.error('Simulation plan of "%s" rejected: %s', plan[0], ex)
+            continue
+        valid.append((plan[0], rows))
+        run_bases.update(bases[0])
+        load_bases.update(bases[1])
+        n += len(rows)
+    return valid, run_bases, load_bases, n
+
+
+def _row_key(row):
+    # Pickled (i.e., not truncated as `repr`) values of a plan row.
+    import pickle
+    return pickle.dumps(sorted(sh.stack_nested_keys(
+        {k: v for k, v in row.items() if k != 'id'}
+    )), 4)
+
+
+def _plan_rows(plans, cmd_flags, journal=None):
+    # Yields the journal keys and the rows of the plans to be run.
+    from .cache import hash_key
+    file_keys = {}
+
+    def _key(fp):
+        fp = osp.abspath(fp)
+        if fp not in file_keys:
+            file_keys[fp] = _run_key(fp, cmd_flags)
+        return file_keys[fp]
+
+    for fp, plan in plans:
+        for r in plan:
+            key = None
+            if journal is not None:
+                key = hash_key(
+                    _key(fp), _key(r['base']), r['id'], _row_key(r)
+                )
+                if journal.resume(key) is not None:  # Completed row.
+                    continue
+            yield key, r
+
+
+def _summary_row(sol):
+    return sh.combine_dicts(
+        dict(sh.stack_nested_keys(sol.get('summary', {}), depth=4)), base={
+            'id': sol['vehicle_name'],
+            'base': sol['input_file_name']
         }
-        for k, v in data.items():
-            k = ('plan %s' % k).split('.')[::-1]
-            sh.get_nested_dicts(summary, *k).update(v)
+    )
+
+
+def _json_default(o):
+    if hasattr(o, 'tolist'):  # Numpy objects.
+        return o.tolist()
+    return str(o)
+
+
+def _dumps_row(row):
+    # One-line encoding of a summary row, that preserves the types of keys
+    # and values (e.g., tuples, numpy arrays), unlike JSON.
+    import dill
+    import base64
+    return base64.b64encode(dill.dumps(row)).decode('ascii')
+
+
+def _loads_row(line):
+    import dill
+    import base64
+    return dill.loads(base64.b64decode(line))
+
+
+def _write_summary_row(summary_stream, row):
+    with open(summary_stream, 'a') as f:
+        f.write('%s\n' % _dumps_row(row))
+
+
+def _read_summary_rows(summary_stream):
+    with open(summary_stream) as f:
+        for line in f:
+            try:
+                yield _loads_row(line.strip())
+            except Exception:  # Truncated line.
+                continue
+
+
+def _stream_summary(solutions, summary_stream, keep=False):
+    os.makedirs(osp.dirname(summary_stream) or '.', exist_ok=True)
+    for sol in solutions:
+        _write_summary_row(summary_stream, _summary_row(sol))
+        if keep:
+            yield sol
+
+
+@sh.add_function(
+    dsp, inputs_kwargs=True, inputs_defaults=True, outputs=['journal']
+)
+def define_journal(cmd_flags, checkpoint=False, resume=False):
+    """
+    Defines the checkpoint journal of the completed runs.
+
+    A run without `resume` starts a new journal (i.e., the previous one is
+    removed).
+
+    :param cmd_flags:
+        Command line options.
+    :type cmd_flags: dict
+
+    :param checkpoint:
+        Record the completed runs into the output folder?
+    :type checkpoint: bool
+
+    :param resume:
+        Skip the runs completed in the output folder?
+    :type resume: bool
 
-        for k, v in sh.stack_nested_keys(sol['summary'], depth=3):
-            if k[:-1] not in keys:
-                sh.get_nested_dicts(summary, *k).update(v)
-        sol['summary'] = summary
-        yield sol
+    :return:
+        Checkpoint journal of the completed runs (None if not required).
+    :rtype: co2mpas.journal.Journal
+    """
+    from .journal import Journal, JOURNAL_FILE_NAME
+    fp = osp.join(
+        cmd_flags.get('output_folder', './outputs'), JOURNAL_FILE_NAME
+    )
+    if not resume and osp.isfile(fp):
+        log.info('Removing the journal of the previous run (%s)...', fp)
+        os.remove(fp)
+    if checkpoint or resume:
+        return Journal(fp, resume)
+
+
+@sh.add_function(
+    dsp, inputs_kwargs=True, inputs_defaults=True, outputs=['profiler']
+)
+def define_profiler(profile=False):
+    """
+    Defines the profiler of the model solutions.
+
+    :param profile:
+        Profile the run?
+    :type profile: bool
+
+    :return:
+        Profiler of the model solutions.
+    :rtype: co2mpas.profiler.Profiler
+    """
+    if profile:
+        from .profiler import Profiler
+        return Profiler()
+    return None
+
+
+@sh.add_function(
+    dsp, inputs_kwargs=True, inputs_defaults=True, outputs=['summary_stream']
+)
+def define_summary_stream(output_summary_file, stream_summary=False):
+    """
+    Defines the file path where summary rows are streamed.
 
+    :param output_summary_file:
+        Output summary file path.
+    :type output_summary_file: str
+
+    :param stream_summary:
+        Write the summary rows as soon as solutions are computed?
+    :type stream_summary: bool
 
-@sh.add_function(dsp, outputs=['solutions'])
-def run_plan(core_solutions, core_model, cmd_flags, timestamp):
+    :return:
+        File path where summary rows are streamed (one `dill` base64 encoded
+        row per line).
+    :rtype: str
+    """
+    if stream_summary:
+        return '%s.rows' % osp.splitext(output_summary_file)[0]
+    return None
+
+
+dsp.add_data('plot_workflow', False)
+
+
+@sh.add_function(dsp, inputs_kwargs=True, outputs=['solutions'])
+def run_plan(core_solutions, core_model, cmd_flags, timestamp, jobs=1,
+             results_cache=None, summary_stream=None, plot_workflow=False,
+             dsp_snapshot=False, profiler=None, journal=None,
+             inputs_cache=None):
     """
     Run simulation plans.
 
+    The plan rows are streamed (i.e., read and validated once, spilled on disk,
+    and run one by one), hence, when the summary rows are streamed, the memory
+    usage does not depend on the plan length.
+
     :param core_solutions:
         Core model solutions.
     :type core_solutions:  dict[str, schedula.Solution]
@@ -389,28 +1157,91 @@ def run_plan(core_solutions, core_model, cmd_flags, timestamp):
         Run timestamp.
     :type timestamp: str
 
+    :param jobs:
+        Number of parallel processes (if <= 0, all CPUs are used).
+    :type jobs: int
+
+    :param results_cache:
+        Cache of the core model results.
+    :type results_cache: co2mpas.cache.FileCache
+
+    :param summary_stream:
+        File path where summary rows are streamed. If given, the solutions
+        are released after writing their summary rows.
+    :type summary_stream: str
+
+    :param plot_workflow:
+        Open workflow-plot in browser, after run finished.
+    :type plot_workflow: bool
+
+    :param dsp_snapshot:
+        Load the core model of the parallel processes from a snapshot?
+    :type dsp_snapshot: bool
+
+    :param profiler:
+        Profiler of the model solutions.
+    :type profiler: co2mpas.profiler.Profiler
+
+    :param journal:
+        Checkpoint journal of the completed runs.
+    :type journal: co2mpas.journal.Journal
+
+    :param inputs_cache:
+        Cache of the validated inputs.
+    :type inputs_cache: co2mpas.cache.FileCache
+
     :return:
         All model solutions.
     :rtype: list[schedula.Solution]
     """
     bases = core_solutions.copy()
-    plan = sum((sol.get('plan', []) for sol in bases.values()), [])
+    plans, run_bases, load_bases, n = _scan_plans([
+        (k, sol['plan']) for k, sol in bases.items() if sol.get('plan')
+    ], cmd_flags, journal)
     # Run base.
-    fp = {r['base'] for r in plan if r['run_base']} - set(bases)
-    bases.update(run_core(core_model, cmd_flags, timestamp, fp))
-    solutions = list(bases.values())
+    fp = run_bases - set(bases)
+    new = run_core(
+        core_model, cmd_flags, timestamp, fp, jobs, results_cache,
+        dsp_snapshot, journal, inputs_cache, profiler=profiler
+    )
+    bases.update(new)
+    # Rerun resumed or streamed bases (their summary rows are written).
+    rerun = {k for k in run_bases if _released(bases.get(k, {}))}
+    bases.update(run_core(
+        core_model, cmd_flags, timestamp, rerun, jobs, results_cache,
+        dsp_snapshot, inputs_cache=inputs_cache
+    ))
     # Load inputs.
-    fp = {r['base'] for r in plan if not r['run_base']} - set(bases) - fp
+    fp = load_bases - {
+        k for k, sol in bases.items() if 'base' in sol or not _released(sol)
+    } - fp - rerun
     bases.update(run_core(
-        core_model, cmd_flags, timestamp, fp, outputs=['base', 'vehicle_name']
+        core_model, cmd_flags, timestamp, fp, jobs, results_cache,
+        dsp_snapshot, inputs_cache=inputs_cache,
+        outputs=['base', 'vehicle_name']
     ))
-    if plan:
-        solutions.extend(_run_variations(plan, bases, core_model, timestamp))
-    return solutions
-
-
-@sh.add_function(dsp, outputs=['summary'])
-def get_summary(solutions):
+    solutions = (sol for sol in new.values() if not _released(sol))
+    if n:
+        variations = _run_variations(
+            itertools.chain.from_iterable(r for _, r in plans), sh.selector(
+                run_bases | load_bases, bases, allow_miss=True
+            ), core_model, timestamp, jobs, cmd_flags, dsp_snapshot, journal, n
+        )
+        if profiler is not None:
+            variations = profiler.collect(variations)
+        solutions = itertools.chain(solutions, variations)
+    # Core solutions are already profiled (and streamed).
+    core = [sol for sol in core_solutions.values() if not _released(sol)]
+    if summary_stream:
+        # Solutions are kept only to plot the workflow.
+        solutions = _stream_summary(solutions, summary_stream, plot_workflow)
+        if not plot_workflow:
+            core = []
+    return core + list(solutions)
+
+
+@sh.add_function(dsp, inputs_kwargs=True, outputs=['summary'])
+def get_summary(solutions, summary_stream=None, journal=None):
     """
     Extract summary data from model solutions.
 
@@ -418,16 +1249,25 @@ def get_summary(solutions):
         All model solutions.
     :type solutions: list[schedula.Solution]
 
+    :param summary_stream:
+        File path where summary rows are streamed.
+    :type summary_stream: str
+
+    :param journal:
+        Checkpoint journal of the completed runs.
+    :type journal: co2mpas.journal.Journal
+
     :return:
         Summary data.
     :rtype: list
     """
-    return [sh.combine_dicts(
-        dict(sh.stack_nested_keys(sol.get('summary', {}), depth=4)), base={
-            'id': sol['vehicle_name'],
-            'base': sol['input_file_name']
-        }
-    ) for sol in solutions]
+    summary = journal.rows() if journal is not None else []
+    if summary_stream:
+        if osp.isfile(summary_stream):
+            summary.extend(_read_summary_rows(summary_stream))
+    else:
+        summary.extend(_summary_row(sol) for sol in solutions)
+    return summary
 
 
 @sh.add_function(dsp, outputs=['output_summary_file'])
@@ -451,7 +1291,61 @@ def define_output_summary_file(cmd_flags, timestamp):
     return osp.join(fp, '%s-summary.xlsx' % timestamp)
 
 
-@sh.add_function(dsp, outputs=['run'], input_domain=check_first_arg)
+@sh.add_function(dsp, outputs=['output_profile_file'])
+def define_output_profile_file(cmd_flags, timestamp):
+    """
+    Defines the output profile file path (without extension).
+
+    :param cmd_flags:
+        Command line options.
+    :type cmd_flags: dict
+
+    :param timestamp:
+        Run timestamp.
+    :type timestamp: str
+
+    :return:
+        Output profile file path.
+    :rtype: str
+    """
+    fp = cmd_flags.get('output_folder', './outputs')
+    return osp.join(fp, '%s-profile' % timestamp)
+
+
+# noinspection PyUnusedLocal
+def _check_first_arg(first, *args):
+    # Like `co2mpas.utils.check_first_arg`, without importing numpy.
+    return bool(first)
+
+
+# noinspection PyUnusedLocal
+@sh.add_function(dsp, outputs=['profile_files'], input_domain=_check_first_arg)
+def save_profile(profiler, output_profile_file, solutions):
+    """
+    Save the profile of the model solutions.
+
+    :param profiler:
+        Profiler of the model solutions.
+    :type profiler: co2mpas.profiler.Profiler
+
+    :param output_profile_file:
+        Output profile file path (without extension).
+    :type output_profile_file: str
+
+    :param solutions:
+        All model solutions (i.e., the profile is complete).
+    :type solutions: list[schedula.Solution]
+
+    :return:
+        Output profile file paths.
+    :rtype: list[str]
+    """
+    files = profiler.save(output_profile_file)
+    log.info('CO2MPAS profile written into (%s)...', ', '.join(files))
+    return files
+
+
+@sh.add_function(dsp, outputs=['run'], input_domain=_check_first_arg)
 def save_summary(summary, output_summary_file, start_time):
     """
     Save CO2MPAS model configurations.
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+It contains an on-disk cache to store CO2MPAS results.
+"""
+import os
+import glob
+import hashlib
+import functools
+import logging
+import os.path as osp
+
+log = logging.getLogger(__name__)
+
+#: Default cache folder.
+CACHE_FOLDER = os.environ.get(
+    'CO2MPAS_CACHE', osp.join(osp.expanduser('~'), '.co2mpas', 'cache')
+)
+
+
+def hash_key(*parts):
+    """
+    Returns the hash key of the given parts.
+
+    :param parts:
+        Parts of the key (`bytes` or objects with a deterministic `repr`).
+    :type parts: bytes | object
+
+    :return:
+        Hash key.
+    :rtype: str
+    """
+    h = hashlib.sha256()
+    for p in parts:
+        if not isinstance(p, bytes):
+            p = repr(p).encode('utf-8')
+        h.update(hashlib.sha256(p).digest())
+    return h.hexdigest()
+
+
+@functools.lru_cache(None)
+def sources_key():
+    """
+    Returns the hash key of the CO2MPAS version and source files.
+
+    Source files are identified by their path, size, and modification time,
+    to invalidate the cache also on development installations.
+
+    :return:
+        Hash key.
+    :rtype: str
+    """
+    from co2mpas._version import __version__
+    d, files = osp.dirname(__file__), []
+    for fp in sorted(glob.glob(osp.join(d, '**', '*.py'), recursive=True)):
+        st = os.stat(fp)
+        files.append((osp.relpath(fp, d), st.st_size, st.st_mtime))
+    return hash_key(__version__, files)
+
+
+def conf_key():
+    """
+    Returns the hash key of the CO2MPAS sources and model configurations.
+
+    :return:
+        Hash key.
+    :rtype: str
+    """
+    import yaml
+    from co2mpas.defaults import dfl
+    # YAML sorts the keys, hence the dump is deterministic.
+    return hash_key(
+        sources_key(), yaml.dump(dfl.to_dict(), Dumper=yaml.CDumper)
+    )
+
+
+def file_key(file_name, *parts):
+    """
+    Returns the hash key of a file content plus some extra parts.
+
+    :param file_name:
+        File path.
+    :type file_name: str
+
+    :param parts:
+        Extra parts of the key.
+    :type parts: bytes | object
+
+    :return:
+        Hash key.
+    :rtype: str
+    """
+    h = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for b in iter(lambda: f.read(1 << 20), b''):
+            h.update(b)
+    return hash_key(h.digest(), *parts)
+
+
+class FileCache:
+    """
+    On-disk key-value store with a size-bounded LRU eviction policy.
+
+    Values are serialized with `dill`. Every read updates the file
+    modification time, that is used to evict the least recently used items.
+    """
+
+    def __init__(self, folder=CACHE_FOLDER, max_size=1024):
+        """
+        :param folder:
+            Cache folder.
+        :type folder: str
+
+        :param max_size:
+            Maximum size of the cache folder [MB].
+        :type max_size: float
+        """
+        self.folder = folder
+        self.max_size = max_size
+
+    def _path(self, key):
+        return osp.join(self.folder, '%s.dill' % key)
+
+    def __contains__(self, key):
+        return osp.isfile(self._path(key))
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value.
+
+        :param key:
+            Cache key.
+        :type key: str
+
+        :param default:
+            Value to return when the key is missing.
+        :type default: T
+
+        :return:
+            Cached value.
+        :rtype: object
+        """
+        import dill
+        fp = self._path(key)
+        try:
+            with open(fp, 'rb') as f:
+                value = dill.load(f)
+        except FileNotFoundError:
+            return default
+        except Exception as ex:
+            log.warning('Removing corrupted cache file (%s):\n%s', fp, ex)
+            self.discard(key)
+            return default
+        try:
+            os.utime(fp)  # Mark as recently used.
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value):
+        """
+        Stores a value into the cache and evicts the least recently used items.
+
+        :param key:
+            Cache key.
+        :type key: str
+
+        :param value:
+            Value to be cached.
+        :type value: object
+        """
+        import dill
+        fp = self._path(key)
+        os.makedirs(self.folder, exist_ok=True)
+        tmp = '%s.%d.tmp' % (fp, os.getpid())
+        try:
+            with open(tmp, 'wb') as f:
+                dill.dump(value, f)
+            os.replace(tmp, fp)  # Atomic, for concurrent runs.
+        except Exception as ex:
+            log.warning('Failed caching (%s):\n%s', fp, ex)
+            if osp.isfile(tmp):
+                os.remove(tmp)
+            return
+        self.evict()
+
+    def discard(self, key):
+        """
+        Removes a key from the cache.
+
+        :param key:
+            Cache key.
+        :type key: str
+        """
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        """
+        Removes the least recently used items exceeding the maximum size.
+        """
+        files = []
+        for fp in glob.glob(osp.join(self.folder, '*.dill')):
+            try:
+                st = os.stat(fp)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, fp))
+        size, max_size = sum(v[1] for v in files), self.max_size * 2 ** 20
+        for _, s, fp in sorted(files):
+            if size <= max_size:
+                break
+            try:
+                os.remove(fp)
+                size -= s
+            except OSError:
+                pass
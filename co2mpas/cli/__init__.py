@@ -21,15 +21,6 @@ import os.path as osp
 from co2mpas import dsp as _process
 from co2mpas._version import __version__
 
-try:
-    from co2mpas.cli.sync import cli as _sync
-except ImportError:
-    _sync = None
-try:  # TODO: to be changed to co2mpas_gui.
-    from co2wui.cli import cli as _gui
-except ImportError:
-    _gui = None
-
 log = logging.getLogger('co2mpas.cli')
 CO2MPAS_HOME = os.environ.get('CO2MPAS_HOME', '.')
 
@@ -50,8 +41,43 @@ logger = _Logger('cli')
 click_log.basic_config(logger)
 
 
+class _LazyGroup(click.Group):
+    """
+    Click group that imports the optional sub-commands only when requested.
+    """
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        import importlib.util
+        super(_LazyGroup, self).__init__(*args, **kwargs)
+        # Optional commands are listed if their package is installed.
+        self.lazy_commands = {
+            name: v for name, v in (lazy_commands or {}).items()
+            if importlib.util.find_spec(v[2]) is not None
+        }
+
+    def list_commands(self, ctx):
+        commands = super(_LazyGroup, self).list_commands(ctx)
+        return sorted(set(commands).union(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            import importlib
+            module, attr, _ = self.lazy_commands[cmd_name]
+            try:
+                cmd = getattr(importlib.import_module(module), attr)
+                self.add_command(cmd, cmd_name)
+            except ImportError as ex:
+                log.debug('Skipping `%s` command due to:\n%r', cmd_name, ex)
+        return super(_LazyGroup, self).get_command(ctx, cmd_name)
+
+
 @click.group(
-    'co2mpas', context_settings=dict(help_option_names=['-h', '--help'])
+    'co2mpas', context_settings=dict(help_option_names=['-h', '--help']),
+    cls=_LazyGroup, lazy_commands={  # name: (module, command, requirement).
+        'syncing': ('co2mpas.cli.sync', 'cli', 'syncing'),
+        # TODO: to be changed to co2mpas_gui.
+        'gui': ('co2wui.cli', 'cli', 'co2wui')
+    }
 )
 @click.version_option(__version__)
 @click_log.simple_verbosity_option(logger)
@@ -112,6 +138,68 @@ def conf(output_file, **kwargs):
     return _process(inputs, ['conf', 'done'])
 
 
+@cli.command('convert', short_help='Converts input files into binary files.')
+@click.argument('input-files', nargs=-1, type=click.Path(exists=True))
+@click.option(
+    '-O', '--output-folder', help='Output folder.', default='./inputs',
+    type=click.Path(file_okay=False, writable=True), show_default=True
+)
+def convert(input_files, output_folder):
+    """
+    Converts all files into INPUT_FILES into CO2MPAS binary files `.npz`.
+
+    The binary files are loaded faster, since their time-series are
+    memory-mapped.
+
+    INPUT_FILES: List of input files and/or folders (format: .xlsx, .dill).
+    """
+    inputs = dict(input_files=input_files, output_folder=output_folder)
+    return _process(inputs, ['convert', 'done'])
+
+
+@cli.command('plan', short_help='Generates a parametric-sweep plan.')
+@click.argument(
+    'output-file', default='./plan.sweep.yaml', required=False,
+    type=click.Path(writable=True)
+)
+@click.option(
+    '-B', '--base-file', type=click.Path(exists=True), required=True,
+    help='Base input file of the plan rows.'
+)
+@click.option(
+    '-P', '--parameter', 'sweep_parameters', multiple=True, required=True,
+    metavar='NAME=MIN:MAX[:NUM]|NAME=V1[,V2,...]',
+    help='Sweep parameter (e.g., base.input.calibration.wltp_h.f0=10:20:5).'
+)
+@click.option(
+    '-M', '--method', 'sweep_method', default='grid', show_default=True,
+    type=click.Choice(['grid', 'lhs', 'sobol']),
+    help='Sweep method: Cartesian grid, Latin hypercube, or Sobol sampling.'
+)
+@click.option(
+    '-N', '--samples', type=int, help='Number of samples (only lhs and sobol).'
+)
+@click.option('-S', '--seed', type=int, help='Seed of the random samples.')
+@click.option(
+    '--run-base/--no-run-base', default=True, show_default=True,
+    help='Run the base input file.'
+)
+def plan(**inputs):
+    """
+    Writes a parametric-sweep simulation plan into OUTPUT_FILE.
+
+    The plan rows are generated on the fly when the sweep file is given to the
+    `run` command, hence plans with millions of rows are not written to disk.
+
+    OUTPUT_FILE: File path `.sweep.yaml` or `.csv` (i.e., the expanded plan).
+    [default: ./plan.sweep.yaml]
+    """
+    sol = _process(inputs, ['sweep', 'done'])
+    if 'sweep' not in sol:  # The error is logged by the dispatcher.
+        raise click.ClickException('Sweep plan cannot be generated!')
+    return sol
+
+
 @cli.command('plot', short_help='Plots the CO2MPAS model.')
 @click.option(
     '-C', '--cache-folder', help='Folder to save temporary html files.',
@@ -205,27 +293,149 @@ def plot(cache_folder, host, port):
     default='./DICE_KEYS/secret.passwords', type=click.Path(),
     show_default=True
 )
-def run(input_files, cache_folder, host, port, plot_workflow, **kwargs):
+@click.option(
+    '-j', '--jobs', type=int, default=1, show_default=True,
+    help='Number of parallel processes (if <= 0, all CPUs are used). A single '
+         'input file is parsed with parallel processes.'
+)
+@click.option(
+    '-NC', '--no-cache', is_flag=True,
+    help='Do not use the caches of the validated inputs and of the core model '
+         'results.'
+)
+@click.option(
+    '-CS', '--cache-size', type=float, default=1024, show_default=True,
+    help='Maximum size of each cache [MB].'
+)
+@click.option(
+    '-SS', '--stream-summary', is_flag=True,
+    help='Stream the summary rows into a `.rows` file and release the '
+         'solutions (it reduces the memory usage).'
+)
+@click.option(
+    '-DS', '--dsp-snapshot', is_flag=True,
+    help='Load the model from a snapshot cache file (faster start-up).'
+)
+@click.option(
+    '-PR', '--profile', is_flag=True,
+    help='Save the model node durations of all runs (`.json`, `.csv`, and '
+         'flame-graph `.folded` files). It disables the results cache.'
+)
+@click.option(
+    '-CK', '--checkpoint', is_flag=True,
+    help='Record the completed runs into the output folder (see '
+         '`co2mpas-journal.jsonl`), to be skipped with `--resume`.'
+)
+@click.option(
+    '-R', '--resume', is_flag=True,
+    help='Skip the runs completed in the output folder (see '
+         '`co2mpas-journal.jsonl`) and merge their summary rows. It implies '
+         '`--checkpoint`.'
+)
+def run(**kwargs):
     """
     Run CO2MPAS for all files into INPUT_FILES.
 
     INPUT_FILES: List of input files and/or folders
-                 (format: .xlsx, .dill, .co2mpas.ta, .co2mpas).
+                 (format: .xlsx, .dill, .npz, .csv, .sweep.yaml, .co2mpas.ta,
+                 .co2mpas). Within the folders, only the `.plan.csv` files are
+                 loaded as plans.
     """
+    inputs = _run_inputs(**kwargs)
+    inputs[sh.START] = inputs['cmd_flags']
+    os.makedirs(inputs.get('output_folder') or '.', exist_ok=True)
+    return _process(inputs, ['plot', 'done', 'run', 'profile_files'])
+
+
+def _run_inputs(input_files, cache_folder, host, port, plot_workflow, jobs,
+                no_cache, cache_size, stream_summary, dsp_snapshot, profile,
+                checkpoint, resume, **kwargs):
     kwargs = {k: v for k, v in kwargs.items() if v is not None}
-    inputs = dict(
+    return dict(
         plot_workflow=plot_workflow, host=host, port=port, cmd_flags=kwargs,
-        input_files=input_files, cache_folder=cache_folder, **{sh.START: kwargs}
+        input_files=input_files, cache_folder=cache_folder, jobs=jobs,
+        no_cache=no_cache, cache_size=cache_size, stream_summary=stream_summary,
+        dsp_snapshot=dsp_snapshot, profile=profile, checkpoint=checkpoint,
+        resume=resume
     )
-    os.makedirs(inputs.get('output_folder') or '.', exist_ok=True)
-    return _process(inputs, ['plot', 'done', 'run'])
 
 
-if _sync is not None:
-    cli.add_command(_sync, 'syncing')
+@cli.command('serve', short_help='Runs a CO2MPAS server with a warm model.')
+@click.option(
+    '-H', '--host', help='Hostname to listen on.', default='127.0.0.1',
+    type=str, show_default=True
+)
+@click.option(
+    '-P', '--port', help='Port of the server.', default=4999, type=int,
+    show_default=True
+)
+@click.option(
+    '-MC', '--model-conf', type=click.Path(exists=True),
+    help='Model-configuration file path `.yaml`.'
+)
+@click.option(
+    '-T', '--token', type=str, envvar='CO2MPAS_SERVER_TOKEN',
+    help='Token required to submit runs (mandatory to listen on a '
+         'non-loopback address).'
+)
+def serve(host, port, model_conf, token):
+    """
+    Runs a local CO2MPAS server that keeps the model registered in memory.
+
+    Runs are submitted with the `submit` command.
+    """
+    from co2mpas.server import Server
+    try:
+        server = Server((host, port), model_conf, token)
+    except ValueError as ex:
+        raise click.BadParameter(str(ex), param_hint="'-H' / '--host'")
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+
+
+@cli.command(
+    'submit', short_help='Submits a run to a CO2MPAS server.',
+    context_settings=dict(ignore_unknown_options=True)
+)
+@click.option(
+    '-SH', '--server-host', help='Hostname of the server.',
+    default='127.0.0.1', type=str, show_default=True
+)
+@click.option(
+    '-SP', '--server-port', help='Port of the server.', default=4999,
+    type=int, show_default=True
+)
+@click.option(
+    '-ST', '--server-token', type=str, envvar='CO2MPAS_SERVER_TOKEN',
+    help='Token of the server.'
+)
+@click.argument('run-args', nargs=-1, type=click.UNPROCESSED)
+def submit(server_host, server_port, server_token, run_args):
+    """
+    Submits a run to a CO2MPAS server (see the `serve` command).
+
+    RUN_ARGS: Arguments and options of the `run` command.
+    """
+    from co2mpas.server import submit as _submit, abspath_inputs, RUN_KEYS
+    inputs = _run_inputs(**run.make_context('run', list(run_args)).params)
+    inputs = sh.selector(RUN_KEYS, inputs, allow_miss=True)
+    try:
+        res = _submit(
+            abspath_inputs(inputs), (server_host, server_port),
+            token=server_token
+        )
+    except Exception as ex:
+        raise click.ClickException(str(ex))
+    for fp in res['output_files']:
+        click.echo('Output file: %s' % fp)
+    click.echo('Summary file: %s' % res['summary_file'])
+    for fp in res.get('profile_files', ()):
+        click.echo('Profile file: %s' % fp)
 
-if _gui is not None:
-    cli.add_command(_gui, 'gui')
 
 if __name__ == '__main__':
     cli()
@@ -15,15 +15,22 @@ Sub-Modules:
     :nosignatures:
     :toctree: load/
 
+    binary
     excel
+    plan
     schema
+    sweep
     validate
 """
 import io
 import logging
 import functools
+import os.path as osp
 import schedula as sh
 from .excel import parse_excel_file
+from .binary import load_from_binary, BINARY_EXT
+from .plan import load_plan_file, PLAN_EXT
+from .sweep import load_sweep_file, SWEEP_EXT
 from .validate import dsp as _validate
 
 try:
@@ -39,21 +46,96 @@ dsp = sh.BlueDispatcher(
 )
 
 
+class InputFile(io.RawIOBase):
+    """
+    Read-only input file, that is read lazily.
+
+    It is a lightweight reference to the file: it is pickled as its path and
+    every read opens (and closes) the file, hence the solutions hold neither
+    copies of the input file bytes nor open file handles.
+    """
+
+    def __init__(self, file_name):
+        """
+        :param file_name:
+            Input file name.
+        :type file_name: str
+        """
+        super(InputFile, self).__init__()
+        self.name = osp.abspath(file_name)
+        self._pos = 0
+
+    def __reduce__(self):
+        return self.__class__, (self.name,), {'_pos': self._pos}
+
+    def __setstate__(self, state):
+        self._pos = state['_pos']
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.name)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += osp.getsize(self.name)
+        if offset < 0:
+            raise ValueError('Negative seek position %d!' % offset)
+        self._pos = offset
+        return offset
+
+    def read(self, size=-1):
+        with open(self.name, 'rb') as f:
+            f.seek(self._pos)
+            data = f.read(-1 if size is None else size)
+        self._pos += len(data)
+        return data
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def getvalue(self):
+        """
+        Returns the input file content (as :meth:`io.BytesIO.getvalue`).
+
+        :return:
+            Input file content.
+        :rtype: bytes
+        """
+        with open(self.name, 'rb') as f:
+            return f.read()
+
+
 @sh.add_function(dsp, outputs=['input_file'])
 def open_input_file(input_file_name):
     """
     Open the input file.
 
+    The file is read lazily (i.e., nothing is read when it is opened).
+
     :param input_file_name:
         Input file name.
     :type input_file_name: str
 
     :return:
         Input file.
-    :rtype: io.BytesIO
+    :rtype: InputFile
     """
-    with open(input_file_name, 'rb') as file:
-        return io.BytesIO(file.read())
+    return InputFile(input_file_name)
 
 
 # noinspection PyUnusedLocal
@@ -76,20 +158,36 @@ def check_file_format(input_file_name, *args, ext=('.xlsx',)):
     return input_file_name.lower().endswith(ext)
 
 
+def read_input_file(input_file):
+    """
+    Reads the input file in memory.
+
+    :param input_file:
+        Input file.
+    :type input_file: InputFile
+
+    :return:
+        In-memory input file (as required by `co2mpas_dice`).
+    :rtype: io.BytesIO
+    """
+    return io.BytesIO(input_file.getvalue())
+
+
 def load_from_dill(input_file):
     """
     Load inputs from .dill file.
 
     :param input_file:
         Input file.
-    :type input_file: io.BytesIO
+    :type input_file: InputFile
 
     :return:
         Raw input data.
     :rtype: dict
     """
     import dill
-    return dill.load(input_file)
+    # Avoids reading the file by small chunks.
+    return dill.loads(input_file.getvalue())
 
 
 dsp.add_function(
@@ -99,22 +197,58 @@ dsp.add_function(
     input_domain=functools.partial(check_file_format, ext=('.dill',))
 )
 
+dsp.add_function(
+    function=load_from_binary,
+    inputs=['input_file_name'],
+    outputs=['raw_data'],
+    input_domain=functools.partial(check_file_format, ext=(BINARY_EXT,))
+)
+
+dsp.add_function(
+    function=load_plan_file,
+    inputs=['input_file_name'],
+    outputs=['raw_data'],
+    input_domain=functools.partial(check_file_format, ext=(PLAN_EXT,))
+)
+
+dsp.add_function(
+    function=load_sweep_file,
+    inputs=['input_file_name'],
+    outputs=['raw_data'],
+    input_domain=functools.partial(check_file_format, ext=(SWEEP_EXT,))
+)
+
+dsp.add_data(
+    'parse_jobs', 1,
+    description='Number of parallel processes to parse the input sheets.'
+)
+
 dsp.add_function(
     function=parse_excel_file,
-    inputs=['input_file_name', 'input_file'],
+    inputs=['input_file_name', 'input_file', 'parse_jobs'],
     outputs=['raw_data'],
     input_domain=check_file_format
 )
 
 if _dice is not None:
+    dsp.add_function(
+        function=sh.add_args(read_input_file),
+        inputs=['input_file_name', 'input_file'],
+        outputs=['input_stream'],
+        input_domain=functools.partial(
+            check_file_format, ext=('.co2mpas.ta', '.co2mpas')
+        )
+    )
+
     _out, _inp = ['base', 'meta', 'dice'], [
-        'input_file_name', 'input_file', 'encryption_keys',
+        'input_file_name', 'input_stream', 'encryption_keys',
         'encryption_keys_passwords'
     ]
     # noinspection PyProtectedMember
     dsp.add_function(
         function=sh.Blueprint(sh.SubDispatchFunction(
-            _dice, function_id='load_ta_file', inputs=_inp[1:], outputs=_out
+            _dice, function_id='load_ta_file',
+            inputs=['input_file'] + _inp[2:], outputs=_out
         ))._set_cls(sh.add_args),
         description='Load inputs from .co2mpas.ta file.',
         inputs=_inp,
@@ -123,11 +257,11 @@ if _dice is not None:
         input_domain=functools.partial(check_file_format, ext=('.co2mpas.ta',))
     )
 
-    _out, _inp = ['data', 'dice'], ['input_file_name', 'input_file']
+    _out, _inp = ['data', 'dice'], ['input_file_name', 'input_stream']
     # noinspection PyProtectedMember
     dsp.add_function(
         function=sh.Blueprint(sh.SubDispatchFunction(
-            _dice, inputs=_inp[1:], outputs=_out
+            _dice, inputs=['input_file'], outputs=_out
         ))._set_cls(sh.add_args),
         function_id='load_co2mpas_file',
         description='Load inputs from .co2mpas file.',
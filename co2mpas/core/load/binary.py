@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+Functions to read/write inputs from/to the CO2MPAS binary format `.npz`.
+
+The binary file is an uncompressed zip archive (as :func:`numpy.savez`) of the
+parsed input data (i.e., `raw_data`), with the following members:
+
+- `tree.json`: data tree, where the arrays are replaced by references,
+- `<index>.npy`: arrays (i.e., numeric arrays, lists, and time-series).
+
+Since the members are not compressed and their data are 64-bytes aligned, the
+arrays are memory-mapped (copy-on-write) when loaded, hence they are read
+lazily from the disk without copies.
+"""
+import os
+import json
+import struct
+import zipfile
+import datetime
+import os.path as osp
+import numpy as np
+from .plan import Plan
+
+#: Extension of the binary input files.
+BINARY_EXT = '.npz'
+
+#: Name of the data tree member.
+TREE_MEMBER = 'tree.json'
+
+_ALIGN = 64  # Alignment of the array data (as `numpy.lib.format`).
+_ALIGN_EXTRA_ID = 0xD935  # Zip extra field used for padding (as `zipalign`).
+_ZIP_HEADER = 30  # Size of the zip local file header.
+_DATE_TYPES = datetime.datetime, datetime.date, datetime.time
+
+
+def _is_numeric_sequence(value):
+    return isinstance(value, (list, tuple)) and bool(value) and all(
+        isinstance(v, (int, float, np.number)) and
+        not isinstance(v, (bool, np.bool_)) for v in value
+    )
+
+
+def _encode(value, arrays):
+    if isinstance(value, Plan):  # The lazy plan is saved as list of rows.
+        return _encode(list(value.raw_rows()), arrays)
+    if isinstance(value, dict):
+        if all(isinstance(k, str) and not k.startswith('$') for k in value):
+            return {k: _encode(v, arrays) for k, v in value.items()}
+        return {'$dict': [
+            [_encode(k, arrays), _encode(v, arrays)] for k, v in value.items()
+        ]}
+    is_array = isinstance(value, np.ndarray)
+    if is_array and not value.dtype.hasobject or _is_numeric_sequence(value):
+        arrays.append(np.asarray(value))
+        return {'$array': len(arrays) - 1}
+    if is_array or isinstance(value, (list, tuple)):
+        return [_encode(v, arrays) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    for t in _DATE_TYPES:  # Note: `datetime` is a subclass of `date`.
+        if isinstance(value, t):
+            return {'$%s' % t.__name__: value.isoformat()}
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise TypeError(
+        'Object of type %s cannot be saved in the binary format!' %
+        type(value).__name__
+    )
+
+
+def _decode(value, arrays):
+    if isinstance(value, list):
+        return [_decode(v, arrays) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        (k, v), = value.items()
+        if k == '$array':
+            return arrays[v]
+        if k == '$dict':
+            return {_decode(i, arrays): _decode(j, arrays) for i, j in v}
+        if k[1:] in ('datetime', 'date', 'time') and k[0] == '$':
+            return getattr(datetime, k[1:]).fromisoformat(v)
+    return {k: _decode(v, arrays) for k, v in value.items()}
+
+
+def _array_member(name, offset):
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_STORED
+    # Padding of the local header, to align the `.npy` file in the archive.
+    pad = -(offset + _ZIP_HEADER + len(name.encode('utf-8')) + 4) % _ALIGN
+    info.extra = struct.pack('<2H', _ALIGN_EXTRA_ID, pad) + b'\0' * pad
+    return info
+
+
+def save_binary_file(raw_data, output_file):
+    """
+    Saves the parsed input data into a CO2MPAS binary file `.npz`.
+
+    :param raw_data:
+        Raw input data (e.g., the output of `parse_excel_file`).
+    :type raw_data: dict
+
+    :param output_file:
+        Output file path `.npz`.
+    :type output_file: str
+
+    :return:
+        Output file path.
+    :rtype: str
+    """
+    import io
+    arrays = []
+    tree = json.dumps(_encode(raw_data, arrays)).encode('utf-8')
+    os.makedirs(osp.dirname(output_file) or '.', exist_ok=True)
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_STORED) as zf:
+        zf.writestr(TREE_MEMBER, tree)
+        for i, a in enumerate(arrays):
+            buf = io.BytesIO()
+            np.lib.format.write_array(buf, a, allow_pickle=False)
+            zf.writestr(
+                _array_member('%d.npy' % i, zf.fp.tell()), buf.getvalue()
+            )
+    return output_file
+
+
+def _read_array(zf, f, info):
+    if info.compress_type != zipfile.ZIP_STORED:
+        with zf.open(info) as m:
+            return np.lib.format.read_array(m, allow_pickle=False)
+    f.seek(info.header_offset)
+    header = f.read(_ZIP_HEADER)
+    name_length, extra_length = struct.unpack('<2H', header[26:])
+    f.seek(info.header_offset + _ZIP_HEADER + name_length + extra_length)
+    version = np.lib.format.read_magic(f)
+    shape, fortran_order, dtype = getattr(
+        np.lib.format, 'read_array_header_%d_%d' % version
+    )(f)
+    if not np.prod(shape, dtype=int) or dtype.hasobject:
+        with zf.open(info) as m:
+            return np.lib.format.read_array(m, allow_pickle=False)
+    # Copy-on-write: the model can modify the inputs without copying them.
+    return np.asarray(np.memmap(
+        f, dtype=dtype, mode='c', offset=f.tell(), shape=shape,
+        order='F' if fortran_order else 'C'
+    ))
+
+
+def load_from_binary(input_file_name):
+    """
+    Load inputs from a CO2MPAS binary file `.npz`.
+
+    :param input_file_name:
+        Input file name.
+    :type input_file_name: str
+
+    :return:
+        Raw input data.
+    :rtype: dict
+    """
+    with zipfile.ZipFile(input_file_name) as zf, \
+            open(input_file_name, 'rb') as f:
+        try:
+            tree = json.loads(zf.read(TREE_MEMBER).decode('utf-8'))
+        except KeyError:
+            raise ValueError(
+                'File (%s) is not a CO2MPAS binary input file!' %
+                input_file_name
+            )
+        arrays = {}
+        for info in zf.infolist():
+            name, ext = osp.splitext(info.filename)
+            if ext == '.npy' and name.isdigit():
+                arrays[int(name)] = _read_array(zf, f, info)
+    return _decode(tree, arrays)
@@ -11,8 +11,9 @@ Functions to read inputs from excel.
 import math
 import regex
 import logging
+import datetime
 import functools
-import collections
+import collections.abc
 import os.path as osp
 import schedula as sh
 
@@ -137,7 +138,7 @@ def _get_sheet_type(
 def _check_none(v):
     if v is None:
         return True
-    elif isinstance(v, collections.Iterable) and not isinstance(v, str) \
+    elif isinstance(v, collections.abc.Iterable) and not isinstance(v, str) \
             and len(v) <= 1:
         # noinspection PyTypeChecker
         return _check_none(next(iter(v))) if len(v) == 1 else True
@@ -250,18 +251,915 @@ def _lasso_filters():
     return filters
 
 
-def _parse_sheet(match, sheet, sheet_name, res=None):
-    if res is None:
-        res = {}
-
-    sh_type = _get_sheet_type(**match)
+def _lasso_sheet(book, sheet_name, sh_type):
+    # Reference reader of the `_xl_ref` lasso, used to test `_read_sheet`.
     # noinspection PyProtectedMember
     from pandalone.xleash._lasso import lasso
-    data = lasso(
+    # noinspection PyProtectedMember
+    from pandalone.xleash.io._xlrd import _open_sheet_by_name_or_index
+    sheet = _open_sheet_by_name_or_index(book, 'book', sheet_name)
+    return lasso(
         _xl_ref[sh_type] % sheet_name, sheet=sheet,
         available_filters=_lasso_filters()
     )
 
+
+def _parse_cell(ctype, value):
+    # Same conversion of `pandalone.xleash.io._xlrd._parse_cell`.
+    import xlrd
+    if ctype == xlrd.XL_CELL_NUMBER:
+        i = int(value)
+        return i if i == value else value
+    elif ctype == xlrd.XL_CELL_TEXT:
+        return value
+    elif ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+    elif ctype == xlrd.XL_CELL_DATE:
+        d = xlrd.xldate.xldate_as_datetime(value, False)
+        if d.timetuple()[:3] == (1899, 12, 31):  # Time only.
+            d = datetime.time(d.hour, d.minute, d.second, d.microsecond)
+        return d
+    elif ctype == xlrd.XL_CELL_ERROR:
+        return float('nan')
+    return None  # Empty or blank cell.
+
+
+def _read_rect(sheet, r1, r2, c1, c2):
+    rect, nrows, ncols = [], sheet.nrows, sheet.ncols
+    for r in range(r1, r2 + 1):
+        if r < nrows:
+            types, values = sheet.row_types(r), sheet.row_values(r)
+            rect.append([
+                _parse_cell(types[c], values[c]) if c < ncols else None
+                for c in range(c1, c2 + 1)
+            ])
+        else:
+            rect.append([None] * (c2 - c1 + 1))
+    return rect
+
+
+def _expand_rect(states, r1, r2, c1, c2, down=True):
+    # Same least fixed point of the xleash `R` and `RD` expansions.
+    while True:
+        rect = r2, c2
+        full = states[r1:r2 + 1, c2 + 1:].any(0)
+        c2 += full.size if full.all() else int(full.argmin())
+        if down:
+            full = states[r2 + 1:, c1:c2 + 1].any(1)
+            r2 += full.size if full.all() else int(full.argmin())
+        if rect == (r2, c2):
+            return r1, r2, c1, c2
+
+
+def _capture_rect(states, sh_type):
+    # Resolves the `_xl_ref` of the sheet type, as xleash does.
+    nrows = states.shape[0]
+    if sh_type == 'pa':  # B2:C_
+        return min(1, nrows - 1), max(1, nrows - 1), 1, 2
+    row = 1 if sh_type == 'ts' else 0  # A2(R) or A1(R).
+    if row >= nrows or not states[row].any():
+        return None
+    col = int(states[row].argmax())
+    if sh_type == 'ts':  # .3:RD
+        return _expand_rect(states, row, 2, col, col)
+    return _expand_rect(states, row, nrows - 1, col, col, down=False)  # ._:R
+
+
+def _has_xl_refs(values):
+    return any(
+        isinstance(v, str) and '#' in v for row in values for v in row
+    )
+
+
+def _states_matrix(sheet):
+    # Full cells of the sheet, i.e. the xleash `states matrix`.
+    import xlrd
+    import numpy as np
+    types = np.array(
+        [sheet.row_types(r) for r in range(sheet.nrows)], dtype=int
+    ).reshape(sheet.nrows, sheet.ncols)
+    return (types != xlrd.XL_CELL_EMPTY) & (types != xlrd.XL_CELL_BLANK)
+
+
+_re_xl_ref = regex.compile(r"""
+    ^\s*(?:(?P<sheet>[^!]+)?!)?
+    (?:
+        (?:(?P<st_col>[A-Z]+|[_^])(?P<st_row>[1-9]\d*|[_^])|
+           R(?P<st_row2>-?[1-9]\d*|[_^.])C(?P<st_col2>-?[1-9]\d*|[_^.]))
+        (?:\((?P<st_mov>L|U|R|D|LD|LU|UL|UR|RU|RD|DL|DR)(?P<st_mod>[+?])?\))?
+    )?
+    (?:(?P<colon>:)
+        (?:
+            (?:(?P<nd_col>[A-Z]+|[_^.])(?P<nd_row>[1-9]\d*|[_^.])|
+               R(?P<nd_row2>-?[1-9]\d*|[_^.])C(?P<nd_col2>-?[1-9]\d*|[_^.]))
+            (?:\((?P<nd_mov>L|U|R|D|LD|LU|UL|UR|RU|RD|DL|DR)
+               (?P<nd_mod>[+?])?\))?
+        )?
+        (?::(?P<exp_moves>[LURD?1-9]+))?
+    )?
+    (?::\s*(?P<filters>[{"[].*))?$
+""", regex.IGNORECASE | regex.X | regex.DOTALL)
+
+_re_encased = regex.compile(r'^\s*(?P<q>[/\\"$%&])(.+)(?P=q)\s*$', regex.S)
+
+_re_exp_moves = regex.compile(r'([LURD]\d+)')
+
+_re_exp_move = regex.compile(r'^([LURD]+)(\d*)$')
+
+_moves = {'L': (0, -1), 'U': (-1, 0), 'R': (0, 1), 'D': (1, 0)}
+
+
+class _EmptyCapture(ValueError):
+    """
+    Raised when the capture rect of an xl-ref cannot be found.
+    """
+
+
+def _parse_edge(gs, prefix, default=None):
+    row = gs['%s_row' % prefix] or gs['%s_row2' % prefix]
+    col = gs['%s_col' % prefix] or gs['%s_col2' % prefix]
+    mov, mod = gs['%s_mov' % prefix], gs['%s_mod' % prefix]
+    if row is col is mov is mod is None:
+        return default
+    return row, col.upper(), mov and mov.upper(), mod
+
+
+def _parse_xl_ref(xl_ref):
+    """
+    Parses a string with the xleash `xl-ref` syntax.
+
+    :param xl_ref:
+        String like `#sheet!A1(D):..(D):{"func": "redim", "kwds": {"col": 1}}`.
+    :type xl_ref: str
+
+    :return:
+        Sheet name, first and second edges, expansion moves, options, and
+        filter (call-spec).
+    :rtype: tuple
+
+    :raises SyntaxError:
+        If the string is not an xl-ref.
+    """
+    import json
+    xl_ref = xl_ref.translate(str.maketrans('“”', '""'))
+    url, sep, fragment = xl_ref.partition('#')
+    match = fragment and _re_xl_ref.match(fragment)
+    if not match:
+        match = _re_encased.match(xl_ref)
+        if match:
+            return _parse_xl_ref(match.group(2))
+        raise SyntaxError('Not an `xl-ref` syntax: %s' % xl_ref)
+    if url:
+        raise ValueError('External workbooks are not supported: %s' % xl_ref)
+    gs = match.groupdict()
+    st, nd = _parse_edge(gs, 'st'), _parse_edge(gs, 'nd')
+    if gs['colon'] or st is None:  # Defaults are the sheet margins.
+        st, nd = st or ('^', '^', None, None), nd or ('_', '_', None, None)
+    filters, opts = gs['filters'], None
+    if filters:
+        try:
+            filters = json.loads(filters)
+        except ValueError as ex:
+            raise ValueError('Filters are not valid JSON: %s\n  JSON: \n%s' % (
+                ex, filters
+            ))
+        if isinstance(filters, dict):
+            opts = filters.pop('opts', None)
+            if opts is not None and not isinstance(opts, dict):
+                raise ValueError(
+                    'Filter-opts(%s) must be a json-object!' % opts
+                )
+    return gs['sheet'], st, nd, gs['exp_moves'], opts or {}, filters or None
+
+
+def _resolve_coord(coord, up, dn, base, col=False):
+    if coord == '^':
+        return up
+    elif coord == '_':
+        return dn
+    elif coord == '.':
+        if base is None:
+            raise ValueError('Cannot resolve `relative-coord` without base!')
+        return base
+    try:
+        c = int(coord)
+    except ValueError:
+        if not col:
+            raise
+        c = functools.reduce(lambda n, x: n * 26 + ord(x) - 64, coord, 0)
+    if c == 0:
+        raise ValueError('Uncooked-coord cannot be zero!')
+    return c - 1 if c > 0 else dn + c + 1
+
+
+def _states_vector(states, land, mov):
+    # States from the landing cell moving in the given direction.
+    r, c = land
+    if mov == 'L':
+        return states[r, :c + 1][::-1], 1, -1
+    elif mov == 'U':
+        return states[:r + 1, c][::-1], 0, -1
+    elif mov == 'R':
+        return states[r, c:], 1, 1
+    return states[r:, c], 0, 1
+
+
+def _target_opposite(states, dn, land, moves):
+    # Follows the moves from the landing cell up to the first full cell.
+    import numpy as np
+    target = np.array(land)
+    if land[0] > dn[0] and 'U' in moves:
+        target[0] = dn[0]
+    if land[1] > dn[1] and 'L' in moves:
+        target[1] = dn[1]
+    step = moves[1:] and _moves[moves[1]]
+    while (target >= 0).all():
+        try:
+            vector, i, sign = _states_vector(states, target, moves[0])
+        except IndexError:
+            break
+        if vector.any():
+            target[i] += sign * int(vector.argmax())
+            return tuple(int(v) for v in target)
+        if not step:
+            break
+        target += step
+    raise _EmptyCapture('No opposite-target found while moving(%s) from '
+                        'landing-%s!' % (moves, land))
+
+
+def _target_same(states, dn, land, moves):
+    # Follows the moves from the full landing cell up to the last full cell.
+    import numpy as np
+    target = list(land)
+    if land[0] <= dn[0] and land[1] <= dn[1] and states[land]:
+        for mov in moves:
+            vector, i, sign = _states_vector(states, land, mov)
+            if vector.all():
+                n = len(vector) - 1
+            else:
+                n = int(np.diff(vector.astype(int)).nonzero()[0].min())
+            target[i] = land[i] + sign * n
+        return tuple(target)
+    raise _EmptyCapture('No same-target found while moving(%s) from '
+                        'landing-%s!' % (moves, land))
+
+
+def _expand_moves(states, st, nd, exp_moves):
+    # Applies the xleash `expansion moves` to the rect.
+    import numpy as np
+    import itertools
+    offsets = {
+        'L': np.array([0, 0, -1, 0]), 'R': np.array([0, 0, 0, 1]),
+        'U': np.array([-1, 0, 0, 0]), 'D': np.array([0, 1, 0, 0])
+    }
+    indices = {
+        'L': [0, 1, 2, 2], 'R': [0, 1, 3, 3], 'U': [0, 0, 2, 3],
+        'D': [1, 1, 2, 3]
+    }
+    rect = np.array([
+        min(st[0], nd[0]), max(st[0], nd[0]), min(st[1], nd[1]),
+        max(st[1], nd[1])
+    ])
+    for moves in _re_exp_moves.split(exp_moves.upper().replace('?', '1')):
+        if not moves:
+            continue
+        match = _re_exp_move.match(moves)
+        if not match:
+            raise ValueError('Invalid rect-expansion(%s)!' % exp_moves)
+        dirs, times = match.groups()
+        for dirs in itertools.repeat(dirs, *(times and (int(times),) or ())):
+            prev = rect
+            for d in dirs:
+                r = rect + offsets[d]
+                i = r[indices[d]] + [0, 1, 0, 1]
+                if states[i[0]:i[1], i[2]:i[3]].any():
+                    rect = r
+            if (rect == prev).all():
+                break
+    rect = [int(v) for v in rect]
+    return (rect[0], rect[2]), (rect[1], rect[3])
+
+
+def _resolve_xl_rect(states, st_edge, nd_edge=None, exp_moves=None,
+                     base=None):
+    """
+    Resolves the capture rect of an xl-ref, as the xleash lasso does.
+
+    :param states:
+        Full cells of the sheet.
+    :type states: numpy.array
+
+    :param st_edge:
+        First edge (i.e., row, column, moves, and modifier).
+    :type st_edge: tuple
+
+    :param nd_edge:
+        Second edge (i.e., row, column, moves, and modifier).
+    :type nd_edge: tuple
+
+    :param exp_moves:
+        Expansion moves.
+    :type exp_moves: str
+
+    :param base:
+        Base cell of the relative coordinates of the first edge.
+    :type base: tuple[int]
+
+    :return:
+        Top-left and bottom-right cells of the capture rect. The second is
+        None for a single cell.
+    :rtype: tuple
+    """
+    import numpy as np
+    nrows, ncols = states.shape
+    if not nrows or not ncols:
+        raise _EmptyCapture('Empty sheet!')
+    full = np.argwhere(states)
+    up = tuple(full.min(0)) if full.size else (0, 0)
+    dn = nrows - 1, ncols - 1
+
+    def _cell(edge, base_cell):
+        return tuple(
+            _resolve_coord(edge[i], up[i], dn[i], base_cell and base_cell[i],
+                           col=i)
+            for i in (0, 1)
+        )
+
+    def _state(cell):
+        return 0 <= cell[0] < nrows and 0 <= cell[1] < ncols and states[cell]
+
+    st = _cell(st_edge, base)
+    if st_edge[2] is not None:
+        if not _state(st):
+            st = _target_opposite(states, dn, st, st_edge[2])
+        elif st_edge[3] == '+':
+            st = _target_same(states, dn, st, st_edge[2])
+    nd = None
+    if nd_edge is not None:
+        nd = _cell(nd_edge, st)
+        if nd_edge[2] is not None:
+            if not _state(nd):
+                nd = _target_opposite(states, dn, nd, nd_edge[2])
+            elif nd_edge[3] == '+' or (
+                    nd_edge[:2] == ('.', '.') and nd_edge[3] != '?'):
+                nd = _target_same(states, dn, nd, nd_edge[2])
+    if exp_moves:
+        return _expand_moves(states, st, nd or st, exp_moves)
+    if nd is not None:
+        st, nd = (min(st[0], nd[0]), min(st[1], nd[1])), (
+            max(st[0], nd[0]), max(st[1], nd[1])
+        )
+    return st, nd
+
+
+def _call_spec(spec):
+    # Parses the xleash `call-spec` (i.e., `func`, `args`, and `kwds`).
+    if isinstance(spec, str):
+        return spec, [], {}
+    elif isinstance(spec, list):
+        func, *items = spec
+        if len(items) > 2 or not all(
+                isinstance(v, (list, dict)) or v is None for v in items):
+            raise ValueError('Cannot decide `args`/`kwds` for call-spec(%s)!'
+                             % spec)
+        args = [v for v in items if isinstance(v, list)]
+        kwds = [v for v in items if isinstance(v, dict)]
+        if len(args) > 1 or len(kwds) > 1:
+            raise ValueError('Cannot decide `args`/`kwds` for call-spec(%s)!'
+                             % spec)
+        args, kwds = (args or [[]])[0], (kwds or [{}])[0]
+    elif isinstance(spec, dict):
+        func, args, kwds = spec.get('func'), spec.get('args'), spec.get('kwds')
+        args, kwds = args or [], kwds or {}
+    else:
+        raise ValueError('One of str, list or dict expected for call-spec(%s)!'
+                         % spec)
+    if not isinstance(func, str) or not isinstance(args, list) or \
+            not isinstance(kwds, dict):
+        raise ValueError('Invalid call-spec(%s)!' % spec)
+    return func, args, kwds
+
+
+def _redim(values, st, nd, scalar=None, cell=None, row=None, col=None,
+           table=None):
+    # Same reshaping of the xleash `redim` filter.
+    import numpy as np
+    if nd is None:
+        ndim = scalar
+    else:
+        ndim = (cell, row, col, table)[
+            bool(nd[1] - st[1]) + 2 * bool(nd[0] - st[0])
+        ]
+    if ndim is None:
+        return values
+    values = np.asarray(values)
+    if isinstance(ndim, list):
+        ndim, transpose = ndim
+        if transpose:
+            values = values.T
+    if ndim is not None:
+        if values.ndim < ndim:
+            values = values.reshape((1,) * (ndim - values.ndim) + values.shape)
+        elif values.ndim > ndim:
+            trivial = [i for i, d in enumerate(values.shape) if d == 1]
+            offset = values.ndim - ndim
+            if offset > len(trivial):
+                values = values.flatten()
+            elif offset == len(trivial):
+                values = values.squeeze()
+            else:
+                for i in trivial[:offset]:
+                    values = values.squeeze(i)
+    return values.tolist()
+
+
+class _XlRefs:
+    """
+    Resolves the xl-refs of a workbook, as the xleash lasso does.
+
+    Only the `pipe`, `recurse`, `redim`, `dict`, `odict`, `sorted`, `numpy`,
+    and `df` filters are supported.
+    """
+
+    def __init__(self, book):
+        """
+        :param book:
+            Excel workbook.
+        :type book: xlrd.Book
+        """
+        self.book, self.states = book, {}
+
+    def states_matrix(self, sheet):
+        if sheet.name not in self.states:
+            self.states[sheet.name] = _states_matrix(sheet)
+        return self.states[sheet.name]
+
+    def sheet(self, sheet_name):
+        try:
+            return self.book.sheet_by_name(sheet_name)
+        except Exception as ex:
+            try:
+                return self.book.sheet_by_index(int(sheet_name))
+            except ValueError:
+                raise ex from None
+
+    def lasso(self, xl_ref, sheet, base=None):
+        """
+        Captures and filters the values of an xl-ref.
+
+        :param xl_ref:
+            Xl-ref string.
+        :type xl_ref: str
+
+        :param sheet:
+            Sheet of the xl-refs without sheet name.
+        :type sheet: xlrd.sheet.Sheet
+
+        :param base:
+            Base cell of the relative coordinates of the first edge.
+        :type base: tuple[int]
+
+        :return:
+            Filtered values, and top-left and bottom-right cells of the
+            capture rect.
+        :rtype: tuple
+        """
+        sheet_name, st, nd, exp_moves, opts, filters = _parse_xl_ref(xl_ref)
+        if sheet_name is not None:
+            sheet = self.sheet(sheet_name)
+        try:
+            st, nd = _resolve_xl_rect(
+                self.states_matrix(sheet), st, nd, exp_moves, base
+            )
+        except _EmptyCapture:
+            if opts.get('no_empty', False):
+                raise
+            st = nd = None
+        except Exception as ex:
+            raise ValueError('Resolving capture-rect(%s) failed due to: %s' % (
+                xl_ref, ex
+            ))
+        if nd is not None:
+            values = _read_rect(sheet, st[0], nd[0], st[1], nd[1])
+        elif st is not None:
+            values = _parse_cell(sheet.cell_type(*st), sheet.cell_value(*st))
+        else:
+            values = []
+        if filters:
+            try:
+                values = self.filter(sheet, values, st, nd, filters)
+            except Exception as ex:
+                raise ValueError('Filtering xl-ref(%s) failed due to: %s' % (
+                    xl_ref, ex
+                ))
+        return values, st, nd
+
+    def filter(self, sheet, values, st, nd, spec):
+        """
+        Applies a filter (call-spec) to the captured values.
+
+        :param sheet:
+            Sheet of the captured values.
+        :type sheet: xlrd.sheet.Sheet
+
+        :param values:
+            Captured values.
+        :type values: list | object
+
+        :param st:
+            Top-left cell of the capture rect.
+        :type st: tuple[int]
+
+        :param nd:
+            Bottom-right cell of the capture rect.
+        :type nd: tuple[int]
+
+        :param spec:
+            Filter call-spec.
+        :type spec: str | list | dict
+
+        :return:
+            Filtered values.
+        :rtype: object
+        """
+        import numpy as np
+        func, args, kwds = _call_spec(spec)
+        if func == 'pipe':
+            for spec in args:
+                values = self.filter(sheet, values, st, nd, spec)
+            return values
+        elif func == 'recurse':
+            return self.recurse(sheet, values, st, *args, **kwds)
+        elif func == 'redim':
+            return _redim(values, st, nd, *args, **kwds)
+        elif func == 'df':
+            return _text_parser(values, *args, **kwds)
+        funcs = {
+            'dict': dict, 'odict': collections.OrderedDict, 'sorted': sorted,
+            'numpy': np.array
+        }
+        if func not in funcs:
+            raise ValueError('Filter `%s` is not supported!' % func)
+        return funcs[func](values, *args, **kwds)
+
+    def recurse(self, sheet, values, base=None, filters=(), include=None,
+                exclude=None, depth=-1):
+        """
+        Replaces the xl-ref strings of the values with their values.
+
+        It dives into mappings and lists, as the xleash `recurse` filter.
+
+        :param sheet:
+            Sheet of the values.
+        :type sheet: xlrd.sheet.Sheet
+
+        :param values:
+            Captured values.
+        :type values: dict | list | object
+
+        :param base:
+            Base cell of the relative coordinates.
+        :type base: tuple[int]
+
+        :param filters:
+            Filters to apply to the values of the xl-refs.
+        :type filters: list
+
+        :param include:
+            Items to include when diving into mappings.
+        :type include: list | str
+
+        :param exclude:
+            Items to exclude when diving into mappings.
+        :type exclude: list | str
+
+        :param depth:
+            How deep to dive into nested structures. If `< 0`, no limit.
+        :type depth: int
+
+        :return:
+            Values with the xl-refs replaced.
+        :rtype: dict | list | object
+        """
+        include = [include] if isinstance(include, str) else include
+        exclude = [exclude] if isinstance(exclude, str) else exclude
+
+        def _included(value, key, cdepth):
+            if cdepth == 0 or isinstance(value, dict):
+                return (not include or key in include) and (
+                        not exclude or key not in exclude
+                )
+            return True
+
+        def _base(value, coords, i):
+            # Same base cell of the items, as `pandalone<0.3` computes it.
+            import pandas as pd
+            if coords and not isinstance(value, dict):
+                row, col = coords
+                if isinstance(value, pd.DataFrame):
+                    col += i
+                elif isinstance(value, pd.Series):
+                    row += i
+                return row, col
+
+        def _lasso(value, coords):
+            if isinstance(value, str):
+                try:
+                    res, st, nd = self.lasso(value, sheet, coords)
+                except SyntaxError:
+                    return False, value
+                except Exception as ex:
+                    raise ValueError('Value(%r) of sheet %r: \n    %s' % (
+                        value, sheet.name, ex
+                    ))
+                for spec in filters:
+                    res = self.filter(sheet, res, st, nd, spec)
+                return True, res
+            return False, value
+
+        def _dive(value, cdepth, coords):
+            if cdepth == depth:
+                return value
+            try:
+                items = list(value.items())
+            except AttributeError:
+                done, value = _lasso(value, coords)
+                if not done and isinstance(value, list):
+                    for i, v in enumerate(value):
+                        value[i] = _dive(
+                            v, cdepth + 1, _base(value, coords, i)
+                        )
+            else:
+                for i, (k, v) in enumerate(items):
+                    if _included(value, k, cdepth):
+                        value[k] = _dive(
+                            v, cdepth + 1, _base(value, coords, i)
+                        )
+            return value
+
+        return _dive(values, 0, base)
+
+
+def _text_parser(values, header=0, **kwds):
+    # Same parsing of the xleash `df` filter.
+    import pandas as pd
+    from pandas.io.parsers import TextParser
+    if not values:
+        return pd.DataFrame()
+    try:
+        from pandas.errors import EmptyDataError
+    except ImportError:
+        from pandas.io.common import EmptyDataError
+    values = [['' if v is None else v for v in row] for row in values]
+    try:
+        return TextParser(values, header=header, **kwds).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def _read_sheet(book, sheet_name, sh_type):
+    """
+    Reads the sheet values of the `_xl_ref` layout in a single pass.
+
+    It returns the same values of the `_xl_ref` lasso expression, without
+    resolving the capture rect cell by cell. The xl-refs contained in `pa`
+    and `pl` sheets are resolved as the lasso `recurse` filter does.
+
+    :param book:
+        Excel workbook.
+    :type book: xlrd.Book
+
+    :param sheet_name:
+        Sheet name.
+    :type sheet_name: str
+
+    :param sh_type:
+        Sheet type (i.e., `pa`, `ts`, or `pl`).
+    :type sh_type: str
+
+    :return:
+        Sheet values.
+    :rtype: dict | pandas.DataFrame | list
+    """
+    sheet, rect, refs = book.sheet_by_name(sheet_name), None, None
+    if sheet.nrows and sheet.ncols:
+        refs = _XlRefs(book)
+        rect = _capture_rect(refs.states_matrix(sheet), sh_type)
+    values = [] if rect is None else _read_rect(sheet, *rect)
+    if sh_type == 'ts':
+        return _text_parser(values)
+    has_refs = _has_xl_refs(values)
+    if sh_type == 'pa':
+        values = dict(values)
+    if has_refs:
+        # The `pl` items have the base cell of the capture rect.
+        values = refs.recurse(sheet, values, (rect[0], rect[2]))
+    return values
+
+
+_EMPTY_SHEET = (
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/'
+    b'main"><sheetData/></worksheet>'
+)
+
+
+_re_xml_escape = regex.compile(r'_x[0-9A-Fa-f]{4}_')
+
+_xml_ns = {
+    'pkg': '{http://schemas.openxmlformats.org/package/2006/relationships}',
+    'rel': '{http://schemas.openxmlformats.org/officeDocument/2006/'
+           'relationships}',
+    'ssml': '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+}
+
+
+def _sheet_targets(zf, names):
+    # Sheet name: archive member, as `xlrd.open_workbook` resolves them.
+    import xml.etree.ElementTree as Et
+    rels = {}
+    tree = Et.parse(zf.open(names['xl/_rels/workbook.xml.rels']))
+    for e in tree.iter(_xml_ns['pkg'] + 'Relationship'):
+        t = _archive_name(e.get('Target'))
+        rels[e.get('Id')] = t[1:] if t.startswith('/') else 'xl/' + t
+    tree = Et.parse(zf.open(names['xl/workbook.xml']))
+    return {
+        _re_xml_escape.sub(
+            lambda m: chr(int(m.group(0)[2:6], 16)), e.get('name')
+        ): names.get(rels.get(e.get(_xml_ns['rel'] + 'id')))
+        for e in tree.iter(_xml_ns['ssml'] + 'sheet')
+    }
+
+
+def _is_xlsx(file_contents):
+    return file_contents[:4] == b'PK\x03\x04'
+
+
+def _archive_name(name):
+    return name.replace('\\', '/').lower()
+
+
+def _archive_names(zf):
+    return {_archive_name(n): n for n in zf.namelist()}
+
+
+def _workbook_sheet_names(file_contents):
+    """
+    Returns the sheet names of an Excel workbook, without loading it.
+
+    :param file_contents:
+        Contents of the Excel file.
+    :type file_contents: bytes
+
+    :return:
+        Sheet names (in the workbook order).
+    :rtype: list[str]
+    """
+    import io
+    import zipfile
+    if not _is_xlsx(file_contents):
+        return _open_workbook(file_contents, ()).sheet_names()
+    zf = zipfile.ZipFile(io.BytesIO(file_contents))
+    return list(_sheet_targets(zf, _archive_names(zf)))
+
+
+def _open_workbook(file_contents, sheet_names=None):
+    """
+    Opens an Excel workbook, loading only the given sheets.
+
+    The other sheets of `.xlsx` files are loaded as empty sheets, while the
+    sheets of `.xls` files are loaded on demand.
+
+    :param file_contents:
+        Contents of the Excel file.
+    :type file_contents: bytes
+
+    :param sheet_names:
+        Sheets to be loaded. If None, all sheets are loaded.
+    :type sheet_names: collections.Iterable[str]
+
+    :return:
+        Excel workbook.
+    :rtype: xlrd.Book
+    """
+    import io
+    import xlrd
+    import zipfile
+    if sheet_names is None:
+        return xlrd.open_workbook(file_contents=file_contents)
+    if not _is_xlsx(file_contents):
+        return xlrd.open_workbook(file_contents=file_contents, on_demand=True)
+    sheet_names = set(sheet_names)
+    zf = zipfile.ZipFile(io.BytesIO(file_contents))
+    skip = {
+        v for k, v in _sheet_targets(zf, _archive_names(zf)).items()
+        if k not in sheet_names
+    }
+    # Uncompressed copy of the archive, where the other sheets are empty.
+    with io.BytesIO() as buffer:
+        with zipfile.ZipFile(buffer, 'w') as out:
+            for name in zf.namelist():
+                out.writestr(
+                    name, _EMPTY_SHEET if name in skip else zf.read(name)
+                )
+        return xlrd.open_workbook(file_contents=buffer.getvalue())
+
+
+def _input_sheets(sheet_names):
+    for sheet_name in sheet_names:
+        match = _re_input_sheet_name.match(sheet_name.strip(' '))
+        if not match:
+            log.debug("Sheet name '%s' cannot be parsed!", sheet_name)
+            continue
+        yield sheet_name, {
+            k: v.lower() for k, v in match.groupdict().items() if v
+        }
+
+
+def _xl_refs_sheets(book, sheet_names, loaded):
+    # Sheets that can be referenced by the xl-refs of the loaded sheets.
+    refs = [
+        v.lower() for sheet in map(book.sheet_by_name, loaded)
+        for r in range(sheet.nrows) for v in sheet.row_values(r)
+        if isinstance(v, str) and '#' in v
+    ]
+    return {k for k in sheet_names if any(k.lower() in v for v in refs)}
+
+
+_worker_contents = None
+
+
+def _init_sheets_worker(input_file):
+    global _worker_contents
+    _worker_contents = input_file.getvalue()
+
+
+def _parse_sheet_worker(args):
+    sheet_name, match = args
+    book = _open_workbook(_worker_contents, (sheet_name,))
+    return _parse_sheet(match, book, sheet_name)
+
+
+def _parse_ts_sheets(input_file, jobs=1):
+    """
+    Opens the workbook and parses its time series sheets in parallel processes.
+
+    Each process loads only the sheets that it parses. Time series sheets that
+    can be referenced by xl-refs are not parsed in parallel.
+
+    :param input_file:
+        Input file (the workers reopen it, when it is a file reference).
+    :type input_file: co2mpas.core.load.InputFile | io.BytesIO
+
+    :param jobs:
+        Number of parallel processes (if <= 0, all CPUs are used).
+    :type jobs: int
+
+    :return:
+        Excel workbook (without the parsed sheets) and the parsed sheets.
+    :rtype: xlrd.Book, dict
+    """
+    import os
+    import multiprocessing
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    file_contents = input_file.getvalue()
+    # Daemonic processes (e.g., of the core model runs) cannot have children.
+    if jobs == 1 or multiprocessing.current_process().daemon:
+        return _open_workbook(file_contents), {}
+    # The workbook is opened at most twice (i.e., without the time series
+    # sheets, and again only if some of them are referenced by xl-refs).
+    sheet_names = _workbook_sheet_names(file_contents)
+    ts = {
+        k: v for k, v in _input_sheets(sheet_names)
+        if v.get('scope') != 'plan' and _get_sheet_type(**v) == 'ts'
+    }
+    if len(ts) < 2:
+        return _open_workbook(file_contents), {}
+    loaded = [k for k in sheet_names if k not in ts]
+    book = _open_workbook(file_contents, loaded)
+    refs = _xl_refs_sheets(book, ts, loaded)
+    if refs:
+        ts = sh.selector(set(ts) - refs, ts)
+        if len(ts) < 2:
+            ts = {}
+        book = _open_workbook(file_contents, set(sheet_names) - set(ts))
+    if not ts:
+        return book, {}
+    init_args = input_file,
+    with multiprocessing.Pool(
+            min(jobs, len(ts)), _init_sheets_worker, init_args) as pool:
+        parsed = pool.map(_parse_sheet_worker, ts.items(), chunksize=1)
+    return book, dict(zip(ts, parsed))
+
+
+def _parse_sheet(match, book, sheet_name, res=None, lasso=False):
+    if res is None:
+        res = {}
+
+    sh_type = _get_sheet_type(**match)
+    data = (_lasso_sheet if lasso else _read_sheet)(book, sheet_name, sh_type)
+
     if sh_type == 'pl':
         try:
             import pandas as pd
@@ -323,7 +1221,7 @@ def _add_index_plan(plan, file_path):
         plan['base'] = file_path
     else:
         d = osp.dirname(file_path)
-        plan['base'].fillna(osp.basename(file_path), inplace=True)
+        plan['base'] = plan['base'].fillna(osp.basename(file_path))
         plan['base'] = plan['base'].apply(
             lambda x: osp.isabs(x) and x or osp.join(d, x)
         )
@@ -333,7 +1231,7 @@ def _add_index_plan(plan, file_path):
     if 'run_base' not in plan:
         plan['run_base'] = True
     else:
-        plan['run_base'].fillna(True)
+        plan['run_base'] = plan['run_base'].fillna(True)
 
     plan['id'] = plan.index
     return plan
@@ -350,7 +1248,7 @@ def _finalize_plan(res, plans, file_path):
         for p in plans:
             if any(c.startswith(m) for c in p.columns):
                 if n in p:
-                    p[n].fillna(value=v, inplace=True)
+                    p[n] = p[n].fillna(value=v)
                 else:
                     p[n] = v
 
@@ -359,7 +1257,7 @@ def _finalize_plan(res, plans, file_path):
     return _add_index_plan(plan, file_path)
 
 
-def parse_excel_file(input_file_name, input_file):
+def parse_excel_file(input_file_name, input_file, jobs=1):
     """
     Reads cycle's data and simulation plans.
 
@@ -369,31 +1267,31 @@ def parse_excel_file(input_file_name, input_file):
 
     :param input_file:
         Input file.
-    :type input_file: io.BytesIO
+    :type input_file: co2mpas.core.load.InputFile | io.BytesIO
+
+    :param jobs:
+        Number of parallel processes to parse the time series sheets (if <= 0,
+        all CPUs are used).
+    :type jobs: int
 
     :return:
         Raw input data.
     :rtype: dict
     """
     import pandas as pd
-    # noinspection PyProtectedMember
-    from pandalone.xleash.io._xlrd import _open_sheet_by_name_or_index
-
-    xl_file, res, plans = pd.ExcelFile(input_file), {'base': {}}, []
-    for sheet_name in xl_file.sheet_names:
-        match = _re_input_sheet_name.match(sheet_name.strip(' '))
-        if not match:
-            log.debug("Sheet name '%s' cannot be parsed!", sheet_name)
-            continue
-        match = {k: v.lower() for k, v in match.groupdict().items() if v}
-        # noinspection PyProtectedMember
-        sheet = _open_sheet_by_name_or_index(xl_file.book, 'book', sheet_name)
+    book, parsed = _parse_ts_sheets(input_file, jobs)
+    res, plans = {'base': {}}, []
+    # Sheets are merged in the workbook order.
+    for sheet_name, match in _input_sheets(book.sheet_names()):
         is_plan = match.get('scope', None) == 'plan'
         if is_plan:
             r = {'plan': pd.DataFrame()}
         else:
             r = {}
-        r = _parse_sheet(match, sheet, sheet_name, res=r)
+        if sheet_name in parsed:
+            r = parsed[sheet_name]
+        else:
+            r = _parse_sheet(match, book, sheet_name, res=r)
         if is_plan:
             plans.append(r['plan'])
         else:
@@ -405,5 +1303,7 @@ def parse_excel_file(input_file_name, input_file):
             v['cycle_type'] = v.get('cycle_type', k[-1].split('_')[0]).upper()
             v['cycle_name'] = v.get('cycle_name', k[-1]).upper()
 
-    res['plan'] = _finalize_plan(res, plans, input_file_name).to_dict('records')
+    from .plan import Plan
+    # Plan rows are generated lazily from the data-frame.
+    res['plan'] = Plan([_finalize_plan(res, plans, input_file_name)])
     return res
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+It provides the lazy simulation plan and the plan readers.
+
+A plan is a re-iterable sequence of rows, that are read from their sources
+(i.e., data-frames of the plan sheets, `.csv` files, or lists of rows) and
+validated on demand. Hence, the plan rows are never materialised in memory.
+"""
+import os
+import math
+import weakref
+import schedula as sh
+
+#: Extension of the simulation plan files.
+PLAN_EXT = '.csv'
+
+#: Number of rows read at once from the plan sources.
+CHUNK_SIZE = 1000
+
+
+def _frame_rows(frame, chunksize=CHUNK_SIZE):
+    for i in range(0, len(frame), chunksize):
+        yield from frame.iloc[i:i + chunksize].to_dict('records')
+
+
+def _csv_rows(file_name, chunksize=CHUNK_SIZE):
+    import pandas as pd
+    from .excel import _add_index_plan
+    for plan in pd.read_csv(file_name, chunksize=chunksize):
+        if 'id' in plan:
+            plan.set_index(['id'], inplace=True)
+        else:  # Numbered as the plan sheets.
+            plan.index += 1
+        plan.dropna(how='all', inplace=True)
+        yield from _frame_rows(_add_index_plan(plan, file_name), chunksize)
+
+
+def _isnull(value):
+    return value is None or isinstance(value, float) and math.isnan(value)
+
+
+class InvalidPlan(ValueError):
+    """
+    Simulation plan with invalid rows.
+    """
+
+
+class Plan:
+    """
+    Lazy simulation plan.
+    """
+
+    def __init__(self, sources=(), validate=None):
+        """
+        :param sources:
+            Plan sources, i.e., data-frames, `.csv` file paths, or iterables
+            of rows.
+        :type sources: collections.Iterable
+
+        :param validate:
+            Row validator. It returns `sh.NONE` for invalid rows, that reject
+            the whole plan (see :class:`InvalidPlan`).
+        :type validate: callable
+        """
+        self.sources = list(sources)
+        self.validate = validate
+
+    def raw_rows(self):
+        """
+        Yields the plan rows, without validation and null values.
+
+        :return:
+            Raw plan rows.
+        :rtype: collections.Iterable[dict]
+        """
+        for source in self.sources:
+            if isinstance(source, str):
+                rows = _csv_rows(source)
+            elif hasattr(source, 'iloc'):
+                rows = _frame_rows(source)
+            else:
+                rows = source
+            for row in rows:
+                yield {k: v for k, v in row.items() if not _isnull(v)}
+
+    def __iter__(self):
+        validate = self.validate
+        for row in self.raw_rows():
+            if validate is not None:
+                valid = validate(row)
+                if valid is sh.NONE:
+                    raise InvalidPlan('Invalid plan row (id: %s)!' % row['id'])
+                row = valid
+            yield row
+
+    def __bool__(self):
+        return next(self.raw_rows(), None) is not None
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(
+            s if isinstance(s, str) else type(s).__name__ for s in self.sources
+        ))
+
+
+def _remove_file(file_name):
+    try:
+        os.remove(file_name)
+    except OSError:
+        pass
+
+
+class RowsFile:
+    """
+    Re-iterable rows spilled into a temporary file (e.g., the validated plan
+    rows, that are not validated twice).
+    """
+
+    def __init__(self, rows):
+        """
+        :param rows:
+            Rows to be spilled (i.e., `dill` pickled one after the other).
+        :type rows: collections.Iterable
+        """
+        import dill
+        import tempfile
+        fd, self.file_name = tempfile.mkstemp(suffix='.rows')
+        self._remove = weakref.finalize(self, _remove_file, self.file_name)
+        self.n = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for row in rows:
+                    dill.dump(row, f)
+                    self.n += 1
+        except BaseException:
+            self._remove()
+            raise
+
+    def __iter__(self):
+        import dill
+        with open(self.file_name, 'rb') as f:
+            while True:
+                try:
+                    yield dill.load(f)
+                except EOFError:
+                    return
+
+    def __len__(self):
+        return self.n
+
+
+def load_plan_file(input_file_name):
+    """
+    Load a simulation plan `.csv` file (read by chunks, when iterated).
+
+    The columns are the plan parameters (e.g., `base.input.calibration.
+    wltp_h.vehicle_mass`), the plan `id`, the `base` input file (relative to
+    the plan file), and the `run_base` flag.
+
+    :param input_file_name:
+        Input file name.
+    :type input_file_name: str
+
+    :return:
+        Raw input data.
+    :rtype: dict
+    """
+    import os.path as osp
+    return {'base': {}, 'plan': Plan([osp.abspath(input_file_name)])}
@@ -15,7 +15,8 @@ import functools
 import numpy as np
 import os.path as osp
 import schedula as sh
-from collections import Iterable, OrderedDict
+from collections import OrderedDict
+from collections.abc import Iterable
 from schema import Schema, Use, And, Or, Optional, SchemaError
 
 log = logging.getLogger(__name__)
@@ -398,6 +399,56 @@ def _is_sorted(iterable, key=lambda a, b: a <= b):
     return all(key(a, b) for a, b in sh.pairwise(iterable))
 
 
+def _is_sorted_array(x):
+    return bool(np.all(x[:-1] <= x[1:]))
+
+
+def _check_greater_than_minus_one(x):
+    return (x >= -1).all()
+
+
+def _bulk_np_array(dtype=float, check=None, empty=True):
+    """
+    Returns a bulk validator of numeric arrays (e.g., time series).
+
+    The validator returns None when the value cannot be validated in bulk (i.e.,
+    it is not a numeric 1-D array or a non-empty list, or it is not valid).
+
+    :param dtype:
+        Data type of the array.
+    :type dtype: type
+
+    :param check:
+        Vectorized check of the array.
+    :type check: callable
+
+    :param empty:
+        Return `sh.NONE` for arrays of NaN (as `Empty`)?
+    :type empty: bool
+
+    :return:
+        Bulk validator.
+    :rtype: callable
+    """
+
+    def _validate(x):
+        if isinstance(x, np.ndarray):
+            if x.ndim != 1 or x.size < 2 or x.dtype.kind not in 'biuf':
+                return None
+            if empty and x.dtype.kind == 'f' and np.isnan(x).all():
+                return sh.NONE
+        elif not (isinstance(x, list) and x):
+            return None
+        try:
+            x = np.asarray(x, dtype=dtype)
+        except (TypeError, ValueError):
+            return None
+        if x.ndim == 1 and (check is None or check(x)):
+            return x
+
+    return _validate
+
+
 # noinspection PyUnresolvedReferences
 @functools.lru_cache(None)
 def define_data_schema(read=True):
@@ -412,6 +463,29 @@ def define_data_schema(read=True):
         Data schema.
     :rtype: schema.Schema
     """
+    return _define_data_schema(read)[0]
+
+
+# noinspection PyUnresolvedReferences
+@functools.lru_cache(None)
+def define_data_validator(read=True):
+    """
+    Define data validator (i.e., the data schema compiled by key).
+
+    :param read:
+        Validator for reading?
+    :type read: bool
+
+    :return:
+        Data validator.
+    :rtype: DataValidator
+    """
+    return DataValidator(*_define_data_schema(read))
+
+
+# noinspection PyUnresolvedReferences
+@functools.lru_cache(None)
+def _define_data_schema(read=True):
     cmv = _cmv(read=read)
     dtc = _dtc(read=read)
     cvt = _cvt(read=read)
@@ -447,7 +521,7 @@ def define_data_schema(read=True):
     np_array_greater_than_minus_one = _np_array_positive(
         read=read, error='cannot be parsed because it should be an '
                          'np.array dtype=<float> and all values >= -1!',
-        check=lambda x: (x >= -1).all()
+        check=_check_greater_than_minus_one
     )
     np_array_bool = _np_array(dtype=bool, read=read)
     np_array_int = _np_array(dtype=int, read=read)
@@ -736,6 +810,20 @@ def define_data_schema(read=True):
     except ImportError:
         pass
 
+    bulk = {}
+    if read:
+        bulk = {
+            np_array: _bulk_np_array(),
+            np_array_int: _bulk_np_array(dtype=int),
+            np_array_bool: _bulk_np_array(dtype=bool),
+            np_array_sorted: _bulk_np_array(check=_is_sorted_array),
+            np_array_greater_than_minus_one: _bulk_np_array(
+                check=_check_greater_than_minus_one
+            )
+        }
+        bulk = {k: bulk[v] for k, v in schema.items() if v in bulk}
+        bulk[str] = _bulk_np_array(empty=False)
+
     schema = {Optional(k): Or(Empty(), v) for k, v in schema.items()}
     schema[Optional(str)] = Or(_type(type=float, read=read), np_array)
 
@@ -745,7 +833,81 @@ def define_data_schema(read=True):
 
         schema = {k: And(v, Or(_f, Use(str))) for k, v in schema.items()}
 
-    return Schema(schema)
+    return Schema(schema), bulk
+
+
+class DataValidator:
+    """
+    Data schema compiled into a lookup table of validators by key.
+
+    Each data key is matched once with the schema keys, and numeric arrays are
+    validated in bulk with NumPy. When a value is not valid, the data schema
+    validates it again to raise the same error messages.
+    """
+
+    def __init__(self, schema, bulk=None):
+        """
+        :param schema:
+            Data schema.
+        :type schema: schema.Schema
+
+        :param bulk:
+            Bulk validators of numeric arrays by schema key (see
+            :func:`_bulk_np_array`).
+        :type bulk: dict
+        """
+        self.schema = schema
+        self.bulk = bulk or {}
+        # Schema keys in the matching order of `schema` (i.e., exact first).
+        skeys = sorted(schema.schema, key=Schema._dict_key_priority)
+        self._exact = {
+            k.schema: k for k in skeys if isinstance(k.schema, str)
+        }
+        self._skeys = [k for k in skeys if not isinstance(k.schema, str)]
+        #: Compiled validators (i.e., key: (new key, validator, bulk)).
+        self.table = {}
+
+    def _compile(self, key):
+        skeys = self._skeys
+        if isinstance(key, str) and key in self._exact:
+            skeys = self._exact[key],
+        for skey in skeys:
+            try:
+                nkey = Schema(skey).validate(key)
+            except SchemaError:
+                continue
+            return (
+                nkey, Schema(self.schema.schema[skey]).validate,
+                self.bulk.get(skey.schema)
+            )
+
+    def validate(self, data):
+        """
+        Validates the data as the data schema.
+
+        :param data:
+            Data to be validated.
+        :type data: dict
+
+        :return:
+            Validated data.
+        :rtype: dict
+        """
+        res = {}
+        try:
+            for key, value in data.items():
+                try:
+                    nkey, validate, bulk = self.table[key]
+                except KeyError:
+                    c = self._compile(key)
+                    if c is None:
+                        raise SchemaError('Wrong key %r' % key)
+                    nkey, validate, bulk = self.table[key] = c
+                value = bulk(value) if bulk else None
+                res[nkey] = validate(data[key]) if value is None else value
+        except SchemaError:
+            return self.schema.validate(data)  # Raises the same errors.
+        return res
 
 
 vehicle_family_id_pattern = r'''
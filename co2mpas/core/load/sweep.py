@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+It provides the parametric-sweep generator of simulation plans.
+
+A sweep is a declarative specification of a simulation plan, that generates
+its rows on the fly (i.e., by chunks). It is saved as a small `.sweep.yaml`
+file, e.g.::
+
+    base: vehicle.xlsx  # Relative to the sweep file.
+    run_base: true
+    method: lhs  # grid, lhs, or sobol.
+    samples: 1000000  # Number of samples (only lhs and sobol).
+    seed: 42
+    parameters:
+      base.input.calibration.wltp_h.vehicle_mass: {min: 1200, max: 1800}
+      base.input.calibration.wltp_h.f2: [0.03, 0.035, 0.04]
+
+The parameters are the plan columns (i.e., `base.input.*`, ...). Their values
+are a list (i.e., discrete values) or a range `{min, max}`, that is sampled
+uniformly or, for the `grid` method, split into `num` equidistant values.
+
+If the `seed` is missing, it is derived from the content of the sweep file,
+hence the plan rows are always the same.
+"""
+import itertools
+import os.path as osp
+import numpy as np
+from .plan import CHUNK_SIZE
+
+#: Extension of the sweep files.
+SWEEP_EXT = '.sweep.yaml'
+
+#: Sweep methods.
+METHODS = 'grid', 'lhs', 'sobol'
+
+
+def _parse_parameter(name, value):
+    if isinstance(value, dict):
+        try:
+            par = {'min': float(value['min']), 'max': float(value['max'])}
+        except KeyError:
+            raise ValueError(
+                'Range of sweep parameter (%s) needs `min` and `max`!' % name
+            )
+        if 'num' in value:
+            par['num'] = int(value['num'])
+        return par
+    if isinstance(value, (list, tuple)) and value:
+        return {'values': list(value)}
+    if isinstance(value, (str, int, float, bool)):
+        return {'values': [value]}
+    raise ValueError('Invalid values of sweep parameter (%s)!' % name)
+
+
+def _mix(z):
+    # SplitMix64 finalizer (it wraps around uint64).
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _permute(index, n, keys):
+    """
+    Returns the images of the indices by a keyed random permutation of
+    `range(n)`, without building the permutation.
+
+    It is a balanced Feistel network on the smallest power of 4 >= `n`, where
+    the images out of `range(n)` are mapped again (i.e., cycle-walking).
+
+    :param index:
+        Indices (< `n`).
+    :type index: numpy.array
+
+    :param n:
+        Size of the permutation.
+    :type n: int
+
+    :param keys:
+        Keys of the Feistel rounds.
+    :type keys: numpy.array
+
+    :return:
+        Permuted indices.
+    :rtype: numpy.array
+    """
+    h = np.uint64(max((int(n) - 1).bit_length() + 1, 2) // 2)
+    mask = np.uint64((1 << int(h)) - 1)
+
+    def _feistel(x):
+        left, right = x >> h, x & mask
+        for k in keys:
+            left, right = right, left ^ (_mix(right ^ k) & mask)
+        return (left << h) | right
+
+    res = _feistel(np.asarray(index, np.uint64))
+    i = np.flatnonzero(res >= n)
+    while i.size:
+        res[i] = _feistel(res[i])
+        i = i[res[i] >= n]
+    return res.astype(np.int64)
+
+
+def parse_parameter_option(option):
+    """
+    Parses a sweep parameter from the command line.
+
+    :param option:
+        Sweep parameter as `NAME=MIN:MAX[:NUM]` or `NAME=V1[,V2,...]`.
+    :type option: str
+
+    :return:
+        Parameter name and values.
+    :rtype: str, dict | list
+    """
+    import yaml
+    name, sep, value = option.partition('=')
+    if not (name.strip() and sep and value.strip()):
+        raise ValueError(
+            'Sweep parameter (%s) is not `NAME=MIN:MAX[:NUM]` or '
+            '`NAME=V1[,V2,...]`!' % option
+        )
+    if ':' in value:
+        value = dict(zip(('min', 'max', 'num'), value.split(':')))
+    else:
+        value = [yaml.safe_load(v) for v in value.split(',')]
+    return name.strip(), value
+
+
+class Sweep:
+    """
+    Parametric sweep, that generates the simulation plan rows.
+    """
+
+    def __init__(self, parameters, base, method='grid', samples=None,
+                 seed=None, run_base=True):
+        """
+        :param parameters:
+            Sweep parameters (i.e., plan column: list of values or range).
+        :type parameters: dict
+
+        :param base:
+            Base input file path.
+        :type base: str
+
+        :param method:
+            Sweep method (i.e., grid, lhs, or sobol).
+        :type method: str
+
+        :param samples:
+            Number of samples (only lhs and sobol).
+        :type samples: int
+
+        :param seed:
+            Seed of the random samples. If None, it is randomly set (but
+            see :meth:`from_file`).
+        :type seed: int
+
+        :param run_base:
+            Run the base input file?
+        :type run_base: bool
+        """
+        if method not in METHODS:
+            raise ValueError('Sweep method (%s) is not in %s!' % (
+                method, METHODS
+            ))
+        if not parameters:
+            raise ValueError('Sweep without parameters!')
+        self.parameters = {
+            k: _parse_parameter(k, v) for k, v in parameters.items()
+        }
+        self.base, self.method, self.run_base = base, method, run_base
+        if method == 'grid':
+            for k, v in self.parameters.items():
+                if 'values' not in v and v.get('num', 0) < 1:
+                    raise ValueError(
+                        'Grid sweep parameter (%s) needs `num` >= 1!' % k
+                    )
+            samples = int(np.prod([
+                len(v['values']) if 'values' in v else v['num']
+                for v in self.parameters.values()
+            ]))
+        elif not samples or samples < 1:
+            raise ValueError('Sweep method (%s) needs `samples`!' % method)
+        self.samples = int(samples)
+        if seed is None and method != 'grid':  # Rows must be re-iterable.
+            import random
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+
+    @classmethod
+    def from_file(cls, file_name):
+        """
+        Loads a sweep from a `.sweep.yaml` file.
+
+        :param file_name:
+            Sweep file path.
+        :type file_name: str
+
+        :return:
+            Sweep.
+        :rtype: Sweep
+        """
+        import yaml
+        import hashlib
+        with open(file_name, 'rb') as f:
+            content = f.read()
+        spec = yaml.safe_load(content) or {}
+        if not spec.get('base'):
+            raise ValueError('Sweep file (%s) without `base`!' % file_name)
+        if spec.get('seed') is None:  # Same rows for the same file.
+            spec['seed'] = int.from_bytes(
+                hashlib.sha256(content).digest()[:4], 'little'
+            )
+        spec['base'] = osp.normpath(
+            osp.join(osp.dirname(osp.abspath(file_name)), spec['base'])
+        )
+        return cls(**spec)
+
+    def to_file(self, file_name):
+        """
+        Saves the sweep into a `.sweep.yaml` file.
+
+        :param file_name:
+            Sweep file path.
+        :type file_name: str
+
+        :return:
+            Sweep file path.
+        :rtype: str
+        """
+        import os
+        import yaml
+        d = osp.dirname(file_name) or '.'
+        spec = {
+            'base': osp.relpath(osp.abspath(self.base), d),
+            'run_base': self.run_base, 'method': self.method
+        }
+        if self.method != 'grid':
+            spec.update(samples=self.samples, seed=self.seed)
+        spec['parameters'] = {k: v.get('values', {
+            i: v[i] for i in ('min', 'max', 'num') if i in v
+        }) for k, v in self.parameters.items()}
+        os.makedirs(d, exist_ok=True)
+        with open(file_name, 'w') as f:
+            yaml.safe_dump(spec, f, default_flow_style=None, sort_keys=False)
+        return file_name
+
+    def __len__(self):
+        return self.samples
+
+    def __repr__(self):
+        return '%s(%s, %s, samples=%d)' % (
+            self.__class__.__name__, self.method, self.base, self.samples
+        )
+
+    def _unit_samples(self, chunksize):
+        n, d = self.samples, len(self.parameters)
+        if self.method == 'sobol':
+            from scipy.stats import qmc
+            sampler = qmc.Sobol(d, seed=self.seed)
+            chunksize = 1 << max(chunksize - 1, 1).bit_length()  # Balanced.
+            for i in range(0, n, chunksize):
+                yield sampler.random(chunksize)[:n - i]
+        else:  # Latin hypercube: one permutation of the strata per parameter.
+            rng = np.random.default_rng(self.seed)
+            # The strata are computed by chunks (i.e., the memory does not
+            # depend on the samples).
+            keys = rng.integers(2 ** 64, size=(d, 6), dtype=np.uint64)
+            for i in range(0, n, chunksize):
+                index = np.arange(i, min(i + chunksize, n))
+                s = np.stack([_permute(index, n, k) for k in keys], axis=1)
+                yield (s + rng.random(s.shape)) / n
+
+    def _chunks(self, chunksize):
+        if self.method == 'grid':
+            it = itertools.product(*(
+                v['values'] if 'values' in v else
+                np.linspace(v['min'], v['max'], v['num']).tolist()
+                for v in self.parameters.values()
+            ))
+            for chunk in iter(lambda: list(itertools.islice(it, chunksize)),
+                              []):
+                yield chunk
+            return
+        pars = list(self.parameters.values())
+        for u in self._unit_samples(chunksize):
+            cols = []
+            for j, p in enumerate(pars):
+                if 'values' in p:
+                    i = np.minimum((u[:, j] * len(p['values'])).astype(int),
+                                   len(p['values']) - 1)
+                    cols.append([p['values'][k] for k in i])
+                else:
+                    cols.append((p['min'] + u[:, j] * (
+                        p['max'] - p['min'])).tolist())
+            yield zip(*cols)
+
+    def rows(self, chunksize=CHUNK_SIZE):
+        """
+        Yields the simulation plan rows.
+
+        :param chunksize:
+            Number of rows generated at once.
+        :type chunksize: int
+
+        :return:
+            Plan rows (i.e., `id`, `base`, `run_base`, and the parameters).
+        :rtype: collections.Iterable[dict]
+        """
+        names, i = list(self.parameters), 0
+        base = {'base': osp.abspath(self.base), 'run_base': self.run_base}
+        for chunk in self._chunks(chunksize):
+            for values in chunk:
+                i += 1
+                row = dict(zip(names, values), id=i)
+                row.update(base)
+                yield row
+
+    __iter__ = rows
+
+
+def load_sweep_file(input_file_name):
+    """
+    Load a parametric-sweep file `.sweep.yaml` (expanded, when iterated).
+
+    :param input_file_name:
+        Input file name.
+    :type input_file_name: str
+
+    :return:
+        Raw input data.
+    :rtype: dict
+    """
+    from .plan import Plan
+    return {'base': {}, 'plan': Plan([Sweep.from_file(input_file_name)])}
+
+
+def save_sweep_file(sweep, output_file, chunksize=CHUNK_SIZE):
+    """
+    Saves a parametric sweep into a `.sweep.yaml` file or, expanded, into a
+    simulation plan `.csv` file (written by chunks).
+
+    :param sweep:
+        Parametric sweep.
+    :type sweep: Sweep
+
+    :param output_file:
+        Output file path (`.sweep.yaml` or `.csv`).
+    :type output_file: str
+
+    :param chunksize:
+        Number of rows written at once.
+    :type chunksize: int
+
+    :return:
+        Output file path.
+    :rtype: str
+    """
+    from .plan import PLAN_EXT
+    if not output_file.lower().endswith(PLAN_EXT):
+        return sweep.to_file(output_file)
+    import os
+    import pandas as pd
+    d = osp.dirname(output_file) or '.'
+    os.makedirs(d, exist_ok=True)
+    base = osp.relpath(osp.abspath(sweep.base), d)
+    columns = ['id', 'base', 'run_base'] + list(sweep.parameters)
+    n = 0
+    with open(output_file, 'w', newline='') as f:
+        # noinspection PyProtectedMember
+        for chunk in sweep._chunks(chunksize):
+            df = pd.DataFrame(list(chunk), columns=columns[3:])
+            df.insert(0, 'run_base', sweep.run_base)
+            df.insert(0, 'base', base)
+            df.insert(0, 'id', np.arange(n + 1, n + len(df) + 1))
+            df.to_csv(f, header=not n, index=False)
+            n += len(df)
+    return output_file
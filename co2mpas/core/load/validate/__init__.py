@@ -40,8 +40,8 @@ def _add_validated_input(data, validate, keys, value, errors):
 
 
 def _validate_base_with_schema(data, depth=4):
-    from ..schema import define_data_schema
-    inputs, errors, validate = {}, {}, define_data_schema().validate
+    from ..schema import define_data_validator
+    inputs, errors, validate = {}, {}, define_data_validator().validate
     for k, v in sorted(sh.stack_nested_keys(data, depth=depth)):
         d = sh.get_nested_dicts(inputs, *k[:-1])
         _add_validated_input(d, validate, k, v, errors)
@@ -227,6 +227,31 @@ def validate_flag(flag=None, declaration_mode=False, type_approval_mode=False):
     return inputs
 
 
+def _validate_plan_row(
+        row, input_type=None, declaration_mode=False, hard_validation=False,
+        type_approval_mode=False):
+    import os.path as osp
+    from ..excel import _parse_values as parse_key
+    from ..schema import define_data_validator as _schema
+    keys, validate, d = {'id', 'base', 'run_base'}, _schema().validate, row
+    d['base'] = osp.abspath(d['base'])
+    i, data, e, p_id = {}, {}, {}, 'plan id:{}'.format(d['id'])
+
+    for k, v in parse_key(sh.selector(set(d) - keys, d), where='in plan'):
+        k, inp = (p_id,) + k, sh.get_nested_dicts(i, *k[1:-1])
+        v = _add_validated_input(inp, validate, k, v, e)
+        if v is not sh.NONE:
+            sh.get_nested_dicts(data, '.'.join(k[2:-1]))[k[-1]] = v
+
+    e = _mode_parser(
+        type_approval_mode, declaration_mode, hard_validation, i, e,
+        input_type
+    )[1]
+    if _log_errors_msg(e):
+        return sh.NONE
+    return sh.combine_dicts({'data': data}, base=sh.selector(keys, d))
+
+
 @sh.add_function(dsp, outputs=['validated_plan'], **_kw)
 def validate_plan(
         input_type, plan=None, declaration_mode=False, hard_validation=False,
@@ -234,13 +259,16 @@ def validate_plan(
     """
     Validate plan data.
 
+    The plan rows are validated lazily (i.e., when the plan is iterated), and
+    the first row with errors rejects the whole plan.
+
     :param input_type:
         Type of file input.
     :type input_type: str
 
     :param plan:
         Plan data.
-    :type plan: dict
+    :type plan: co2mpas.core.load.plan.Plan | list[dict]
 
     :param declaration_mode:
         Use only the declaration data.
@@ -256,42 +284,22 @@ def validate_plan(
 
     :return:
         Validated plan data.
-    :rtype: dict
+    :rtype: co2mpas.core.load.plan.Plan
     """
-    import pandas as pd
     if plan and declaration_mode:
         msg = 'Simulation plan cannot be executed in declaration mode!\n' \
               'If you want to execute it remove -DM or -TA from the cmd.'
         log.warning(msg)
         return []
-    import os.path as osp
-    from ..excel import _parse_values as parse_key
-    from ..schema import define_data_schema as _schema
-
-    validated_plan, e, keys = [], {}, {'id', 'base', 'run_base'}
-    validate, add = _schema().validate, validated_plan.append
-
-    for _, d in pd.DataFrame(plan or []).iterrows():
-        d = dict(d.dropna(how='all'))
-        d['base'] = osp.abspath(d['base'])
-        i, data, p_id = {}, {}, 'plan id:{}'.format(d['id'])
-
-        for k, v in parse_key(sh.selector(set(d) - keys, d), where='in plan'):
-            k, inp = (p_id,) + k, sh.get_nested_dicts(i, *k[1:-1])
-            v = _add_validated_input(inp, validate, k, v, e)
-            if v is not sh.NONE:
-                sh.get_nested_dicts(data, '.'.join(k[2:-1]))[k[-1]] = v
-
-        e = _mode_parser(
-            type_approval_mode, declaration_mode, hard_validation, i, e,
-            input_type
-        )[1]
-        add(sh.combine_dicts({'data': data}, base=sh.selector(keys, d)))
-
-    if _log_errors_msg(e):
-        return sh.NONE
-
-    return validated_plan
+    import functools
+    from ..plan import Plan
+    validate = functools.partial(
+        _validate_plan_row, input_type=input_type,
+        declaration_mode=declaration_mode, hard_validation=hard_validation,
+        type_approval_mode=type_approval_mode
+    )
+    sources = plan.sources if isinstance(plan, Plan) else [plan or []]
+    return Plan(sources, validate)
 
 
 @sh.add_function(dsp, outputs=['verified'], **_kw)
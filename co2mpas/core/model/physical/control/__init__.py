@@ -65,8 +65,12 @@ def identify_on_engine(
     mask = np.where(identify_engine_starts(on_engine))[0] + 1
     ts = np.asarray(times[mask], dtype=float)
     ts += min_time_engine_on_after_start + dfl.EPS
-    for i, j in np.column_stack((mask, np.searchsorted(times, ts))):
-        on_engine[i:j] = True
+    # Sets `on_engine[i:j] = True` for all starts at once.
+    j = np.maximum(np.searchsorted(times, ts), mask)
+    d = np.zeros(on_engine.shape[0] + 1, int)
+    np.add.at(d, mask, 1)
+    np.add.at(d, j, -1)
+    on_engine |= np.cumsum(d[:-1]) > 0
 
     return on_engine
 
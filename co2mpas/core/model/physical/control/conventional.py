@@ -161,18 +161,26 @@ def predict_on_engine(
 
     b0 = velocities > dfl.functions.StartStopModel.stop_velocity
     b0 |= accelerations > dfl.functions.StartStopModel.plateau_acceleration
-    b1 = start_stop_model(np.column_stack((velocities, accelerations)))
-
-    ts = min_time_engine_on_after_start
-    # noinspection PyTypeChecker
-    for i, (t, on, on_b, on_m) in enumerate(zip(times, on_engine, b0, b1)):
-        prev = i == 0 or on_engine[i - 1]
-        on = on or ((prev or on_b) and on_m)
-        if not on and t <= ts:
-            on = True
-        if not prev and on:
-            ts = t + min_time_engine_on_after_start
-        on_engine[i] = on
+    b1 = np.asarray(
+        start_stop_model(np.column_stack((velocities, accelerations))), bool
+    )
+
+    # Phases: the engine stops at the first time after `ts` without any
+    # on-condition, and it starts (and sets `ts`) when forced or by the model.
+    stops = np.flatnonzero(~(on_engine | b1))
+    starts = np.flatnonzero(on_engine | (b0 & b1))
+    i, ts, n = 0, min_time_engine_on_after_start, times.shape[0]
+    j = np.searchsorted(times, ts, side='right')
+    while True:
+        k = np.searchsorted(stops, max(i, j))
+        j = stops[k] if k < stops.shape[0] else n
+        on_engine[i:j] = True
+        k = np.searchsorted(starts, j)
+        if k == starts.shape[0]:
+            break
+        i = starts[k]
+        ts = times[i] + min_time_engine_on_after_start
+        j = np.searchsorted(times, ts, side='right')
     return on_engine
 
 
@@ -18,7 +18,6 @@ Sub-Modules:
     motors
     batteries
 """
-import numpy as np
 import schedula as sh
 from .motors import dsp as _motors
 from .batteries import dsp as _batteries
@@ -238,6 +237,6 @@ def predict_service_battery_flows(
         - Alternator currents [A].
     :rtype: numpy.array
     """
-    service_battery_model.reset()
-    it = zip(times, motive_powers, accelerations, on_engine, starter_currents)
-    return np.array([service_battery_model(*a) for a in it]).T
+    return service_battery_model.predict(
+        times, motive_powers, accelerations, on_engine, starter_currents
+    )
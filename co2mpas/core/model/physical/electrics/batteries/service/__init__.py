@@ -372,9 +372,12 @@ class ServiceBatteryModel:
                  service_battery_initialization_time, service_battery_load,
                  initial_service_battery_state_of_charge,
                  service_battery_nominal_voltage, service_battery_capacity):
+        args = has_energy_recuperation, service_battery_initialization_time
         self.status = functools.partial(
-            service_battery_status_model.predict, has_energy_recuperation,
-            service_battery_initialization_time
+            service_battery_status_model.predict, *args
+        )
+        self.statuses = functools.partial(
+            service_battery_status_model.predict_statuses, *args
         )
         self.nominal_voltage = service_battery_nominal_voltage
         self.dcdc = dcdc_current_model
@@ -419,6 +422,74 @@ class ServiceBatteryModel:
 
         return soc, status_, dcdc_c, alt_c
 
+    def predict(self, times, motive_powers, accelerations, on_engine,
+                starter_currents):
+        """
+        Predicts the service battery flows (i.e., `__call__` step by step).
+
+        The status and current models are evaluated at once on windows of
+        time steps, with guessed previous states of charge and statuses (i.e.,
+        the ones predicted by the previous window). Then, the state of charge
+        is integrated step by step. The steps are exact up to the first one
+        whose guessed previous state differs from the predicted one; the
+        prediction restarts from it with the new guesses.
+
+        :return:
+            State of charge [%], charging statuses [-], DC/DC converter
+            currents [A], and alternator currents [A].
+        :rtype: numpy.array
+        """
+        self.reset()
+        dcdc, alt = self.dcdc, self.alternator
+        if not (hasattr(dcdc, 'predict_currents') and
+                hasattr(alt, 'predict_currents')):
+            it = zip(
+                times, motive_powers, accelerations, on_engine,
+                starter_currents
+            )
+            return np.array([self(*a) for a in it]).T
+        n, w = times.shape[0], dfl.functions.ServiceBatteryModel.window
+        on = np.asarray(on_engine, bool)
+        load = self.current_load[on.astype(int)]
+        res = np.zeros((4, n))
+        prev_soc, prev_status = np.full(n, float(self.init_soc)), np.zeros(n)
+        i, soc, status = 0, self._prev_soc, self._prev_status
+        t0, c0 = self._prev_time, self._prev_current
+        while i < n:
+            j = min(i + w, n)
+            prev_soc[i], prev_status[i] = soc, status
+            t, q, s, p = times[i:j], prev_soc[i:j], prev_status[i:j], \
+                motive_powers[i:j]
+            st = self.statuses(t, s, q, p)
+            dcdc_c, alt_c = np.zeros(j - i), np.zeros(j - i)
+            b = st == 1
+            if b.any():
+                dcdc_c[b] = dcdc.predict_currents(t[b], q[b], st[b])
+            b = (st != 0) & on[i:j]
+            if b.any():
+                alt_c[b] = alt.predict_currents(
+                    t[b], q[b], st[b], p[b], accelerations[i:j][b]
+                )
+            c = load[i:j] - alt_c - dcdc_c - starter_currents[i:j]
+            x, x0, tp, cp = [], soc, t0, c0
+            for t1, c1 in zip(t.tolist(), c.tolist()):
+                x0 = max(0.0, min(x0 + (c1 + cp) * (t1 - tp) / self._d_soc,
+                                  100.0))
+                x.append(x0)
+                tp, cp = t1, c1
+            x = np.array(x)
+            k = np.flatnonzero((q[1:] != x[:-1]) | (s[1:] != st[:-1]))
+            k = k[0] + 1 if k.shape[0] else j - i
+            res[:, i:i + k] = x[:k], st[:k], dcdc_c[:k], alt_c[:k]
+            soc, status, t0, c0 = x[k - 1], st[k - 1], t[k - 1], c[k - 1]
+            prev_soc[i + 1:j + 1], prev_status[i + 1:j + 1] = \
+                x[:n - i - 1], st[:n - i - 1]
+            i += k
+        if n:
+            self._prev_status, self._prev_soc = int(status), float(soc)
+            self._prev_time, self._prev_current = float(t0), float(c0)
+        return res
+
 
 dsp.add_data('has_energy_recuperation', dfl.values.has_energy_recuperation)
 
@@ -408,7 +408,7 @@ class BatteryStatusModel:
             ))
             s = np.where(charge.predict(X))[0]
             if is_hybrid:
-                self.charge = lambda x: [x[0][0] == 1]
+                self.charge = lambda x: np.asarray(x)[:, 0] == 1
             else:
                 self.charge = charge.predict
             if s.shape[0]:
@@ -481,6 +481,25 @@ class BatteryStatusModel:
 
         return status
 
+    def predict_statuses(self, has_energy_rec, init_time, times, prev, soc,
+                         powers):
+        # Vectorized `predict`.
+        status = np.zeros(times.shape, int)
+        b = soc < 100
+        status[b & (times < init_time)] = 3
+        b &= status == 0
+        c = b & (soc < self.min)
+        r = b & ~c & (soc <= self.max)
+        if r.any():
+            X = np.column_stack((prev[r], soc[r]))
+            c[r] = np.asarray(self.charge(X), bool)
+        status[c] = 1
+        b &= ~c
+        if has_energy_rec and b.any():
+            b[b] = np.asarray(self.bers(powers[b, None]), bool).ravel()
+            status[b] = 2
+        return status
+
 
 @sh.add_function(dsp, outputs=['service_battery_status_model'], weight=10)
 def calibrate_service_battery_status_model(
@@ -38,7 +38,7 @@ class AlternatorCurrentModel:
     def __init__(self, alternator_charging_currents=(0, 0)):
         def default_model(X):
             time, prev_soc, alt_status, gb_power, acc = X.T
-            b = gb_power > 0 or (gb_power == 0 and acc >= 0)
+            b = (gb_power > 0) | ((gb_power == 0) & (acc >= 0))
 
             return np.where(b, *alternator_charging_currents)
 
@@ -72,7 +72,7 @@ class AlternatorCurrentModel:
         elif b[:i].any():
             self.model, self.mask = self._fit_model(X[b], Y[b])
         else:
-            self.model = lambda *args, **kwargs: [0.0]
+            self.model = lambda X, *args, **kwargs: np.zeros(len(X))
             self.mask = np.array((0,))
         self.mask += 1
 
@@ -113,6 +113,16 @@ class AlternatorCurrentModel:
             return min(0.0, self.init_model(arr[:, self.init_mask])[0])
         return min(0.0, self.model(arr[:, self.mask])[0])
 
+    def predict_currents(self, times, soc, statuses, *args):
+        # Vectorized `__call__`.
+        X = np.column_stack((times, soc, statuses) + args)
+        curr, b = np.zeros(X.shape[0]), statuses == 3
+        for b, model, mask in ((b, self.init_model, self.init_mask),
+                               (~b, self.model, self.mask)):
+            if b.any():
+                curr[b] = np.ravel(model(X[b][:, mask]))
+        return np.where(curr < 0.0, curr, 0.0)  # As `min(0.0, curr)` with nan.
+
 
 @sh.add_function(dsp, outputs=['alternator_current_model'])
 def calibrate_alternator_current_model(
@@ -121,6 +121,88 @@ class _XGBRegressor(xgb.XGBRegressor):
             super(_XGBRegressor, self).__setattr__(key, 0)
 
 
+# noinspection PyMissingOrEmptyDocstring,PyPep8Naming
+class _TreesRegressor:
+    # Flat array-based evaluator of a fitted XGBoost regressor, optionally
+    # behind a feature selection and a RANSAC. It gives the same predictions
+    # of the booster (i.e., float32 features and sums), without the per-call
+    # overhead of sklearn and xgboost.
+    def __init__(self, model):
+        import json
+        from sklearn.pipeline import Pipeline
+        self.columns = slice(None)
+        if isinstance(model, Pipeline):
+            self.columns = np.flatnonzero(model.steps[0][1].get_support())
+            model = model.steps[-1][1]
+        model = getattr(model, 'estimator_', model).get_booster()
+        model = json.loads(model.save_raw('json'))['learner']
+        if model['gradient_booster']['name'] != 'gbtree' or int(
+                model['learner_model_param'].get('num_target', 1)) != 1:
+            raise ValueError('Only single target gbtree boosters!')
+        base = model['learner_model_param']['base_score'].strip('[]')
+
+        # The first tree is a leaf with the base score, that is summed first.
+        trees = [{
+            'left_children': [-1], 'right_children': [-1], 'default_left': [0],
+            'split_indices': [0], 'split_conditions': [base], 'split_type': [0]
+        }] + model['gradient_booster']['model']['trees']
+        nodes, roots, depth, n = [], [], 0, 0
+        for tree in trees:
+            if any(tree.get('split_type', ())):
+                raise ValueError('Categorical splits are not supported!')
+            left, right = tree['left_children'], tree['right_children']
+            leaf = np.equal(left, -1)
+            index = np.arange(n, n + len(left))
+            roots.append(n)
+            nodes.append((
+                tree['split_indices'],
+                np.array(tree['split_conditions'], np.float32),
+                np.where(leaf, index, np.add(left, n)),  # Leaves loop.
+                np.where(leaf, index, np.add(right, n)),
+                tree['default_left'], leaf
+            ))
+            stack = [(0, 0)]
+            while stack:
+                i, d = stack.pop()
+                if leaf[i]:
+                    depth = max(depth, d)
+                else:
+                    stack.extend(((left[i], d + 1), (right[i], d + 1)))
+            n += len(left)
+        feature, threshold, left, right, default_left, leaf = (
+            np.concatenate(v) for v in zip(*nodes)
+        )
+        self.feature, self.threshold = feature.astype(int), threshold
+        self.value = np.where(leaf, threshold, 0).astype(np.float32)
+        # Next node (i.e., `children[2 * node + (x < threshold)]`).
+        self.children = np.column_stack((right, left)).ravel()
+        self.default_left = default_left.astype(bool)
+        self.roots, self.depth = np.array(roots), depth
+
+    def _next(self, node, x, missing):
+        b = x < self.threshold[node]
+        if missing:  # Missing values follow the default directions.
+            b = np.where(np.isnan(x), self.default_left[node], b)
+        return self.children[2 * node + b]
+
+    def predict(self, X):
+        X = np.asarray(X, np.float32)[:, self.columns]
+        rows, missing = np.arange(X.shape[0])[:, None], np.isnan(X).any()
+        node = np.tile(self.roots, (X.shape[0], 1))
+        for _ in range(self.depth):
+            node = self._next(node, X[rows, self.feature[node]], missing)
+        return np.cumsum(self.value[node], axis=1, dtype=np.float32)[:, -1]
+
+    __call__ = predict
+
+    def predict_row(self, x):
+        x, node = np.asarray(x, np.float32)[self.columns], self.roots
+        missing = np.isnan(x).any()
+        for _ in range(self.depth):
+            node = self._next(node, x[self.feature[node]], missing)
+        return np.cumsum(self.value[node], dtype=np.float32)[-1]
+
+
 # noinspection PyMethodMayBeStatic,PyMethodMayBeStatic,PyMissingOrEmptyDocstring
 class ThermalModel:
     def __init__(self, engine_thermostat_temperature=100.0):
@@ -150,17 +232,17 @@ class ThermalModel:
         x[:, 1] = np.round((self.thermostat + n - x[:, 1]) / n) * n
         b = on_engine & (np.abs(engine_temperature_derivatives) > dfl.EPS)
         # noinspection PyArgumentEqualDefault
-        self.on = Pipeline([
+        self.on = _TreesRegressor(Pipeline([
             ('selection', _SelectFromModel(
                 opt['base_estimator'], '0.8*median', in_mask=(0, 2,)
             )),
             ('regression', _SafeRANSACRegressor(**opt))
-        ]).fit(x[b, 1:], engine_temperature_derivatives[b]).predict
+        ]).fit(x[b, 1:], engine_temperature_derivatives[b]))
         b = ~on_engine
         if b.all():
-            self.off = _SafeRANSACRegressor(**opt).fit(
+            self.off = _TreesRegressor(_SafeRANSACRegressor(**opt).fit(
                 x[b, :2], engine_temperature_derivatives[b]
-            ).predict
+            ))
         return self
 
     def __call__(self, times, on_engine, velocities, engine_speeds_out,
@@ -170,10 +252,14 @@ class ThermalModel:
             np.ediff1d(times, to_begin=0), on_engine, velocities, accelerations,
             engine_speeds_out,
         ))
-        x, t0, hot = np.array([[.0] * 5]), self.thermostat + self.ntemp, False
+        x, t0, hot = np.array([.0] * 5), self.thermostat + self.ntemp, False
+        on, off = (
+            getattr(f, 'predict_row', None) or (lambda r, f=f: f(r[None]))
+            for f in (self.on, self.off)
+        )
         for i, (dt, b, v, a, s) in it:
             hot |= t > self.thermostat
             x[:] = v, t0 - t, hot, s, a
-            t += (self.on(x[:, 1:]) if b else self.off(x[:, :2])) * dt
+            t += (on(x[1:]) if b else off(x[:2])) * dt
             temp[i] = t = min(t, max_temp)
         return temp
@@ -32,7 +32,7 @@ from .at_gear import dsp as _at_gear
 from .mechanical import dsp as _mechanical
 from .manual import dsp as _manual
 from .planet import dsp as _planet_model
-from co2mpas.utils import List, reject_outliers
+from co2mpas.utils import reject_outliers
 
 dsp = sh.BlueDispatcher(
     name='Gear box model', description='Models the gear box.'
@@ -546,6 +546,16 @@ class GearBoxLosses:
 
         return _next
 
+    def losses(self, times, gear_box_powers_out, gear_box_speeds_out,
+               gear_box_speeds_in, gears, gear_box_torques=None):
+        # noinspection PyProtectedMember
+        from .thermal import _thermal_cycle
+        return _thermal_cycle(
+            self.initial_gear_box_temperature, gear_box_torques, gears, times,
+            gear_box_powers_out, gear_box_speeds_out, gear_box_speeds_in,
+            **self._thermal.keywords
+        )
+
 
 @sh.add_function(dsp, inputs_kwargs=True, outputs=['gear_box_loss_model'])
 @sh.add_function(dsp, outputs=['gear_box_loss_model'], weight=10)
@@ -653,16 +663,12 @@ def calculate_gear_box_efficiencies_torques_temperatures(
     .. note:: Torque entering the gearbox can be from engine side
        (power mode or from wheels in motoring mode).
     """
-    temp, to_in, eff = List(), List(), List()
-
-    func = gear_box_loss_model.init_losses(
-        temp, times, gear_box_powers_out, gear_box_speeds_out,
-        gear_box_speeds_in, gears, gear_box_torques
+    temp, to_in, eff = gear_box_loss_model.losses(
+        times, gear_box_powers_out, gear_box_speeds_out, gear_box_speeds_in,
+        gears, gear_box_torques
     )
-    for i in range(times.shape[0]):
-        temp[i + 1], to_in[i], eff[i] = func(i)
-    temp = np.minimum(engine_thermostat_temperature - 5, temp[:-1].toarray())
-    return temp, to_in.toarray(), eff.toarray()
+    temp = np.minimum(engine_thermostat_temperature - 5, temp[:-1])
+    return temp, to_in, eff
 
 
 @sh.add_function(dsp, outputs=['gear_box_powers_in'])
@@ -111,6 +111,21 @@ class MVL(CMV):
 
         return gear
 
+    def correct_gears(self, velocities, accelerations, gears):
+        # Vectorized `predict`.
+        gears = np.asarray(gears)
+        res, done = gears.copy(), np.zeros(gears.shape, bool)
+        b = np.abs(accelerations) < self.plateau_acceleration
+        for k, (down, _) in self.items():
+            b &= ~(k <= gears)
+            i = b & (velocities > down)
+            res[i], done[i], b[i] = k, True, False
+
+        b = ~done & (gears != 0)
+        for k, (_, up) in sorted(self.items()):
+            res[b & (res == k) & (velocities > up)] = k + 1
+        return res
+
 
 @sh.add_function(dsp, outputs=['MVL'])
 def calibrate_mvl(
@@ -190,6 +205,23 @@ class CorrectGear:
                 gear = self.min_gear
         return gear
 
+    # noinspection PyUnusedLocal
+    def basic_correct_gears(
+            self, gears, times, velocities, accelerations, motive_powers,
+            engine_coolant_temperatures):
+        v, res = velocities, np.array(gears)
+        b = v < self.idle_vel[-1][0]
+        res[b] = 0
+        b = ~b
+        for iv, g in self.idle_vel:
+            i = b & (gears >= g) & (v >= iv)
+            res[i], b[i] = g, False
+
+        b = np.zeros_like(b)
+        b[..., :-1] = v[..., 1:] > v[..., :-1]
+        res[(res == 0) & (v > 0) & ((accelerations > 0) | b)] = self.min_gear
+        return res
+
     def fit_correct_gear_mvl(self, mvl):
         self.mvl = mvl
         self.pipe.append(self.correct_gear_mvl)
@@ -200,6 +232,12 @@ class CorrectGear:
             motive_powers, engine_coolant_temperatures, next_gear):
         return self.mvl.predict(velocities[i], accelerations[i], gear)
 
+    # noinspection PyUnusedLocal
+    def correct_gears_mvl(
+            self, gears, times, velocities, accelerations, motive_powers,
+            engine_coolant_temperatures):
+        return self.mvl.correct_gears(velocities, accelerations, gears)
+
     def fit_correct_gear_full_load(
             self, full_load_curve, max_velocity_full_load_correction):
         self.max_velocity_full_load_corr = max_velocity_full_load_correction
@@ -222,6 +260,27 @@ class CorrectGear:
             return self.gears[np.argmax(delta)]
         return self.gears[j - k]
 
+    def correct_gears_full_load(
+            self, gears, times, velocities, accelerations, motive_powers,
+            engine_coolant_temperatures):
+        res, n = np.array(gears), len(self.gears)
+        b = ~((velocities > self.max_velocity_full_load_corr) |
+              (res <= self.min_gear))
+        j = np.searchsorted(self.gears, res)
+        for i in zip(*np.where(b & (j >= n))):  # Out of the gear box gears.
+            res[i] = self.correct_gear_full_load(
+                gears[i], i[-1], gears, times[i[:-1]], velocities[i[:-1]],
+                accelerations[i[:-1]], motive_powers[i[:-1]],
+                engine_coolant_temperatures, None
+            )
+        b &= j < n
+        j, vel = j[b], velocities[b][:, None]
+        delta = self.flc(vel / self.np_vsr) - motive_powers[b][:, None]
+        valid = (delta >= 0) & (np.arange(n) <= j[:, None])
+        k = n - 1 - valid[:, ::-1].argmax(1)
+        res[b] = self.gears[np.where(valid.any(1), k, delta.argmax(1))]
+        return res
+
     def fit_correct_driveability_rules(self, engine_speed_at_max_power):
         idle = self.idle_engine_speed[0]
         n_min_drive = idle + 0.125 * (engine_speed_at_max_power - idle)
@@ -434,6 +493,34 @@ class CorrectGear:
 
         return gear
 
+    def vectorize(self):
+        """
+        Returns the gear correction vectorized over the time steps.
+
+        :return:
+            Function to correct the predicted gears (i.e., `gears, times,
+            velocities, accelerations, motive_powers,
+            engine_coolant_temperatures`), or None if the correction depends
+            on the previous predicted gears.
+        :rtype: callable | None
+        """
+        funcs = {
+            'basic_correct_gear': self.basic_correct_gears,
+            'correct_gear_mvl': self.correct_gears_mvl,
+            'correct_gear_full_load': self.correct_gears_full_load
+        }
+        try:
+            pipe = [funcs[f.__name__] for f in self.pipe]
+        except KeyError:  # E.g., the driveability rules.
+            return None
+
+        def correct_gears(gears, *args):
+            for func in pipe:
+                gears = func(gears, *args)
+            return gears
+
+        return correct_gears
+
     def __call__(self, gear, i, gears, times, velocities, accelerations,
                  motive_powers, engine_coolant_temperatures, next_gear):
         for f in self.pipe:
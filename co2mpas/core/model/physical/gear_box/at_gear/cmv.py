@@ -172,6 +172,44 @@ def _grouper(iterable, n):
     return zip(*args)
 
 
+def _scan_gears(states, tables):
+    """
+    Predicts the gears from the transition tables without stepping in Python.
+
+    Each time step is a map of the previous gear into the next one. Their
+    compositions (i.e., from the first step) are computed by a parallel
+    prefix scan, that doubles the composed steps at each pass.
+
+    :param states:
+        Sorted valid gears [-].
+    :type states: numpy.array
+
+    :param tables:
+        Next gear for each previous gear (rows) and time step (columns) [-].
+    :type tables: numpy.array
+
+    :return:
+        Predicted gears [-].
+    :rtype: numpy.array
+    """
+    n = tables.shape[1]
+    if not n:
+        return np.zeros(0, int)
+    maps = np.searchsorted(states, tables)
+    s = 0  # Initial gear (i.e., the minimum) converged at the first step.
+    for _ in range(len(states) + 1):
+        s0, s = s, maps[s, 0]
+        if s == s0:
+            break
+    maps = maps.T.copy()
+    maps[0] = np.arange(len(states))
+    rows, d = np.arange(n)[:, None] * len(states), 1
+    while d < n:  # maps[i] = maps[i] o maps[i - d].
+        maps[d:] = maps.ravel().take(rows[d:] + maps[:-d])
+        d *= 2
+    return np.asarray(states[maps[:, s]], dtype=int)
+
+
 # noinspection PyMissingOrEmptyDocstring,PyUnusedLocal
 class CMV(collections.OrderedDict):
     def __init__(self, *args, velocity_speed_ratios=None):
@@ -325,21 +363,66 @@ class CMV(collections.OrderedDict):
                     return g0
                 return gear
         else:
-            r = velocities.shape[0]
-            for i, g in enumerate(keys):
-                down, up = self[g]
-                matrix[g] = p = np.tile(g, r)
-                p[velocities < down] = keys[max(0, i - 1)]
-                p[velocities >= up] = keys[min(i + 1, c)]
+            matrix = self._gear_matrix(
+                times, velocities, accelerations, motive_powers,
+                engine_coolant_temperatures
+            )
 
             def _next(gear, index):
                 return matrix[gear][index]
         return _next
 
+    def _gear_matrix(self, times, velocities, accelerations, motive_powers,
+                     engine_coolant_temperatures):
+        keys = sorted(self.keys())
+        matrix, c, r = {}, len(keys) - 1, velocities.shape[0]
+        for i, g in enumerate(keys):
+            down, up = self[g]
+            matrix[g] = p = np.tile(g, r)
+            p[velocities < down] = keys[max(0, i - 1)]
+            p[velocities >= up] = keys[min(i + 1, c)]
+        return matrix
+
+    def _gear_tables(self, times, velocities, accelerations, motive_powers,
+                     engine_coolant_temperatures=None,
+                     correct_gear=lambda g, *args: g):
+        # Transition tables (i.e., next gear for each previous gear and time).
+        vectorize = getattr(correct_gear, 'vectorize', None)
+        correct = vectorize and vectorize()
+        args = (
+            times, velocities, accelerations, motive_powers,
+            engine_coolant_temperatures
+        )
+        n = times.shape[0]
+        if correct is None or not all(
+                isinstance(v, np.ndarray) and v.shape[0] == n
+                for v in args[1:4]):
+            return None
+        matrix = self._gear_matrix(*args)
+        valid_gears = np.array(list(getattr(self, 'gears', self)))
+        states = np.unique(valid_gears)
+        if matrix is None or not set(states).issubset(matrix):
+            return None
+        shape = len(states), n  # Corrected at once for all previous gears.
+        gears = correct(np.array([matrix[g] for g in states]), *(
+            np.broadcast_to(v, shape)
+            if isinstance(v, np.ndarray) and v.shape == shape[1:] else v
+            for v in args
+        ))
+        return states, valid_gears[np.abs(np.subtract(
+            valid_gears[:, None, None], gears
+        )).argmin(0)]
+
     def predict(self, times, velocities, accelerations, motive_powers,
                 engine_coolant_temperatures=None,
                 correct_gear=lambda g, *args: g,
                 gear_filter=define_gear_filter()):
+        tables = self._gear_tables(
+            times, velocities, accelerations, motive_powers,
+            engine_coolant_temperatures, correct_gear
+        )
+        if tables is not None:
+            return _scan_gears(*tables)
         gears = np.zeros_like(times, int)
         gen = self.init_gear(
             gears, times, velocities, accelerations, motive_powers,
@@ -153,6 +153,19 @@ class GSMColdHot(collections.OrderedDict):
         from .cmv import CMV
         return CMV.predict(self, *args, **kwargs)
 
+    def _gear_tables(self, times, *args, **kwargs):
+        import numpy as np
+        tables = [
+            k in self and self[k]._gear_tables(times, *args, **kwargs)
+            for k in ('cold', 'hot')
+        ]
+        if not all(tables) or not np.array_equal(tables[0][0], tables[1][0]):
+            return None
+        (states, cold), (_, hot) = tables
+        return states, np.where(
+            times < self.time_cold_hot_transition, cold, hot
+        )
+
     def init_gear(self, gears, times, velocities, accelerations, motive_powers,
                   engine_coolant_temperatures=None,
                   correct_gear=lambda g, *args: g):
@@ -47,17 +47,30 @@ class DTGS:
         self.gears = np.unique(gears)
         return self
 
-    def _init_gear(self, times, velocities, accelerations, motive_powers,
-                   engine_coolant_temperatures):
+    def _gear_matrix(self, times, velocities, accelerations, motive_powers,
+                     engine_coolant_temperatures):
         from co2mpas.utils import List
-        predict = self.model.predict
         pars = (
             velocities, accelerations, motive_powers,
             engine_coolant_temperatures
         )
-
         if any(isinstance(v, List) for v in pars) or np.isnan(pars[-1]).any():
-            x = np.empty((1, 5), float)
+            return None
+        matrix = {}
+        x = np.column_stack((np.empty_like(velocities),) + pars)
+        for g in self.velocity_speed_ratios.keys():
+            x[:, 0] = g
+            matrix[g] = self.model.predict(x)
+        return matrix
+
+    def _init_gear(self, times, velocities, accelerations, motive_powers,
+                   engine_coolant_temperatures):
+        matrix = self._gear_matrix(
+            times, velocities, accelerations, motive_powers,
+            engine_coolant_temperatures
+        )
+        if matrix is None:
+            predict, x = self.model.predict, np.empty((1, 5), float)
 
             def _next(gear, i):
                 x[:, :] = (
@@ -66,17 +79,13 @@ class DTGS:
                 )
                 return predict(x)[0]
         else:
-            matrix = {}
-            x = np.column_stack((np.empty_like(velocities),) + pars)
-            for g in self.velocity_speed_ratios.keys():
-                x[:, 0] = g
-                matrix[g] = predict(x)
-            del x
-
             def _next(gear, index):
                 return matrix[gear][index]
         return _next
 
+    def _gear_tables(self, *args, **kwargs):
+        return CMV._gear_tables(self, *args, **kwargs)
+
     def init_gear(self, *args, **kwargs):
         return CMV.init_gear(self, *args, **kwargs)
 
@@ -163,17 +163,26 @@ class GSPV(CMV):
                     return g0
                 return gear
         else:
-            r = velocities.shape[0]
-            for i, g in enumerate(keys):
-                down, up = [func(motive_powers) for func in self[g]]
-                matrix[g] = p = np.tile(g, r)
-                p[velocities < down] = keys[max(0, i - 1)]
-                p[velocities >= up] = keys[min(i + 1, c)]
+            matrix = self._gear_matrix(
+                times, velocities, accelerations, motive_powers,
+                engine_coolant_temperatures
+            )
 
             def _next(gear, index):
                 return matrix[gear][index]
         return _next
 
+    def _gear_matrix(self, times, velocities, accelerations, motive_powers,
+                     engine_coolant_temperatures):
+        keys = sorted(self.keys())
+        matrix, c, r = {}, len(keys) - 1, velocities.shape[0]
+        for i, g in enumerate(keys):
+            down, up = [func(motive_powers) for func in self[g]]
+            matrix[g] = p = np.tile(g, r)
+            p[velocities < down] = keys[max(0, i - 1)]
+            p[velocities >= up] = keys[min(i + 1, c)]
+        return matrix
+
     # noinspection PyUnresolvedReferences,PyTypeChecker
     def convert(self, velocity_speed_ratios):
         if velocity_speed_ratios != self.velocity_speed_ratios:
@@ -313,3 +313,117 @@ def _thermal(
         gear_box_heat, gear_box_temperature, equivalent_gear_box_heat_capacity
     )
     return gear_box_temperature, gear_box_torque_in, gear_box_efficiency
+
+
+def _calculate_gear_box_torques(
+        gear_box_powers_out, gear_box_speeds_out, gear_box_speeds_in,
+        min_engine_on_speed):
+    # Vectorized `calculate_gear_box_torque`.
+    import numpy as np
+    p = gear_box_powers_out
+    x = np.where(p > 0, gear_box_speeds_in, gear_box_speeds_out)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(x <= min_engine_on_speed, 0, p / x * 30000.0 / math.pi)
+
+
+def _evaluate_gear_box_torques_in(
+        min_engine_on_speed, gear_box_torques, gear_box_speeds_in,
+        gear_box_speeds_out, gear_box_efficiency_parameters):
+    # Vectorized `_evaluate_gear_box_torque_in`.
+    import numpy as np
+    tgb, es, ws = gear_box_torques, gear_box_speeds_in, gear_box_speeds_out
+    par = gear_box_efficiency_parameters
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.select([
+            (tgb < 0) & (0 < es) & (ws > 0),
+            (es > min_engine_on_speed) & (ws > min_engine_on_speed)
+        ], [
+            (par['gbp01'] * tgb - par['gbp10'] * ws - par['gbp00']) * ws / es,
+            (tgb - par['gbp10'] * es - par['gbp00']) / par['gbp01']
+        ], 0)
+
+
+def _calculate_gear_box_heats(
+        gear_box_powers_out, gear_box_speeds_in, gear_box_torques,
+        gear_box_torques_in, delta_times, min_engine_on_speed):
+    # Vectorized `calculate_gear_box_efficiency` and `calculate_gear_box_heat`.
+    import numpy as np
+    p, s_in = gear_box_powers_out, gear_box_speeds_in
+    t_in = gear_box_torques_in
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eff = s_in * t_in / p * (math.pi / 30000)
+        eff = np.where(p > 0, np.where(eff != 0, 1 / eff, 1), eff)
+    b = (t_in == gear_box_torques) | (p == 0) | (s_in < min_engine_on_speed)
+    eff[b] = 1
+    eff = np.where(eff < 1, eff, 1)  # As `max(0, min(1, eff))` with nan.
+    eff = np.where(eff > 0, eff, 0)
+    heat = np.abs(p) * (1.0 - eff) * 1000.0 * delta_times
+    return eff, np.where((eff != 0) & (p != 0), heat, 0.0)
+
+
+def _thermal_cycle(
+        gear_box_temperature, gear_box_torques, gears, times,
+        gear_box_powers_out, gear_box_speeds_out, gear_box_speeds_in,
+        equivalent_gear_box_heat_capacity,
+        gear_box_efficiency_parameters_cold_hot,
+        gear_box_temperature_references, gear_box_ratios=None,
+        min_engine_on_speed=None):
+    """
+    Calculates the gear box temperatures, torques in, and efficiencies of a
+    cycle (i.e., `_thermal` step by step).
+
+    The quantities that do not depend on the temperature are calculated at
+    once. The temperature recurrence is stepped only while the gear box is
+    cold (i.e., below the hot reference temperature), since the heat is not
+    negative and the hot losses do not depend on the temperature.
+
+    :return:
+        Gear box temperatures (including the initial) [°C], torques in
+        [N*m], and efficiencies [-].
+    :rtype: (numpy.array, numpy.array, numpy.array)
+    """
+    import numpy as np
+    n, min_es = times.shape[0], min_engine_on_speed
+    p, s_in = gear_box_powers_out, gear_box_speeds_in
+    s_out = gear_box_speeds_out
+    dt = np.zeros(n)
+    dt[:-1] = np.diff(times)
+    if gear_box_torques is None:
+        gear_box_torques = _calculate_gear_box_torques(p, s_out, s_in, min_es)
+    tgb, par = gear_box_torques, gear_box_efficiency_parameters_cold_hot
+    t_hot = _evaluate_gear_box_torques_in(min_es, tgb, s_in, s_out, par['hot'])
+    if gear_box_ratios is None or gears is None:
+        one = np.zeros(n, bool)
+    else:  # The torque is not corrected when the gear box ratio is 1.
+        one = np.isin(gears, [k for k, v in gear_box_ratios.items() if v == 1])
+    to_in = np.where(one, tgb, t_hot)
+    eff, heat = _calculate_gear_box_heats(p, s_in, tgb, to_in, dt, min_es)
+    dtemp = heat / equivalent_gear_box_heat_capacity
+
+    temp = np.empty(n + 1)
+    temp[0] = t = gear_box_temperature
+    T_cold, T_hot = gear_box_temperature_references
+    i = 0
+    if not T_cold == T_hot:
+        t_cold = _evaluate_gear_box_torques_in(
+            min_es, tgb, s_in, s_out, par['cold']
+        ).tolist()
+        t_h, args = t_hot.tolist(), (tgb.tolist(), p.tolist(), s_in.tolist())
+        # A negative heat (e.g., time not sorted) could cool the gear box.
+        j = (np.flatnonzero(dtemp < 0)[-1:] + 1).sum()
+        while i < n and (t <= T_hot or i < j):
+            if t <= T_hot and not one[i]:
+                x = t_h[i]
+                x += (T_hot - t) / (T_hot - T_cold) * (t_cold[i] - x)
+                g, po, si = (v[i] for v in args)
+                to_in[i] = x
+                eff[i] = e = calculate_gear_box_efficiency(
+                    po, si, g, x, min_es
+                )
+                dtemp[i] = calculate_gear_box_heat(
+                    e, po, dt[i]
+                ) / equivalent_gear_box_heat_capacity
+            temp[i + 1] = t = t + dtemp[i]
+            i += 1
+    temp[i:] = np.cumsum(np.append(temp[i], dtemp[i:]))
+    return temp, to_in, eff
@@ -51,8 +51,9 @@ def default_output_template():
         Template output.
     :rtype: str
     """
-    from pkg_resources import resource_filename
-    return resource_filename('co2mpas', 'templates/output_template.xlsx')
+    # noinspection PyProtectedMember
+    from ... import _resource_filename
+    return _resource_filename('templates/output_template.xlsx')
 
 
 dsp.add_func(write_to_excel, outputs=['excel_output'])
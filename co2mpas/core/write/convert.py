@@ -429,7 +429,11 @@ _re_list = regex.compile(br'^[^\[]*(?P<list>\[.*\])[^\]]*$', regex.DOTALL)
 @functools.lru_cache()
 def _get_installed_packages():
     import json
+    import shutil
     from subprocess import check_output
+    if not shutil.which('conda'):  # Avoid a slow failing subprocess.
+        log.info("Failed collecting installation info.\nConda not found.")
+        return
     try:
         out = check_output("conda list --json".split())
         m = _re_list.match(out)
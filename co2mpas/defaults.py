@@ -624,6 +624,11 @@ class Functions(co2_utl.Constants):
         #: Minimum delta soc to set the charging boundaries [%].
         min_delta_soc = 8
 
+    # noinspection PyMissingOrEmptyDocstring,PyPep8Naming
+    class ServiceBatteryModel(co2_utl.Constants):
+        #: Number of time steps predicted at once [-].
+        window = 256
+
     # noinspection PyMissingOrEmptyDocstring,PyPep8Naming
     class default_ki_multiplicative(co2_utl.Constants):
         #: Multiplicative correction for vehicles with periodically regenerating
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+It contains the checkpoint journal of CO2MPAS batch runs.
+
+The journal is an append-only JSON lines file, where every line records a
+completed run (i.e., an input file or a plan row) with its summary row (typed
+encoded, see :func:`co2mpas._dumps_row`). When resuming, the completed runs
+are skipped and their summary rows are reused.
+"""
+import os
+import json
+import logging
+import collections
+import os.path as osp
+
+log = logging.getLogger(__name__)
+
+#: Journal file name (saved into the output folder).
+JOURNAL_FILE_NAME = 'co2mpas-journal.jsonl'
+
+
+class Journal:
+    """
+    Append-only journal of completed runs.
+    """
+
+    def __init__(self, file_name, resume=False):
+        """
+        :param file_name:
+            Journal file path `.jsonl`.
+        :type file_name: str
+
+        :param resume:
+            Load the completed runs to skip them?
+        :type resume: bool
+        """
+        self.file_name = file_name
+        #: Completed runs (i.e., key: entry).
+        self.entries = collections.OrderedDict()
+        #: Keys of the completed runs skipped in this run.
+        self.resumed, self._resumed = [], set()
+        if resume and osp.isfile(file_name):
+            self.entries.update(self._read())
+            log.info(
+                'Resuming %d completed runs from (%s)...', len(self.entries),
+                file_name
+            )
+
+    def _read(self):
+        with open(self.file_name) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # Truncated line.
+                    continue
+                yield entry['key'], entry
+
+    def resume(self, key):
+        """
+        Returns the entry of a completed run, and marks it as skipped.
+
+        :param key:
+            Run key.
+        :type key: str
+
+        :return:
+            Journal entry (i.e., `key`, summary `row`, and extra fields).
+        :rtype: dict | None
+        """
+        entry = self.entries.get(key)
+        if entry is not None and key not in self._resumed:
+            self._resumed.add(key)
+            self.resumed.append(key)
+        return entry
+
+    def add(self, key, row, **kwargs):
+        """
+        Records a completed run.
+
+        :param key:
+            Run key.
+        :type key: str
+
+        :param row:
+            Summary row.
+        :type row: dict
+
+        :param kwargs:
+            Extra fields of the journal entry.
+        :type kwargs: object
+        """
+        # noinspection PyProtectedMember
+        from co2mpas import _json_default, _dumps_row
+        entry = dict(kwargs, key=key, row=_dumps_row(row))
+        line = json.dumps(entry, default=_json_default)
+        os.makedirs(osp.dirname(self.file_name) or '.', exist_ok=True)
+        with open(self.file_name, 'a') as f:
+            f.write('%s\n' % line)
+            f.flush()
+            os.fsync(f.fileno())  # The entry must survive a crash.
+
+    def rows(self):
+        """
+        Returns the summary rows of the completed runs skipped in this run.
+
+        :return:
+            Summary rows.
+        :rtype: list[dict]
+        """
+        # noinspection PyProtectedMember
+        from co2mpas import _loads_row
+        return [_loads_row(self.entries[key]['row']) for key in self.resumed]
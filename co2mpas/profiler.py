@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+It contains a profiler that aggregates the node durations of CO2MPAS runs.
+
+The durations recorded by `schedula` in the solution pipes are aggregated by
+node path (i.e., sub-dispatcher names + node name) across all solutions (files
+and plan rows), and saved as:
+
+- `.json` and `.csv` tables sorted by cumulative time,
+- `.folded` stacks (one `path;to;node <microseconds>` per line) to be rendered
+  with flame-graph tools (e.g., `flamegraph.pl` or `speedscope`).
+"""
+import json
+import logging
+import collections
+import os.path as osp
+import schedula as sh
+
+log = logging.getLogger(__name__)
+
+
+def _node_name(node_id):
+    return str(node_id).replace(';', ',')  # `;` separates the folded stack.
+
+
+class Profiler:
+    """
+    Aggregates the node durations of model solutions.
+    """
+
+    def __init__(self):
+        #: Node stats (i.e., path: [calls, cumulative time, self time]).
+        self.stats = collections.OrderedDict()
+
+    def add_pipe(self, pipe, stack=()):
+        """
+        Adds the node durations of a solution pipe.
+
+        :param pipe:
+            Full pipe of a dispatch run (i.e., `schedula.Solution.pipe`).
+        :type pipe: schedula.utils.dsp.DspPipe
+
+        :param stack:
+            Parent nodes.
+        :type stack: tuple[str]
+
+        :return:
+            Total duration of the pipe [s].
+        :rtype: float
+        """
+        total = 0
+        for k, v in pipe.items():
+            i, s = v['task'][2]
+            t = s.workflow.nodes.get(i, {}).get('duration')
+            path = stack + tuple(map(_node_name, sh.stlp(k)))
+            dt = self.add_pipe(v['sub_pipe'], path) if 'sub_pipe' in v else 0
+            if t is None:
+                if 'sub_pipe' not in v:
+                    continue  # Data node.
+                t = dt
+            stats = self.stats.setdefault(path, [0, 0, 0])
+            stats[0] += 1
+            stats[1] += t
+            stats[2] += max(t - dt, 0)
+            total += t
+        return total
+
+    def add_solution(self, solution):
+        """
+        Adds the node durations of a model solution.
+
+        :param solution:
+            Model solution.
+        :type solution: schedula.Solution
+        """
+        try:
+            pipe = solution.pipe
+        except AttributeError:  # Not a solution.
+            return
+        self.add_pipe(pipe)
+
+    def collect(self, solutions):
+        """
+        Adds the node durations of the model solutions while iterating them.
+
+        :param solutions:
+            Model solutions.
+        :type solutions: collections.Iterable[schedula.Solution]
+
+        :return:
+            Model solutions.
+        :rtype: collections.Iterable[schedula.Solution]
+        """
+        for sol in solutions:
+            self.add_solution(sol)
+            yield sol
+
+    def rows(self):
+        """
+        Returns the node stats sorted by cumulative time.
+
+        Sub-dispatchers without a node in the pipe (e.g., `gear_box_model`) are
+        reported with the cumulative time of their nodes and no calls.
+
+        :return:
+            Node stats.
+        :rtype: list[dict]
+        """
+        stats = {k: v[:] for k, v in self.stats.items()}
+        for k, (c, cum, t) in self.stats.items():
+            for i in range(1, len(k)):
+                if k[:i] not in self.stats:
+                    stats.setdefault(k[:i], [None, 0, 0])[1] += t
+        rows = [{
+            'node': '/'.join(k), 'calls': c, 'cumulative': cum, 'self': t,
+            'per_call': cum / c if c else None
+        } for k, (c, cum, t) in stats.items()]
+        return sorted(rows, key=lambda x: (-x['cumulative'], x['node']))
+
+    def folded(self):
+        """
+        Returns the flame-graph stacks (self time in microseconds).
+
+        :return:
+            Folded stacks.
+        :rtype: list[str]
+        """
+        return [
+            '%s %d' % (';'.join(k), round(t * 1e6))
+            for k, (c, cum, t) in self.stats.items() if round(t * 1e6)
+        ]
+
+    def save(self, file_name):
+        """
+        Saves the profile as `.json`, `.csv`, and `.folded` files.
+
+        :param file_name:
+            Output file path without extension.
+        :type file_name: str
+
+        :return:
+            Output file paths.
+        :rtype: list[str]
+        """
+        import csv
+        import os
+        os.makedirs(osp.dirname(file_name) or '.', exist_ok=True)
+        rows, files = self.rows(), []
+
+        fp = '%s.json' % file_name
+        with open(fp, 'w') as f:
+            json.dump(rows, f, indent=1)
+        files.append(fp)
+
+        fp = '%s.csv' % file_name
+        with open(fp, 'w', newline='') as f:
+            writer = csv.DictWriter(f, (
+                'node', 'calls', 'cumulative', 'self', 'per_call'
+            ))
+            writer.writeheader()
+            writer.writerows(rows)
+        files.append(fp)
+
+        fp = '%s.folded' % file_name
+        with open(fp, 'w') as f:
+            f.writelines('%s\n' % v for v in self.folded())
+        files.append(fp)
+        return files
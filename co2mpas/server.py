@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+"""
+It provides a local HTTP server that keeps the CO2MPAS model registered in
+memory, and the client function to submit runs to it.
+
+The client posts a JSON object with the inputs of the process model (see
+:func:`co2mpas.cli.run`) and receives a JSON object with the summary file,
+the output files, and the summary rows (list of `[key, value]` pairs).
+
+Only the inputs of the `run` command are accepted (see :data:`RUN_KEYS` and
+:data:`CMD_FLAGS`). The server listens on a non-loopback address only if it
+has a token, that the client sends as `Authorization: Bearer <token>`.
+"""
+import os
+import json
+import hmac
+import logging
+import os.path as osp
+import http.server
+import schedula as sh
+
+log = logging.getLogger(__name__)
+
+#: Default server address.
+SERVER_ADDRESS = ('127.0.0.1', 4999)
+
+#: Process model inputs accepted by the server.
+RUN_KEYS = (
+    'input_files', 'cmd_flags', 'jobs', 'no_cache', 'cache_size',
+    'stream_summary', 'dsp_snapshot', 'profile', 'checkpoint', 'resume'
+)
+
+#: Command line options accepted by the server.
+CMD_FLAGS = (
+    'output_folder', 'encryption_keys', 'sign_key', 'output_template',
+    'only_summary', 'augmented_summary', 'hard_validation',
+    'declaration_mode', 'enable_selector', 'type_approval_mode',
+    'encryption_keys_passwords'
+)
+
+
+class AuthorizationError(Exception):
+    """
+    Request without a valid token.
+    """
+
+
+def _encode(obj):
+    # noinspection PyProtectedMember
+    from co2mpas import _json_default
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+
+# noinspection PyMissingOrEmptyDocstring
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            self.server.authorize(self.headers.get('Authorization'))
+            n = int(self.headers.get('Content-Length', 0))
+            res, code = self.server.run(json.loads(self.rfile.read(n))), 200
+        except AuthorizationError as ex:
+            log.warning('Unauthorized request from (%s:%d).',
+                        *self.client_address)
+            res, code = {'error': str(ex)}, 401
+        except ValueError as ex:  # Invalid request.
+            res, code = {'error': str(ex)}, 400
+        except Exception as ex:
+            log.error('Failed run due to:\n%r', ex)
+            res, code = {'error': repr(ex)}, 500
+        body = _encode(res)
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+
+class Server(http.server.HTTPServer):
+    """
+    HTTP server that runs the CO2MPAS process model with a warm core model.
+
+    Runs are executed one at a time; use the `jobs` input to parallelize a
+    single run.
+    """
+
+    def __init__(self, server_address=SERVER_ADDRESS, model_conf=None,
+                 token=None):
+        """
+        :param server_address:
+            Hostname and port to listen on.
+        :type server_address: (str, int)
+
+        :param model_conf:
+            Model-configuration file path `.yaml`.
+        :type model_conf: str
+
+        :param token:
+            Token required to submit runs. It is mandatory to listen on a
+            non-loopback address.
+        :type token: str
+        """
+        super(Server, self).__init__(server_address, _Handler)
+        import ipaddress
+        if not (token or ipaddress.ip_address(
+                self.server_address[0]).is_loopback):
+            self.server_close()
+            raise ValueError(
+                'A token is required to listen on a non-loopback address '
+                '(%s)!' % self.server_address[0]
+            )
+        self.token = token
+        self.model_conf = model_conf and osp.abspath(model_conf)
+        from co2mpas import dsp, init_conf, register_core
+        init_conf({'model_conf': self.model_conf})
+        self.process = dsp.register(memo={})
+        self.core_model = register_core()
+        log.info('CO2MPAS server listening on (%s:%d).', *self.server_address)
+
+    def run(self, inputs):
+        """
+        Runs the process model.
+
+        :param inputs:
+            Process model inputs.
+        :type inputs: dict
+
+        :return:
+            Summary file, output files, profile files, and summary rows.
+        :rtype: dict
+        """
+        keys = set(inputs) - set(RUN_KEYS)
+        keys.update(set(inputs.get('cmd_flags') or {}) - set(CMD_FLAGS))
+        if keys:
+            raise ValueError('Inputs not accepted: %s!' % sorted(keys))
+        cmd_flags = dict(inputs.get('cmd_flags') or {})
+        if self.model_conf:  # The parallel processes load it as well.
+            cmd_flags['model_conf'] = self.model_conf
+        inputs = sh.combine_dicts(inputs, {
+            'cmd_flags': cmd_flags, 'core_model': self.core_model,
+            'plot_workflow': False
+        })
+        os.makedirs(cmd_flags.get('output_folder') or '.', exist_ok=True)
+        sol = self.process(inputs, ['done', 'run', 'profile_files'])
+        return {
+            'summary_file': sol.get('output_summary_file'),
+            'output_files': [
+                s['output_file_name'] for s in sol.get('solutions', ())
+                if 'output_file_name' in s
+            ],
+            'profile_files': sol.get('profile_files', []),
+            'summary': [list(r.items()) for r in sol.get('summary', ())]
+        }
+
+    def authorize(self, authorization):
+        """
+        Checks the authorization header of a request.
+
+        :param authorization:
+            Authorization header (i.e., `Bearer <token>`).
+        :type authorization: str
+        """
+        if self.token and not hmac.compare_digest(
+                (authorization or '').encode('utf-8'),
+                ('Bearer %s' % self.token).encode('utf-8')):
+            raise AuthorizationError('Invalid or missing server token!')
+
+
+def submit(inputs, server_address=SERVER_ADDRESS, timeout=None, token=None):
+    """
+    Submits a run to a CO2MPAS server.
+
+    :param inputs:
+        Process model inputs. Relative paths are resolved by the server.
+    :type inputs: dict
+
+    :param server_address:
+        Hostname and port of the server.
+    :type server_address: (str, int)
+
+    :param timeout:
+        Timeout [s].
+    :type timeout: float
+
+    :param token:
+        Server token.
+    :type token: str
+
+    :return:
+        Summary file, output files, and summary rows.
+    :rtype: dict
+    """
+    import urllib.error
+    import urllib.request
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = 'Bearer %s' % token
+    req = urllib.request.Request(
+        'http://%s:%d/run' % tuple(server_address), data=_encode(inputs),
+        headers=headers
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as res:
+            return json.loads(res.read())
+    except urllib.error.HTTPError as ex:
+        res = json.loads(ex.read())
+    raise RuntimeError(res.get('error', 'Failed run!'))
+
+
+def abspath_inputs(inputs, keys=(
+        'output_folder', 'encryption_keys', 'sign_key', 'output_template',
+        'encryption_keys_passwords')):
+    """
+    Makes absolute the file paths of the process model inputs.
+
+    :param inputs:
+        Process model inputs.
+    :type inputs: dict
+
+    :param keys:
+        Command line options that are file paths.
+    :type keys: tuple[str]
+
+    :return:
+        Process model inputs with absolute paths.
+    :rtype: dict
+    """
+    inputs = inputs.copy()
+    inputs['input_files'] = [osp.abspath(p) for p in inputs['input_files']]
+    inputs['cmd_flags'] = {
+        k: osp.abspath(v) if k in keys and v else v
+        for k, v in inputs['cmd_flags'].items()
+    }
+    return inputs
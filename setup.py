@@ -104,7 +104,7 @@ if __name__ == '__main__':
         'plot': ['flask', 'regex', 'graphviz', 'Pygments', 'lxml',
                  'beautifulsoup4', 'jinja2', 'docutils', 'matplotlib'],
         'io': ['pandas>=0.21.0', 'dill', 'regex', 'pandalone[xlrd]<0.3',
-               'xlrd', 'asteval']
+               'xlrd<2', 'asteval']
     }
     extras['dice'] = ['co2mpas_dice>=4.0.5'] + extras['io']
     # noinspection PyTypeChecker
@@ -162,7 +162,7 @@ if __name__ == '__main__':
         obsoletes=['co2mpas (< 3.0)'],
         python_requires='>=3.5',
         install_requires=[
-            'PyYAML',
+            'PyYAML>=5.1',
             'schedula>=0.3.2',
             'tqdm',
             'scikit-learn',
@@ -170,9 +170,9 @@ if __name__ == '__main__':
             'lmfit>=0.9.7',
             'numpy',
             'schema',
-            'scipy',
+            'scipy>=1.7',
             'wltp<1',
-            'xgboost>=0.90',
+            'xgboost>=1.6',
             'statsmodels'
         ],
         entry_points={
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import functools
+import unittest
+import ddt
+import numpy as np
+from co2mpas.core.model.physical.gear_box import at_gear as at
+from co2mpas.core.model.physical.gear_box.at_gear.cmv import CMV
+from co2mpas.core.model.physical.gear_box.at_gear.gspv import GSPV
+from co2mpas.core.model.physical.gear_box.at_gear.core import GSMColdHot
+
+VSR = {0: 0.0, 1: 0.0075, 2: 0.0135, 3: 0.02, 4: 0.027, 5: 0.034, 6: 0.041}
+IDLE_ENGINE_SPEED = 800.0, 50.0
+STOP_VELOCITY = 1.0
+
+
+def _cycle(seed, n=1200, nan=False):
+    # Random micro-trips.
+    rng, v = np.random.default_rng(seed), []
+    while len(v) < n:
+        top, k = rng.uniform(20, 130), int(rng.integers(20, 120))
+        v.extend(np.concatenate([
+            np.linspace(0, top, k // 2), top + rng.normal(0, 2, k),
+            np.linspace(top, 0, k // 2), np.zeros(int(rng.integers(1, 20)))
+        ]))
+    times = np.cumsum(rng.uniform(.5, 1.5, n))
+    velocities = np.clip(v[:n], 0, None)
+    accelerations = np.gradient(velocities / 3.6, times)
+    motive_powers = (
+        100 + .5 * velocities + .04 * velocities ** 2 + 1500 * accelerations
+    ) * velocities / 3600
+    gears = np.searchsorted([15, 30, 50, 70, 90], velocities) + 1
+    gears[velocities < STOP_VELOCITY] = 0
+    speeds = np.where(gears, velocities / np.array(
+        [VSR[k] for k in gears.clip(1)]
+    ), IDLE_ENGINE_SPEED[0]) + rng.normal(0, 30, n)
+    temperatures = np.linspace(20, 90, n)
+    if nan:
+        for x in (velocities, accelerations, motive_powers, temperatures):
+            x[rng.choice(n, 20)] = np.nan
+    return times, velocities, accelerations, motive_powers, temperatures, \
+        speeds, gears
+
+
+def _corrections(gears, velocities):
+    full_load_curve = functools.partial(
+        np.interp, xp=[750, 2000, 4000, 6000], fp=[5, 40, 80, 90], left=0,
+        right=0
+    )
+    mvl = at.calibrate_mvl(
+        gears, velocities, VSR, IDLE_ENGINE_SPEED, STOP_VELOCITY
+    )
+    return {
+        'basic': at.correct_gear_v3(VSR, IDLE_ENGINE_SPEED),
+        'mvl': at.correct_gear_v1('WLTP', VSR, mvl, IDLE_ENGINE_SPEED, .1),
+        'full_load': at.correct_gear_v2(
+            VSR, IDLE_ENGINE_SPEED, full_load_curve, 100
+        ),
+        'all': at.correct_gear_v0(
+            'WLTP', VSR, mvl, IDLE_ENGINE_SPEED, full_load_curve, 100, .1
+        )
+    }
+
+
+# noinspection PyUnusedLocal
+def _models(times, velocities, accelerations, motive_powers, temperatures,
+            speeds, gears, correct_gear):
+    args = speeds, times, velocities, accelerations, motive_powers, VSR
+    cmv_ch = GSMColdHot(time_cold_hot_transition=300.0)
+    cmv_ch.fit(CMV, times, correct_gear, gears, *args, STOP_VELOCITY)
+    return {
+        'CMV': CMV().fit(correct_gear, gears, *args, STOP_VELOCITY),
+        'GSPV': GSPV().fit(
+            gears, velocities, motive_powers, VSR, STOP_VELOCITY
+        ),
+        'CMV_cold_hot': cmv_ch
+    }
+
+
+@ddt.ddt
+class ATGear(unittest.TestCase):
+    @ddt.idata(range(3))
+    def test_predict(self, seed):
+        # Transition tables vs step-wise state machine (i.e., a correction
+        # that is not vectorized).
+        cycle, nan_cycle = _cycle(seed), _cycle(seed, nan=True)
+        gears, velocities = cycle[-1], cycle[1]
+        for c_name, correct_gear in _corrections(gears, velocities).items():
+            models = _models(*cycle, correct_gear)
+            for m_name, model in models.items():
+                for inputs in (cycle[:5], nan_cycle[:5]):
+                    np.testing.assert_array_equal(
+                        model.predict(*inputs, correct_gear=correct_gear),
+                        model.predict(*inputs, correct_gear=lambda *a: (
+                            correct_gear(*a)
+                        )), err_msg='%s: %s' % (m_name, c_name)
+                    )
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import os
+import time
+import tempfile
+import unittest
+import os.path as osp
+import ddt
+from co2mpas.cache import FileCache
+
+
+@ddt.ddt
+class Cache(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = self.tmp.name
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, name, content=b'data'):
+        fp = osp.join(self.folder, name)
+        with open(fp, 'wb') as f:
+            f.write(content)
+        return fp
+
+    def test_hit(self):
+        import numpy as np
+        cache = FileCache(osp.join(self.folder, 'cache'))
+        self.assertNotIn('a', cache)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', {'x': np.arange(3)})
+        self.assertIn('a', cache)
+        np.testing.assert_equal(cache.get('a'), {'x': np.arange(3)})
+
+    def test_evict(self):
+        cache = FileCache(osp.join(self.folder, 'cache'))
+        for i, k in enumerate('abc'):
+            cache.set(k, os.urandom(2 ** 19))
+            os.utime(cache._path(k), (time.time() - 10 + i,) * 2)
+        cache.get('a')  # Marks `a` as recently used.
+        cache.max_size = 1.2
+        cache.evict()
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_corrupted(self):
+        cache = FileCache(osp.join(self.folder, 'cache'))
+        cache.set('a', 1)
+        with open(cache._path('a'), 'wb') as f:
+            f.write(b'corrupted')
+        self.assertEqual(cache.get('a', 2), 2)
+        self.assertNotIn('a', cache)
+
+    @ddt.idata((
+            ('input.xlsx', {'type_approval_mode': True}),
+            ('input.co2mpas.ta', {}),
+            ('input.co2mpas', {}),
+    ))
+    def test_ta_not_cached(self, case):
+        # noinspection PyProtectedMember
+        from co2mpas import _results_key, _inputs_key, _run_key
+        name, flags = case
+        fp = self._file(name)
+        self.assertIsNone(_results_key(fp, flags))
+        self.assertIsNone(_inputs_key(fp, flags))
+        self.assertIsNotNone(_run_key(fp, flags))
+
+    def test_key_files_content(self):
+        # noinspection PyProtectedMember
+        from co2mpas import _results_key
+        fp, key = self._file('input.xlsx'), self._file('secret.keys', b'old')
+        flags = {'encryption_keys': key, 'output_folder': 'a'}
+        k = _results_key(fp, flags)
+        self.assertEqual(k, _results_key(fp, dict(flags, output_folder='b')))
+        self._file('secret.keys', b'new')  # Rotated key at the same path.
+        self.assertNotEqual(k, _results_key(fp, flags))
+
+    def test_restore_outputs(self):
+        # noinspection PyProtectedMember
+        from co2mpas import _restore_outputs
+        sol = {
+            'output_file': b'', 'output_file_name': 'old.co2mpas.ta',
+            'input_file_name': 'input.xlsx', 'timestamp': 'old'
+        }
+        out = osp.join(self.folder, 'outputs')
+        _restore_outputs(sol, {'type_approval_mode': True,
+                               'output_folder': out}, 'new')
+        self.assertEqual(sol['output_file_name'], 'old.co2mpas.ta')
+        self.assertFalse(osp.exists(out))
+
+    def test_inputs_key(self):
+        # noinspection PyProtectedMember
+        from co2mpas import _inputs_key
+        fp, flags = self._file('input.xlsx'), {'hard_validation': True}
+        key = _inputs_key(fp, flags)
+        self.assertEqual(key, _inputs_key(fp, dict(flags)))
+        self.assertNotEqual(key, _inputs_key(fp, {'hard_validation': False}))
+        self.assertNotEqual(key, _inputs_key(self._file('other.xlsx'), flags))
+        self._file('input.xlsx', b'new')  # Edited file at the same path.
+        self.assertNotEqual(key, _inputs_key(fp, flags))
+
+    def test_core_inputs(self):
+        # noinspection PyProtectedMember
+        from co2mpas import _core_inputs
+        cache = FileCache(osp.join(self.folder, 'cache'))
+        cache.set('a', {'base': {'x': 1}, 'plan': []})
+        inputs = dict(
+            input_file_name='input.xlsx', cmd_flags={}, timestamp='now',
+            parse_jobs=1
+        )
+        self.assertEqual(
+            _core_inputs('input.xlsx', {}, 'now', cache, 'b'), inputs
+        )
+        self.assertEqual(
+            _core_inputs('input.xlsx', {}, 'now', cache, 'a'),
+            dict(inputs, base={'x': 1}, plan=[])
+        )
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import glob
+import tempfile
+import unittest
+import os.path as osp
+import ddt
+import numpy as np
+import pandas as pd
+from co2mpas.core.load.plan import Plan
+
+DEMOS = sorted(glob.glob(osp.join(
+    osp.dirname(__file__), '..', '..', 'co2mpas', 'demos', '*.xlsx'
+)))
+
+DATA = [
+    [None, None, None, None, None],
+    [None, 'a', 'b', 'c', None],
+    [None, 1, 2.5, 3, None],
+    [None, 4, None, 6, 7],
+    [None, 7, 8, 9, None],
+    [None, None, None, None, 1]
+]
+
+XL_REFS = (
+    '#data!B2', '#data!B2:D4', '#data!A1(RD):..(D)', '#data!B3:..:D',
+    '#data!C3:..(D):{"opts": {"empty": true}, "func": "redim", '
+    '"kwds": {"col": 1, "cell": 1}}', '#data!^^:__', '#data!R1C1:R-1C-1',
+    '#data!B2:_.(U)', '#data!A20(U):..(R)', '#data!:', '#data!B2:C3:RD',
+    '#data!C4:C4:LURD1', '#data!B2:D2:["redim", [0, 1, [1, true], 1, 2]]',
+    '#data!F1(LD):..(D?)', '#data!Z99(UL):A1', '#data!B4:..(R+):"numpy"',
+    '#data!A1:A1:{"opts": {"no_empty": false}}', '#data!B5:.^(U+)', '#data!',
+    '#data!B3:D3:["pipe", [["redim", {"row": 1}], "sorted"]]', 'no #ref'
+)
+
+
+def _write_workbook(file_name, sheets):
+    import openpyxl
+    book = openpyxl.Workbook()
+    book.remove(book.active)
+    for sheet_name, rows in sheets.items():
+        sheet = book.create_sheet(sheet_name)
+        for row in rows:
+            sheet.append(row)
+    book.save(file_name)
+
+
+def _has_lasso():
+    try:
+        # noinspection PyProtectedMember
+        from pandalone.xleash import _pandas_filters
+        return True
+    except ImportError:
+        return False
+
+
+def _assert_equal(a, b, path=()):
+    if isinstance(a, dict):
+        assert isinstance(b, dict) and a.keys() == b.keys(), path
+        for k, v in a.items():
+            _assert_equal(v, b[k], path + (k,))
+    elif isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(a, b, obj=str(path))
+    elif isinstance(a, pd.Series):
+        pd.testing.assert_series_equal(a, b, obj=str(path))
+    elif isinstance(a, Plan):
+        assert isinstance(b, Plan), path
+        _assert_equal(list(a.raw_rows()), list(b.raw_rows()), path)
+    else:
+        assert type(a) == type(b), path
+        np.testing.assert_equal(a, b, err_msg=str(path))
+
+
+@ddt.ddt
+@unittest.skipUnless(_has_lasso(), 'Requires the pandalone lasso filters.')
+class ExcelReader(unittest.TestCase):
+    @ddt.idata(DEMOS)
+    def test_lasso(self, file_name):
+        import xlrd
+        # noinspection PyProtectedMember
+        from co2mpas.core.load.excel import (
+            _re_input_sheet_name, _parse_sheet
+        )
+        with open(file_name, 'rb') as f:
+            book = xlrd.open_workbook(file_contents=f.read())
+        for sheet_name in book.sheet_names():
+            match = _re_input_sheet_name.match(sheet_name.strip(' '))
+            if not match:
+                continue
+            match = {k: v.lower() for k, v in match.groupdict().items() if v}
+            _assert_equal(
+                _parse_sheet(match, book, sheet_name, {'plan': {}}),
+                _parse_sheet(match, book, sheet_name, {'plan': {}}, True),
+                (sheet_name,)
+            )
+
+    def test_xl_refs(self):
+        import xlrd
+        # noinspection PyProtectedMember
+        from co2mpas.core.load.excel import _read_sheet, _lasso_sheet
+        with tempfile.TemporaryDirectory() as tmp:
+            fp = osp.join(tmp, 'refs.xlsx')
+            _write_workbook(fp, {
+                'data': DATA, 'pl': [['refs']] + [[r] for r in XL_REFS],
+                'pa': [['Parameter', 'Name', 'Value']] + [
+                    [None, 'k%d' % i, r] for i, r in enumerate(XL_REFS)
+                ]
+            })
+            book = xlrd.open_workbook(fp)
+        for sh_type in ('pa', 'pl'):
+            _assert_equal(
+                _read_sheet(book, sh_type, sh_type),
+                _lasso_sheet(book, sh_type, sh_type), (sh_type,)
+            )
+
+
+@ddt.ddt
+class XlRefs(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    @classmethod
+    def setUpClass(cls):
+        import xlrd
+        with tempfile.TemporaryDirectory() as tmp:
+            fp = osp.join(tmp, 'data.xlsx')
+            _write_workbook(fp, {'data': DATA})
+            cls.book = xlrd.open_workbook(fp)
+
+    @ddt.idata((
+            ('#data!B2:D3', [['a', 'b', 'c'], [1, 2.5, 3]]),
+            ('#data!B3:..:D', [[1], [4], [7]]),
+            ('#data!C3:..(D):{"func": "redim", "kwds": {"cell": 0}}', 2.5),
+            ('#data!A3(R):..(D):["redim", {"col": 1}]', [1, 4, 7]),
+            ('#data!E5(U):..(L+)', [[6, 7]]),
+            ('#data!C4:C4:LURD1', [
+                ['a', 'b', 'c', None], [1, 2.5, 3, None], [4, None, 6, 7],
+                [7, 8, 9, None]
+            ]),
+            ('#data!A20(U):..(R)', []),
+    ))
+    def test_lasso(self, case):
+        # noinspection PyProtectedMember
+        from co2mpas.core.load.excel import _XlRefs
+        xl_ref, res = case
+        sheet = self.book.sheet_by_name('data')
+        self.assertEqual(_XlRefs(self.book).lasso(xl_ref, sheet)[0], res)
+
+    def test_errors(self):
+        # noinspection PyProtectedMember
+        from co2mpas.core.load.excel import _XlRefs
+        refs, sheet = _XlRefs(self.book), self.book.sheet_by_name('data')
+        self.assertRaises(SyntaxError, refs.lasso, 'no #ref', sheet)
+        self.assertRaises(ValueError, refs.lasso, '#data!A1:"py"', sheet)
+        self.assertRaises(
+            ValueError, refs.lasso, '#A20(U):..(R):{"opts": {"no_empty": '
+                                    'true}}', sheet
+        )
+
+
+def _input_sheets(ref=None, n=3):
+    # Parameters sheet and `n` plain time series sheets.
+    sheets = {'Inputs': [
+        ['Parameter', 'Name', 'Value'],
+        [None, 'input.calibration.vehicle_mass', 1500]
+    ]}
+    if ref:
+        sheets['Inputs'].append([None, 'input.calibration.WLTP-H.f0', ref])
+    for i, cycle in enumerate(('WLTP-H', 'WLTP-L', 'NEDC-H', 'NEDC-L')[:n]):
+        sheets[cycle] = [
+            ['description'], ['times', 'velocities', 'engine_speeds_out']
+        ] + [[t, t * (i + 1.5), 800 + t * 10 + i] for t in range(10)]
+    return sheets
+
+
+@ddt.ddt
+class ParallelReader(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fp = osp.join(self.tmp.name, 'input.xlsx')
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @ddt.idata((
+            (None, 3, {'WLTP-H', 'WLTP-L', 'NEDC-H'}),
+            ('#WLTP-H!B4', 3, {'WLTP-L', 'NEDC-H'}),
+            ('#WLTP-H!B4', 2, set()),
+            (None, 1, set()),
+    ))
+    def test_ts_sheets(self, case):
+        from co2mpas.core.load import InputFile
+        # noinspection PyProtectedMember
+        from co2mpas.core.load.excel import _parse_ts_sheets, parse_excel_file
+        ref, n, parallel = case
+        _write_workbook(self.fp, _input_sheets(ref, n))
+        self.assertEqual(set(_parse_ts_sheets(InputFile(self.fp), 2)[1]),
+                         parallel)
+        res = parse_excel_file(self.fp, InputFile(self.fp))
+        data = res['base']['input']
+        self.assertEqual(len({
+            k for v in data.values() for k, d in v.items() if 'times' in d
+        }), n)
+        if ref:
+            self.assertEqual(data['calibration']['wltp_h']['f0'], 1.5)
+        _assert_equal(parse_excel_file(self.fp, InputFile(self.fp), 2), res)
+
+    @ddt.idata(DEMOS)
+    def test_demos(self, file_name):
+        from co2mpas.core.load import InputFile
+        from co2mpas.core.load.excel import parse_excel_file
+        res = parse_excel_file(file_name, InputFile(file_name))
+        _assert_equal(
+            parse_excel_file(file_name, InputFile(file_name), 2), res
+        )
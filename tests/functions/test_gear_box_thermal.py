@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+from co2mpas.defaults import dfl
+from co2mpas.core.model.physical.gear_box import (
+    GearBoxLosses, calculate_gear_box_efficiency_parameters_cold_hot
+)
+
+GEAR_BOX_RATIOS = {1: 3.5, 2: 2.1, 3: 1.4, 4: 1.0, 5: .8}
+
+
+def _cycle(seed, n=1800, nan=False, unsorted=False):
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.uniform(.5, 1.5, n))
+    if unsorted:
+        i = rng.choice(n - 1, 5)
+        times[i], times[i + 1] = times[i + 1], times[i]
+    gears = rng.integers(0, 6, n)
+    speeds_out = np.abs(rng.normal(500, 300, n))
+    ratios = np.array([GEAR_BOX_RATIOS.get(k, 0) for k in gears])
+    speeds_in = speeds_out * ratios
+    powers_out = rng.normal(5, 15, n)
+    powers_out[rng.random(n) < .05] = 0
+    speeds_in[rng.random(n) < .05] = 0
+    torques = powers_out / speeds_in.clip(1) * 30000 / np.pi
+    if nan:
+        for x in (powers_out, speeds_out, speeds_in, torques):
+            x[rng.choice(n, 20)] = np.nan
+    return times, powers_out, speeds_out, speeds_in, gears, torques
+
+
+def _reference(model, times, powers_out, speeds_out, speeds_in, gears,
+               torques=None):
+    # Step-wise loop, as it was before the batch engine.
+    n = times.shape[0]
+    temp, to_in, eff = np.empty(n + 1), np.empty(n), np.empty(n)
+    func = model.init_losses(
+        temp, times, powers_out, speeds_out, speeds_in, gears, torques
+    )
+    for i in range(n):
+        temp[i + 1], to_in[i], eff[i] = func(i)
+    return temp, to_in, eff
+
+
+@ddt.ddt
+class ThermalCycle(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        constants = dfl.functions.get_gear_box_efficiency_constants.PARAMS
+        self.par = calculate_gear_box_efficiency_parameters_cold_hot(
+            constants[False], 250
+        )
+
+    @ddt.idata((
+            # Initial temperature, references, and heat capacity.
+            (20, (40, 80), 2000),  # Saturating.
+            (20, (40, 80), 1e6),  # Always cold.
+            (90, (40, 80), 2000),  # Always hot.
+            (-10, (60, 60), 2000),  # Equal references.
+            (60, (40, 80), 500),
+    ))
+    def test_losses(self, case):
+        temperature, references, capacity = case
+        for seed in range(3):
+            for kw in ({}, {'nan': True}, {'unsorted': True}):
+                *cycle, torques = _cycle(seed, **kw)
+                for ratios in (None, GEAR_BOX_RATIOS):
+                    model = GearBoxLosses(
+                        self.par, capacity, references, temperature,
+                        dfl.values.min_engine_on_speed, ratios
+                    )
+                    for t in (None, torques):
+                        msg = '%s: %s, %s' % (seed, kw, t is None)
+                        for a, b in zip(model.losses(*cycle, t),
+                                        _reference(model, *cycle, t)):
+                            np.testing.assert_array_equal(a, b, err_msg=msg)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import io
+import os
+import tempfile
+import unittest
+import os.path as osp
+import ddt
+from co2mpas.core.load import InputFile, read_input_file
+
+
+@ddt.ddt
+class InputFileTest(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fp = osp.join(self.tmp.name, 'input.bin')
+        self.data = os.urandom(10000)
+        with open(self.fp, 'wb') as f:
+            f.write(self.data)
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @ddt.idata((
+            ((0, io.SEEK_SET), 10),
+            ((100, io.SEEK_SET), -1),
+            ((-10, io.SEEK_END), 100),
+            ((20000, io.SEEK_SET), 10),
+    ))
+    def test_read(self, case):
+        (offset, whence), size = case
+        f, ref = InputFile(self.fp), io.BytesIO(self.data)
+        self.assertEqual(f.seek(offset, whence), ref.seek(offset, whence))
+        self.assertEqual(f.read(size), ref.read(size))
+        self.assertEqual(f.seek(5, io.SEEK_CUR), ref.seek(5, io.SEEK_CUR))
+        self.assertEqual(f.read(), ref.read())
+        self.assertEqual(f.tell(), ref.tell())
+        self.assertEqual(f.getvalue(), self.data)
+
+    def test_pickle(self):
+        import dill
+        f = InputFile(self.fp)
+        f.seek(10)
+        data = dill.dumps(f)
+        self.assertLess(len(data), len(self.data))
+        f = dill.loads(data)
+        self.assertEqual(f.read(10), self.data[10:20])
+
+    @unittest.skipUnless(osp.isdir('/proc/self/fd'), 'Requires /proc.')
+    def test_no_open_handles(self):
+        n, files = len(os.listdir('/proc/self/fd')), []
+        for _ in range(200):
+            files.append(InputFile(self.fp))
+            files[-1].read(10)
+            files[-1].getvalue()
+        self.assertLessEqual(len(os.listdir('/proc/self/fd')), n)
+
+    def test_archives(self):
+        import tarfile
+        import zipfile
+        fp = osp.join(self.tmp.name, 'input.zip')
+        with zipfile.ZipFile(fp, 'w') as zf:
+            zf.writestr('data', self.data)
+        with zipfile.ZipFile(InputFile(fp)) as zf:
+            self.assertEqual(zf.read('data'), self.data)
+        fp = osp.join(self.tmp.name, 'input.tar.bz2')
+        with tarfile.open(fp, 'w:bz2') as tar:
+            tar.add(self.fp, 'data')
+        f = InputFile(fp)
+        f.seek(0)
+        with tarfile.open(mode='r:bz2', fileobj=f) as tar:
+            self.assertEqual(tar.extractfile('data').read(), self.data)
+
+    def test_read_input_file(self):
+        f = read_input_file(InputFile(self.fp))
+        self.assertIsInstance(f, io.BytesIO)  # Required by `co2mpas_dice`.
+        self.assertEqual(f.getvalue(), self.data)
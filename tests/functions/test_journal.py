@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import tempfile
+import unittest
+import os.path as osp
+from co2mpas.journal import Journal
+
+
+def _row(i):
+    return {'id': 'vehicle-%d' % i, 'base': 'input.xlsx', ('a', 'b'): i}
+
+
+class JournalTest(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fp = osp.join(self.tmp.name, 'outputs', 'journal.jsonl')
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _journal(self, n, **kwargs):
+        journal = Journal(self.fp)
+        for i in range(n):
+            journal.add('key-%d' % i, _row(i), **kwargs)
+        return journal
+
+    def test_resume(self):
+        self._journal(3, plan=True)
+        with open(self.fp, 'a') as f:
+            f.write('{"key": "key-3", "ro')  # Crash while writing.
+        self.assertIsNone(Journal(self.fp).resume('key-0'))  # Not resuming.
+        journal = Journal(self.fp, resume=True)
+        self.assertEqual(list(journal.entries), ['key-0', 'key-1', 'key-2'])
+        self.assertIsNone(journal.resume('key-3'))
+        self.assertTrue(journal.resume('key-1')['plan'])
+        journal.resume('key-0')
+        journal.resume('key-1')  # Already resumed.
+        self.assertEqual(journal.resumed, ['key-1', 'key-0'])
+        self.assertEqual(journal.rows(), [_row(1), _row(0)])
+
+    def test_merge(self):
+        from co2mpas import get_summary
+        self._journal(2)
+        journal = Journal(self.fp, resume=True)
+        journal.resume('key-1')
+        solutions = [{
+            'vehicle_name': 'vehicle-2', 'input_file_name': 'input.xlsx',
+            'summary': {'a': {'b': 2}}
+        }]
+        self.assertEqual(
+            get_summary(solutions, journal=journal), [_row(1), _row(2)]
+        )
+
+    def test_run_core(self):
+        # noinspection PyProtectedMember
+        from co2mpas import run_core, _run_key, _plan_rows
+        from co2mpas.core.load.plan import Plan
+        files = []
+        for name in ('a.xlsx', 'b.xlsx'):
+            files.append(osp.join(self.tmp.name, name))
+            with open(files[-1], 'wb') as f:
+                f.write(name.encode())
+        journal = Journal(self.fp)
+        for i, fp in enumerate(files):
+            journal.add(_run_key(fp, {}), _row(i), plan=False)
+        journal = Journal(self.fp, resume=True)
+
+        def core_model(*args, **kwargs):
+            raise AssertionError('Completed runs must not be run!')
+
+        sols = run_core(core_model, {}, 'now', files, journal=journal)
+        self.assertEqual(sols, {fp: {'resumed': True} for fp in files})
+        self.assertEqual(journal.rows(), [_row(0), _row(1)])
+
+        plan = Plan([[{'id': 1, 'base': files[0], 'run_base': True}]])
+        key = next(_plan_rows([(files[1], plan)], {}, journal))[0]
+        journal.add(key, _row(2))
+        journal = Journal(self.fp, resume=True)
+        self.assertEqual(list(_plan_rows([(files[1], plan)], {}, journal)), [])
+        self.assertEqual(journal.rows(), [_row(2)])
+
+    def test_define_journal(self):
+        from co2mpas import define_journal
+        from co2mpas.journal import JOURNAL_FILE_NAME
+        flags = {'output_folder': osp.dirname(self.fp)}
+        self.fp = osp.join(flags['output_folder'], JOURNAL_FILE_NAME)
+        self._journal(2)
+        journal = define_journal(flags, resume=True)
+        self.assertEqual(list(journal.entries), ['key-0', 'key-1'])
+        journal = define_journal(flags, checkpoint=True)  # New journal.
+        self.assertFalse(journal.entries or osp.isfile(self.fp))
+        journal.add('key-2', _row(2))
+        self.assertEqual(list(Journal(self.fp, True).entries), ['key-2'])
+        self.assertIsNone(define_journal(flags))
+        self.assertFalse(osp.isfile(self.fp))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+from co2mpas.defaults import dfl
+from co2mpas.core.model.physical.control import (
+    identify_on_engine, identify_engine_starts
+)
+from co2mpas.core.model.physical.control.conventional import predict_on_engine
+
+IDLE_ENGINE_SPEED = 800.0, 50.0
+
+
+def _cycle(seed, n=2000, nan=False):
+    # Random micro-trips with random engine stops.
+    rng, v = np.random.default_rng(seed), []
+    while len(v) < n:
+        top, k = rng.uniform(5, 100), int(rng.integers(2, 60))
+        v.extend(np.concatenate([
+            np.linspace(0, top, k), np.linspace(top, 0, k),
+            np.zeros(int(rng.integers(1, 30)))
+        ]))
+    times = np.cumsum(rng.uniform(.1, 2, n))
+    velocities = np.array(v[:n])
+    accelerations = np.gradient(velocities / 3.6, times)
+    gears = np.where(velocities > 1, rng.integers(0, 6, n), 0)
+    speeds = np.where(
+        rng.random(n) < .3, 0, rng.normal(IDLE_ENGINE_SPEED[0] + 100, 300, n)
+    )
+    model = rng.random(n) < .7
+    if nan:
+        for x in (velocities, accelerations, speeds):
+            x[rng.choice(n, 30)] = np.nan
+    return times, velocities, accelerations, gears, speeds, model
+
+
+def _predict_on_engine(
+        times, velocities, gears, accelerations, start_stop_model,
+        start_stop_activation_time, min_time_engine_on_after_start,
+        correct_start_stop_with_gears):
+    # Step-wise loop, as it was before the on/off phases.
+    on_engine = times <= start_stop_activation_time
+    if correct_start_stop_with_gears:
+        on_engine |= gears > 0
+
+    b0 = velocities > dfl.functions.StartStopModel.stop_velocity
+    b0 |= accelerations > dfl.functions.StartStopModel.plateau_acceleration
+    b1 = start_stop_model(np.column_stack((velocities, accelerations)))
+
+    ts = min_time_engine_on_after_start
+    for i, (t, on, on_b, on_m) in enumerate(zip(times, on_engine, b0, b1)):
+        prev = i == 0 or on_engine[i - 1]
+        on = on or ((prev or on_b) and on_m)
+        if not on and t <= ts:
+            on = True
+        if not prev and on:
+            ts = t + min_time_engine_on_after_start
+        on_engine[i] = on
+    return on_engine
+
+
+def _identify_on_engine(
+        times, engine_speeds_out, idle_engine_speed,
+        min_time_engine_on_after_start):
+    # Window loop, as it was before the cumulative sum.
+    on_engine = engine_speeds_out > idle_engine_speed[0] - idle_engine_speed[1]
+    mask = np.where(identify_engine_starts(on_engine))[0] + 1
+    ts = np.asarray(times[mask], dtype=float)
+    ts += min_time_engine_on_after_start + dfl.EPS
+    for i, j in np.column_stack((mask, np.searchsorted(times, ts))):
+        on_engine[i:j] = True
+    return on_engine
+
+
+@ddt.ddt
+class OnEngine(unittest.TestCase):
+    @ddt.idata(range(10))
+    def test_predict(self, seed):
+        for nan in (False, True):
+            times, vel, acc, gears, _, b1 = _cycle(seed, nan=nan)
+            for args in ((0, 4, True), (0, 4, False), (60, 0, False),
+                         (30, 10, True), (1e4, 4, False)):
+                msg = '%s: %s, %s' % (seed, nan, args)
+                res = _predict_on_engine(
+                    times, vel, gears, acc, lambda x: b1, *args
+                )
+                np.testing.assert_array_equal(predict_on_engine(
+                    times, vel, gears, acc, lambda x: b1, *args, True
+                ), res, err_msg=msg)
+
+    @ddt.idata(range(10))
+    def test_identify(self, seed):
+        for nan in (False, True):
+            times, *_, speeds, _ = _cycle(seed, nan=nan)
+            for t in (0, .5, 4, 20):
+                np.testing.assert_array_equal(
+                    identify_on_engine(times, speeds, IDLE_ENGINE_SPEED, t),
+                    _identify_on_engine(times, speeds, IDLE_ENGINE_SPEED, t),
+                    err_msg='%s: %s, %s' % (seed, nan, t)
+                )
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import tempfile
+import unittest
+import os.path as osp
+import ddt
+import schedula as sh
+from co2mpas.core.load.plan import Plan, InvalidPlan, load_plan_file
+
+
+def _validate(row):
+    if row.get('mass', 0) < 0:
+        return sh.NONE
+    return dict(row, validated=True)
+
+
+def _rows(*masses, run_base=True):
+    return [{
+        'id': i, 'base': 'base.xlsx', 'run_base': run_base, 'mass': m
+    } for i, m in enumerate(masses, 1)]
+
+
+@ddt.ddt
+class PlanTest(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = self.tmp.name
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, name, content='id,base,mass\n'):
+        fp = osp.join(self.folder, name)
+        with open(fp, 'w') as f:
+            f.write(content)
+        return fp
+
+    def test_lazy(self):
+        import pickle
+        rows = _rows(1, float('nan'), 3)
+        plan = Plan([rows, iter(())], _validate)
+        self.assertTrue(plan)
+        self.assertFalse(Plan([[], []]))
+        self.assertEqual(list(plan.raw_rows())[1], {
+            'id': 2, 'base': 'base.xlsx', 'run_base': True
+        })  # Without null values.
+        self.assertTrue(all(r['validated'] for r in plan))
+        self.assertEqual(list(plan), list(plan))  # Re-iterable.
+        plan = pickle.loads(pickle.dumps(plan))
+        self.assertEqual(len(list(plan)), 3)
+
+    def test_csv(self):
+        from co2mpas.core.load import plan as mdl
+        fp = self._file('a.csv', 'id,base,mass\n' + ''.join(
+            '%d,base.xlsx,%d\n' % (i, i) for i in range(1, 8)
+        ))
+        chunksize, mdl.CHUNK_SIZE = mdl.CHUNK_SIZE, 3
+        try:
+            plan = load_plan_file(fp)['plan']
+            rows = list(plan.raw_rows())
+        finally:
+            mdl.CHUNK_SIZE = chunksize
+        self.assertEqual([r['id'] for r in rows], list(range(1, 8)))
+        self.assertEqual(rows[0]['base'], osp.join(self.folder, 'base.xlsx'))
+        self.assertTrue(rows[0]['run_base'])
+
+    def test_invalid_row(self):
+        plan = Plan([_rows(1, -1, 3)], _validate)
+        with self.assertRaisesRegex(InvalidPlan, 'id: 2'):
+            list(plan)
+
+    def test_scan_plans(self):
+        # noinspection PyProtectedMember
+        from co2mpas import _scan_plans
+        calls = []
+
+        def validate(row):
+            calls.append(row['id'])
+            return _validate(row)
+
+        plans = [
+            ('a.xlsx', Plan([_rows(1, 2)], validate)),
+            ('b.xlsx', Plan([_rows(1, -1, 3)], validate)),  # Rejected.
+            ('c.xlsx', Plan([_rows(5, run_base=False)], validate)),
+        ]
+        valid, run_bases, load_bases, n = _scan_plans(plans, {})
+        self.assertEqual([k for k, _ in valid], ['a.xlsx', 'c.xlsx'])
+        self.assertEqual(run_bases, {osp.abspath('base.xlsx')})
+        self.assertEqual(load_bases, {osp.abspath('base.xlsx')})
+        self.assertEqual(n, 3)
+        self.assertEqual(calls, [1, 2, 1, 2, 1])
+        # The validated rows are replayed, not validated again.
+        rows = [_validate(r) for r in _rows(1, 2) + _rows(5, run_base=False)]
+        for _ in range(2):
+            self.assertEqual([r for _, p in valid for _, r in p], rows)
+        self.assertEqual(len(calls), 5)
+
+    def test_rows_file(self):
+        import gc
+        from co2mpas.core.load.plan import RowsFile
+        rows = RowsFile(iter(_rows(1, 2, 3)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(list(rows), _rows(1, 2, 3))
+        self.assertEqual(list(rows), list(rows))  # Re-iterable.
+        fp = rows.file_name
+        del rows
+        gc.collect()
+        self.assertFalse(osp.isfile(fp))
+
+        def invalid():
+            yield _rows(1)[0]
+            raise InvalidPlan('Invalid plan row (id: 2)!')
+
+        with self.assertRaises(InvalidPlan):
+            RowsFile(invalid())
+
+    @ddt.idata((
+            (('folder',), {'b.plan.csv', 'c.xlsx'}),
+            (('folder', 'folder/a.csv'), {'a.csv', 'b.plan.csv', 'c.xlsx'}),
+            (('folder/a.csv', 'folder/d.txt'), {'a.csv'}),
+    ))
+    def test_yield_files(self, case):
+        # noinspection PyProtectedMember
+        from co2mpas import _yield_files
+        paths, res = case
+        for name in ('a.csv', 'b.plan.csv', 'c.xlsx', 'd.txt'):
+            self._file(name)
+        paths = [osp.join(self.folder, *p.split('/')[1:]) for p in paths]
+        files = {osp.basename(fp) for fp in _yield_files(*paths)}
+        self.assertEqual(files, res)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import csv
+import json
+import types
+import os.path as osp
+import tempfile
+import unittest
+from co2mpas.profiler import Profiler
+
+# Node durations [s] (i.e., `None` for data nodes and sub-dispatchers without a
+# node) and sub-pipes.
+PIPE = {
+    'a': None,
+    'f': 1.0,
+    'sub': (None, {'g': .25, 'h': .5}),
+    'dsp': (2.0, {'g': .5}),
+    ('x', 'y;z'): .125
+}
+
+ROWS = [
+    # node, calls, cumulative, self, per_call.
+    ('dsp', 2, 4.0, 3.0, 2.0),
+    ('f', 2, 2.0, 2.0, 1.0),
+    ('sub', 2, 1.5, 0.0, .75),
+    ('dsp/g', 2, 1.0, 1.0, .5),
+    ('sub/h', 2, 1.0, 1.0, .5),
+    ('sub/g', 2, .5, .5, .25),
+    ('x', None, .25, 0, None),
+    ('x/y,z', 2, .25, .25, .125)
+]
+
+FOLDED = [
+    'f 2000000', 'sub;g 500000', 'sub;h 1000000', 'dsp;g 1000000',
+    'dsp 3000000', 'x;y,z 250000'
+]
+
+
+def _pipe(nodes):
+    # Synthetic `schedula` pipe: `task[2]` is the node id and its solution.
+    pipe = {}
+    for k, v in nodes.items():
+        t, sub_pipe = v if isinstance(v, tuple) else (v, None)
+        workflow = types.SimpleNamespace(
+            nodes={} if t is None else {k: {'duration': t}}
+        )
+        pipe[k] = {'task': (None, None, (
+            k, types.SimpleNamespace(workflow=workflow)
+        ))}
+        if sub_pipe is not None:
+            pipe[k]['sub_pipe'] = _pipe(sub_pipe)
+    return pipe
+
+
+def _rows(rows):
+    keys = 'node', 'calls', 'cumulative', 'self', 'per_call'
+    return [dict(zip(keys, r)) for r in rows]
+
+
+class TestProfiler(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.profiler = Profiler()
+        solution = types.SimpleNamespace(pipe=_pipe(PIPE))
+        # Not solutions (e.g., failed runs) are skipped.
+        solutions = [solution, 'error', solution]
+        self.assertEqual(list(self.profiler.collect(solutions)), solutions)
+
+    def test_add_pipe(self):
+        profiler = Profiler()
+        self.assertEqual(profiler.add_pipe(_pipe(PIPE)), 3.875)
+        self.assertEqual(profiler.add_pipe(_pipe(PIPE), ('run',)), 3.875)
+        self.assertEqual(profiler.stats[('dsp',)], [1, 2.0, 1.5])
+        self.assertEqual(profiler.stats[('run', 'sub')], [1, .75, 0])
+        self.assertNotIn(('a',), profiler.stats)
+
+    def test_rows(self):
+        self.assertEqual(self.profiler.rows(), _rows(ROWS))
+
+    def test_folded(self):
+        self.assertEqual(self.profiler.folded(), FOLDED)
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as d:
+            fp = osp.join(d, 'profile', 'co2mpas')
+            files = self.profiler.save(fp)
+            self.assertEqual(files, [
+                '%s.%s' % (fp, ext) for ext in ('json', 'csv', 'folded')
+            ])
+
+            with open(files[0]) as f:
+                self.assertEqual(json.load(f), _rows(ROWS))
+
+            with open(files[1], newline='') as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows, _rows(
+                ['' if v is None else str(v) for v in r] for r in ROWS
+            ))
+
+            with open(files[2]) as f:
+                self.assertEqual(f.read().splitlines(), FOLDED)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+
+
+def _validate(validate, data):
+    try:
+        return validate(data)
+    except Exception as ex:
+        return type(ex), str(ex)
+
+
+@ddt.ddt
+class DataValidator(unittest.TestCase):
+    @ddt.idata((
+            {'times': np.arange(10.)},
+            {'velocities': [1, 2, 3]},
+            {'velocities': np.array([-1., 2])},
+            {'velocities': np.array([[1., 2]])},
+            {'gears': np.array([0, 1, 2])},
+            {'engine_speeds_out': np.array([np.nan] * 3)},
+            {'engine_speeds_out': []},
+            {'vehicle_mass': 1500, 'gear_box_type': 'manual'},
+            {'unknown_key': 1},
+            {'times': np.array([1., np.nan])},
+            {'times': 'abc'},
+            {'vehicle_mass': -1},
+            {'engine_capacity': np.nan},
+            {'times': np.arange(3.), 'gear_box_type': 'wrong'},
+    ))
+    def test_validate(self, data):
+        from co2mpas.core.load.schema import (
+            define_data_schema, define_data_validator
+        )
+        validator = define_data_validator()
+        res = _validate(define_data_schema().validate, data)
+        for _ in range(2):  # Compiled and cached validators.
+            fast = _validate(validator.validate, data)
+            self.assertEqual(type(fast), type(res))
+            if isinstance(res, dict):
+                self.assertEqual(
+                    {k: type(v) for k, v in fast.items()},
+                    {k: type(v) for k, v in res.items()}
+                )
+            np.testing.assert_equal(fast, res)
+        if isinstance(res, dict):
+            self.assertLessEqual(set(data), set(validator.table))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import os
+import tempfile
+import threading
+import unittest
+import os.path as osp
+import ddt
+from co2mpas.server import Server, submit
+
+
+@ddt.ddt
+class ServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.model_conf = osp.join(cls.tmp.name, 'conf.yaml')
+        with open(cls.model_conf, 'w') as f:
+            f.write('{}')
+        cls.server = Server(('127.0.0.1', 0), cls.model_conf, 'secret')
+        cls.server.process = cls._process  # Records the process inputs.
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        cls.tmp.cleanup()
+
+    @classmethod
+    def _process(cls, inputs, outputs):
+        cls.inputs = inputs
+        return {'output_summary_file': 'summary.xlsx'}
+
+    def _submit(self, inputs, token='secret'):
+        return submit(inputs, self.server.server_address, 30, token)
+
+    def test_round_trip(self):
+        out = osp.join(self.tmp.name, 'outputs')
+        res = self._submit({
+            'input_files': ['input.xlsx'], 'jobs': 2,
+            'cmd_flags': {'output_folder': out, 'only_summary': True}
+        })
+        self.assertEqual(res['summary_file'], 'summary.xlsx')
+        self.assertEqual(res['output_files'], [])
+        self.assertTrue(osp.isdir(out))
+        self.assertFalse(self.inputs['plot_workflow'])
+        self.assertIs(self.inputs['core_model'], self.server.core_model)
+        self.assertEqual(self.inputs['cmd_flags'], {
+            'output_folder': out, 'only_summary': True,
+            'model_conf': self.model_conf  # Loaded by the parallel processes.
+        })
+
+    @ddt.idata((None, 'wrong', 'secret '))
+    def test_unauthorized(self, token):
+        with self.assertRaisesRegex(RuntimeError, 'token'):
+            self._submit({'input_files': []}, token)
+
+    @ddt.idata((
+            {'input_files': [], 'plot_workflow': True},
+            {'input_files': [], 'core_model': None},
+            {'input_files': [], 'start': {'model_conf': 'conf.yaml'}},
+            {'input_files': [], 'cmd_flags': {'model_conf': 'conf.yaml'}},
+    ))
+    def test_not_accepted(self, inputs):
+        with self.assertRaisesRegex(RuntimeError, 'not accepted'):
+            self._submit(inputs)
+
+    def test_non_loopback(self):
+        with self.assertRaisesRegex(ValueError, 'token'):
+            Server(('0.0.0.0', 0))
+        self.assertEqual(os.listdir(self.tmp.name), ['conf.yaml'])
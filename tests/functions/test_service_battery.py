@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+from co2mpas.defaults import dfl
+from co2mpas.core.model.physical.electrics.batteries.service import (
+    ServiceBatteryModel
+)
+from co2mpas.core.model.physical.electrics.batteries.service.status import (
+    BatteryStatusModel
+)
+from co2mpas.core.model.physical.electrics.motors.alternator.current import (
+    AlternatorCurrentModel
+)
+
+
+def _cycle(seed, n=1000, nan=False):
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.uniform(.5, 1.5, n))
+    motive_powers = rng.normal(5, 15, n)
+    motive_powers[rng.random(n) < .1] = 0
+    accelerations = rng.normal(0, .5, n)
+    on_engine = np.repeat(rng.random(n // 50) < .8, 50)
+    starter_currents = np.where(rng.random(n) < .01, 100.0, 0.0)
+    if nan:
+        for x in (motive_powers, accelerations, starter_currents):
+            x[rng.choice(n, 10)] = np.nan
+    return times, motive_powers, accelerations, on_engine, starter_currents
+
+
+def _models(hybrid):
+    status = BatteryStatusModel(
+        bers_pred=lambda x: np.asarray(x) < -5,
+        charge_pred=lambda x: np.asarray(x)[:, 0] == hybrid, min_soc=60,
+        max_soc=70
+    )
+    # Current models depending on the previous state of charge.
+    alt = AlternatorCurrentModel()
+    alt.model = lambda x: (x[:, 0] - 75) * 4 + x[:, 1]
+    alt.init_model = lambda x: np.where(x[:, 0] > 0, -60.0, -10.0)
+    alt.mask, alt.init_mask = np.array((1, 3)), np.array((3,))
+    dcdc = AlternatorCurrentModel()
+    dcdc.model = dcdc.init_model = lambda x: (x[:, 0] - 90) * 2
+    dcdc.mask = dcdc.init_mask = np.array((1,))
+    return status, dcdc, alt
+
+
+def _reference(model, *cycle):
+    # Step-wise loop, as it was before the windows of time steps.
+    model.reset()
+    return np.array([model(*a) for a in zip(*cycle)]).T
+
+
+def _state(model):
+    return (model._prev_status, model._prev_soc, model._prev_time,
+            model._prev_current)
+
+
+@ddt.ddt
+class ServiceBattery(unittest.TestCase):
+    @ddt.idata(range(3))
+    def test_predict(self, seed):
+        conf, res = dfl.functions.ServiceBatteryModel, {}
+        window = conf.window
+        for nan in (False, True):
+            cycle = _cycle(seed, nan=nan)
+            for hybrid in (0, 1):
+                for rec, soc in ((True, 65), (False, 95), (True, 30)):
+                    model = ServiceBatteryModel(
+                        *_models(hybrid), rec, 60, (-.3, -.6), soc, 12, 2
+                    )
+                    ref = _reference(model, *cycle)
+                    state, msg = _state(model), (seed, nan, hybrid, rec, soc)
+                    res[msg] = ref
+                    try:
+                        for conf.window in (1, 7, window):
+                            np.testing.assert_array_equal(
+                                model.predict(*cycle), ref, err_msg=str(msg)
+                            )
+                            self.assertEqual(_state(model), state)
+                    finally:
+                        conf.window = window
+        # The recurrences are not trivial.
+        for ref in res.values():
+            self.assertGreater(len(np.unique(ref[1])), 2)
+            self.assertGreater(np.ptp(ref[0]), 5)
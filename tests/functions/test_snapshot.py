@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import glob
+import tempfile
+import unittest
+import os.path as osp
+import co2mpas.cache as cache
+# noinspection PyProtectedMember
+from co2mpas import register_core, _snapshot_key
+
+
+class Snapshot(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_folder = cache.CACHE_FOLDER
+        cache.CACHE_FOLDER = self.tmp.name
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        cache.CACHE_FOLDER = self.cache_folder
+        self.tmp.cleanup()
+
+    def _snapshots(self):
+        return glob.glob(osp.join(self.tmp.name, 'dsp', '*.dill'))
+
+    def test_key(self):
+        from co2mpas.defaults import dfl
+        key, conf = _snapshot_key(), dfl.functions.ServiceBatteryModel
+        window = conf.window
+        try:
+            conf.window = window + 1
+            self.assertNotEqual(_snapshot_key(), key)
+        finally:
+            conf.window = window
+        self.assertEqual(_snapshot_key(), key)
+
+    def test_snapshot(self):
+        model = register_core(True)
+        snapshots = self._snapshots()
+        self.assertEqual([osp.basename(fp) for fp in snapshots], [
+            '%s.dill' % _snapshot_key()
+        ])
+        with self.assertLogs('co2mpas', 'INFO') as logs:
+            snapshot = register_core(True)
+        self.assertIn('loaded from snapshot', ''.join(logs.output))
+        self.assertEqual(set(snapshot.data_nodes), set(model.data_nodes))
+        self.assertEqual(
+            set(snapshot.function_nodes), set(model.function_nodes)
+        )
+
+        with open(snapshots[0], 'wb') as f:
+            f.write(b'corrupted')
+        self.assertEqual(
+            set(register_core(True).data_nodes), set(model.data_nodes)
+        )
+        self.assertEqual(self._snapshots(), snapshots)  # Rebuilt.
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import tempfile
+import unittest
+import os.path as osp
+import numpy as np
+# noinspection PyProtectedMember
+from co2mpas import get_summary, _stream_summary
+
+
+def _solutions(n=3):
+    return [{
+        'vehicle_name': '%d-vehicle' % i, 'input_file_name': 'input.xlsx',
+        'summary': {'results': {'output': {'wltp_h': {
+            'co2_emission': np.float64(120.5 + i),
+            'gears': np.arange(i + 3),
+            'phases': (1, 2.5, 'low'),
+            'status': None if i else 'ok',
+            'n': np.int32(i)
+        }}}}
+    } for i in range(n)]
+
+
+class Summary(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stream = osp.join(self.tmp.name, 'outputs', 'summary.rows')
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _assert_rows(self, rows, res):
+        self.assertEqual(len(rows), len(res))
+        for r, s in zip(rows, res):
+            self.assertEqual(list(r), list(s))
+            for k, v in r.items():
+                self.assertIs(type(s[k]), type(v), k)
+                np.testing.assert_equal(s[k], v, k)
+
+    def test_stream(self):
+        res = get_summary(_solutions())
+        for _ in _stream_summary(_solutions(), self.stream):
+            pass
+        with open(self.stream, 'a') as f:
+            f.write('dHJ1bmNhdGVk')  # Truncated line.
+        self._assert_rows(get_summary([], self.stream), res)
+
+    def test_journal(self):
+        from co2mpas.journal import Journal
+        fp = osp.join(self.tmp.name, 'journal.jsonl')
+        journal, res = Journal(fp), get_summary(_solutions())
+        for i, row in enumerate(res):
+            journal.add('key-%d' % i, row, plan=False)
+        journal = Journal(fp, resume=True)
+        self.assertIsNone(journal.resume('key-3'))
+        for i in (2, 0, 2):
+            self.assertEqual(journal.resume('key-%d' % i)['key'], 'key-%d' % i)
+        self._assert_rows(get_summary([], journal=journal), res[::-2])
+
+    def test_run_core(self):
+        from co2mpas import run_core
+        files, events = [], []
+        for name in ('a.xlsx', 'b.xlsx', 'c.xlsx'):
+            files.append(osp.join(self.tmp.name, name))
+            with open(files[-1], 'w') as f:
+                f.write(name)
+
+        class InputsCache(dict):
+            def get(self, key, default=None):
+                events.append('load')  # Inputs are loaded lazily.
+                return default
+
+        def core_model(inputs):
+            fp = inputs['input_file_name']
+            # Rows are written as runs complete.
+            events.append(len(get_summary([], self.stream)))
+            sol = dict(_solutions(1)[0], input_file_name=fp)
+            if fp == files[0]:
+                sol['plan'] = [{'id': 1}]
+            return sol
+
+        sols = run_core(
+            core_model, {}, 'now', files, inputs_cache=InputsCache(),
+            summary_stream=self.stream
+        )
+        self.assertEqual(events, ['load', 0, 'load', 1, 'load', 2])
+        self.assertEqual([r['base'] for r in get_summary([], self.stream)],
+                         files)
+        self.assertIn('plan', sols[files[0]])  # Plan holders are kept.
+        self.assertEqual(sols[files[1]], {'streamed': True})
+        self.assertEqual(sols[files[2]], {'streamed': True})
+        sols = run_core(
+            core_model, {}, 'now', files, summary_stream=self.stream,
+            plot_workflow=True
+        )
+        self.assertTrue(all('summary' in sol for sol in sols.values()))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import tempfile
+import unittest
+import os.path as osp
+import ddt
+import numpy as np
+from co2mpas.core.load.sweep import Sweep, _permute
+
+SWEEP = '''
+base: vehicle.xlsx
+method: %s
+samples: 100
+parameters:
+  base.input.calibration.wltp_h.vehicle_mass: {min: 1200, max: 1800}
+  base.input.calibration.wltp_h.f2: [0.03, 0.035, 0.04]
+'''
+
+
+@ddt.ddt
+class SweepTest(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fp = osp.join(self.tmp.name, 'plan.sweep.yaml')
+
+    # noinspection PyMissingOrEmptyDocstring
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _sweep(self, content):
+        with open(self.fp, 'w') as f:
+            f.write(content)
+        return Sweep.from_file(self.fp)
+
+    @ddt.idata(('lhs', 'sobol'))
+    def test_seed_from_file(self, method):
+        sweep = self._sweep(SWEEP % method)
+        self.assertEqual(list(sweep), list(self._sweep(SWEEP % method)))
+        self.assertNotEqual(
+            sweep.seed, self._sweep(SWEEP % method + '# Changed.\n').seed
+        )
+        self.assertEqual(self._sweep(SWEEP % method + 'seed: 3\n').seed, 3)
+
+    @ddt.idata((1, 2, 3, 5, 16, 17, 1000, 4099))
+    def test_permute(self, n):
+        keys = np.random.default_rng(n).integers(
+            2 ** 64, size=6, dtype=np.uint64
+        )
+        res = _permute(np.arange(n), n, keys)
+        np.testing.assert_array_equal(np.sort(res), np.arange(n))
+        np.testing.assert_array_equal(_permute(np.arange(3, n), n, keys),
+                                      res[3:])
+
+    @ddt.idata((1, 7, 1000, 4096))
+    def test_lhs(self, chunksize):
+        sweep = Sweep({
+            'a': {'min': 0, 'max': 1}, 'b': {'min': -1, 'max': 1}
+        }, 'vehicle.xlsx', 'lhs', samples=1000, seed=1)
+        rows = list(sweep.rows(chunksize))
+        self.assertEqual(rows, list(sweep.rows(1000)))
+        self.assertEqual([r['id'] for r in rows], list(range(1, 1001)))
+        for k, lb in (('a', 0), ('b', -1)):  # One sample per stratum.
+            u = (np.array([r[k] for r in rows]) - lb) / (1 - lb)
+            np.testing.assert_array_equal(
+                np.sort(np.floor(u * 1000)), np.arange(1000)
+            )
+
+    def test_journal_key(self):
+        # noinspection PyProtectedMember
+        from co2mpas import _plan_rows
+        from co2mpas.journal import Journal
+        from co2mpas.core.load.plan import Plan
+        base = osp.join(self.tmp.name, 'vehicle.xlsx')
+        for fp in (base, self.fp):
+            with open(fp, 'w') as f:
+                f.write('data')
+        journal = Journal(osp.join(self.tmp.name, 'journal.jsonl'))
+
+        def _keys(*values):
+            plans = [(self.fp, Plan([[{
+                'id': 1, 'base': base, 'run_base': True, 'mass': v
+            }]])) for v in values]
+            return [k for k, _ in _plan_rows(plans, {}, journal)]
+
+        k = _keys(1000, 1000, 1200)
+        self.assertEqual(k[0], k[1])
+        self.assertNotEqual(k[0], k[2])  # Same id, but different values.
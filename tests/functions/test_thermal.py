@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+# noinspection PyProtectedMember
+from co2mpas.core.model.physical.engine._thermal import _TreesRegressor
+
+
+def _data(seed, n=500, d=5):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0, 1, (n, d)) * [1, 10, 100, 1000, .1][:d]
+    y = np.sin(X[:, 0]) + X[:, 1] / 10 + (X[:, 2] > 0) + rng.normal(0, .1, n)
+    X[rng.random(X.shape) < .05] = np.nan
+    return rng, X, y
+
+
+def _rows(rng, regressor, X, n=300):
+    # Random rows, with NaN features and values on the split thresholds.
+    Z = X[rng.choice(X.shape[0], n)] + rng.normal(0, .01, (n, X.shape[1]))
+    split = regressor.children[::2] != np.arange(len(regressor.feature))
+    i = np.flatnonzero(split)[:n]
+    j = regressor.feature[i]
+    columns = np.arange(X.shape[1])[regressor.columns]
+    Z[np.arange(len(i)), columns[j]] = regressor.threshold[i]
+    Z[rng.random(Z.shape) < .1] = np.nan
+    return Z
+
+
+@ddt.ddt
+class TreesRegressor(unittest.TestCase):
+    @ddt.idata(range(3))
+    def test_xgboost(self, seed):
+        from xgboost import XGBRegressor
+        rng, X, y = _data(seed)
+        model = XGBRegressor(
+            n_estimators=50, max_depth=4, random_state=seed
+        ).fit(X, y)
+        regressor = _TreesRegressor(model)
+        Z = _rows(rng, regressor, X)
+        res = model.predict(Z)
+        np.testing.assert_array_equal(regressor.predict(Z), res)
+        np.testing.assert_array_equal([regressor.predict_row(z) for z in Z],
+                                      res)
+
+    @ddt.idata(range(3))
+    def test_pipeline(self, seed):
+        from xgboost import XGBRegressor
+        from sklearn.pipeline import Pipeline
+        from sklearn.linear_model import RANSACRegressor
+        from sklearn.feature_selection import SelectFromModel
+        rng, X, y = _data(seed)
+        xgb = XGBRegressor(n_estimators=20, max_depth=3, random_state=seed)
+        model = Pipeline([
+            ('feature_selection', SelectFromModel(xgb, threshold='median')),
+            ('regression', RANSACRegressor(
+                XGBRegressor(n_estimators=30, max_depth=4, random_state=seed),
+                random_state=seed, min_samples=.8
+            ))
+        ]).fit(X, y)
+        regressor = _TreesRegressor(model)
+        self.assertLess(len(regressor.columns), X.shape[1])
+        Z = _rows(rng, regressor, X)
+        res = model.predict(Z)
+        np.testing.assert_array_equal(regressor.predict(Z), res)
+        np.testing.assert_array_equal([regressor.predict_row(z) for z in Z],
+                                      res)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015-2019 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+import schedula as sh
+# noinspection PyProtectedMember
+from co2mpas import (
+    _define_inputs, _shared_arrays, _shared_value, _dumps_delta, _loads_delta
+)
+
+
+def _model():
+    dsp = sh.Dispatcher()
+    dsp.add_function(function=lambda a: a + 1, inputs=['a'], outputs=['b'])
+    dsp.add_function(
+        function=lambda b, c: b * c, inputs=['b', 'c'], outputs=['d']
+    )
+    dsp.add_function(function=lambda d: d - 1, inputs=['d'], outputs=['e'])
+    return dsp
+
+
+@ddt.ddt
+class DefineInputs(unittest.TestCase):
+    # noinspection PyMissingOrEmptyDocstring
+    def setUp(self):
+        self.dsp = _model()
+        self.sol = self.dsp({'a': 1, 'c': 3})
+
+    @ddt.idata((
+            ({'b': 5}, {'a': 1, 'c': 3, 'b': 5}),
+            ({'d': 5}, {'a': 1, 'b': 2, 'c': 3, 'd': 5}),
+            ({'a': 2, 'c': 1}, {'a': 2, 'c': 1}),
+            ({'e': 0}, {'a': 1, 'b': 2, 'c': 3, 'd': 6, 'e': 0}),
+    ))
+    def test_memo(self, case):
+        inputs, res = case
+        memo = {}
+        self.assertEqual(_define_inputs(self.sol, inputs), res)
+        self.assertEqual(_define_inputs(self.sol, inputs, memo), res)
+        self.assertEqual(len(memo), 1)
+        # Same overridden keys with other values: the pruning is reused.
+        inputs = {k: -1 for k in inputs}
+        self.assertEqual(
+            _define_inputs(self.sol, inputs, memo),
+            _define_inputs(self.sol, inputs)
+        )
+        self.assertEqual(len(memo), 1)
+
+    def test_memo_by_solution(self):
+        memo, sol = {}, self.dsp({'b': 1, 'c': 3})
+        self.assertEqual(_define_inputs(self.sol, {'b': 5}, memo), {
+            'a': 1, 'c': 3, 'b': 5
+        })
+        self.assertEqual(_define_inputs(sol, {'b': 5}, memo), {
+            'c': 3, 'b': 5
+        })
+        self.assertEqual(len(memo), 2)
+
+
+class Delta(unittest.TestCase):
+    def test_delta(self):
+        import dill
+        x, z = np.arange(10000.), np.ones(10000, bool)
+        bases = {'a': {'solution': {'x': x, 'y': [x, {'z': z}], 'n': 1}}}
+        # The workers unpickle their own copy of the bases.
+        worker = dill.loads(dill.dumps(bases))
+        shared = {id(a): i for i, a in enumerate(_shared_arrays(worker))}
+        self.assertEqual(len(shared), 2)
+        src = worker['a']['solution']
+        sol = {'x': src['x'], 'z': src['y'][1]['z'], 'new': src['x'] + 1}
+        data = _dumps_delta(sol, shared)
+        self.assertLess(len(data), len(dill.dumps(sol)) / 2)
+        res = _loads_delta(data, _shared_arrays(bases))
+        self.assertIs(res['x'], x)
+        self.assertIs(res['z'], z)
+        np.testing.assert_array_equal(res['new'], np.arange(10000.) + 1)
+        np.testing.assert_array_equal(x, np.arange(10000.))  # Intact.
+        self.assertTrue(z.all())
+
+    def test_shared_value(self):
+        memo, src = {}, {'a': {'x': 1, 'y': sh.EMPTY}, 'b': 2}
+        value = _shared_value(src, 'a', memo)
+        self.assertEqual(value, {'x': 1})
+        self.assertIs(_shared_value(src, 'a', memo), value)
+        self.assertEqual(_shared_value(src, 'b', memo), 2)
+        src['a'] = {'x': 2}  # New base value.
+        self.assertEqual(_shared_value(src, 'a', memo), {'x': 2})
+        self.assertEqual(_shared_value(src, 'a'), {'x': 2})
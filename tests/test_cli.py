@@ -73,6 +73,10 @@ class CLI(unittest.TestCase):
              '-KP', osp.join(fdir, 'keys/secret.passwords'), '-OS'),
             (osp.join(pdir, 'demos'), '-TA', '-EK',
              osp.join(fdir, 'keys/dice.co2mpas.keys')),
+            (osp.join(pdir, 'demos'), '-TA', '-EK',
+             osp.join(fdir, 'keys/dice.co2mpas.keys'), '-j', '2', '-NC'),
+            (osp.join(pdir, 'demos'), '-TA', '-EK',
+             osp.join(fdir, 'keys/dice.co2mpas.keys'), '-j', '2', '-PR'),
     ))
     def test_2_run(self, options):
         import glob
@@ -82,6 +86,10 @@ class CLI(unittest.TestCase):
         with self.runner.isolated_filesystem():
             result = self.invoke(('run',) + options)
             self.assertEqual(result.exit_code, 0)
+            if kw['profile']:
+                self.assertEqual({osp.splitext(fp)[1] for fp in glob.glob(
+                    osp.join(kw['output_folder'], '*-profile.*')
+                )}, {'.json', '.csv', '.folded'})
             cols = 'declared_value', 'prediction', 'output'
             cols1 = ('declared_sustaining_value',) + cols[1:]
             df = pd.read_excel(
@@ -147,3 +155,50 @@ class CLI(unittest.TestCase):
                 with open(kw['model_conf'], 'rb') as f:
                     for k, v in sh.stack_nested_keys(yaml.load(f)):
                         self.assertEqual(r[k], v)
+
+    def test_4_convert(self):
+        import glob
+        import numpy as np
+        from co2mpas.core.load import dsp
+        from co2mpas.core.load.binary import load_from_binary
+        load = dsp.register(memo={})
+        with self.runner.isolated_filesystem():
+            result = self.invoke(
+                ('convert', osp.join(pdir, 'demos'), '-O', 'inputs')
+            )
+            self.assertEqual(result.exit_code, 0)
+            for fpath in glob.glob(osp.join(pdir, 'demos/*.xlsx')):
+                name = osp.splitext(osp.basename(fpath))[0]
+                np.testing.assert_equal(
+                    load_from_binary(osp.join('inputs', '%s.npz' % name)),
+                    load({'input_file_name': fpath}, ['raw_data'])['raw_data']
+                )
+
+    @ddt.idata((
+            ('-P', 'base.input.calibration.wltp_h.f0=10:20:3',
+             '-P', 'base.input.calibration.wltp_h.f2=0.03,0.04'),
+            ('-M', 'lhs', '-N', '100', '-S', '1',
+             '-P', 'base.input.calibration.wltp_h.f0=10:20',
+             '-P', 'base.input.calibration.wltp_h.f2=0.03,0.04'),
+            ('-M', 'sobol', '-N', '100', '-S', '2', '--no-run-base',
+             '-P', 'base.input.calibration.wltp_h.f0=10:20'),
+    ))
+    def test_5_plan(self, options):
+        import numpy as np
+        import pandas as pd
+        from co2mpas.core.load.sweep import Sweep
+        options += ('-B', osp.join(pdir, 'demos', 'co2mpas_simplan.xlsx'))
+        with self.runner.isolated_filesystem():
+            result = self.invoke(('plan', 'plan.sweep.yaml') + options)
+            self.assertEqual(result.exit_code, 0)
+            result = self.invoke(('plan', 'plan/plan.csv') + options)
+            self.assertEqual(result.exit_code, 0)
+            rows = pd.DataFrame(list(Sweep.from_file('plan.sweep.yaml')))
+            df = pd.read_csv('plan/plan.csv')
+            self.assertSetEqual(set(df.columns), set(rows.columns))
+            self.assertEqual(len(df), len(rows))
+            self.assertTrue(
+                (df['run_base'] == ('--no-run-base' not in options)).all()
+            )
+            for k in rows.columns.drop(['base', 'run_base']):
+                np.testing.assert_allclose(df[k].values, rows[k].values)